@@ -10,10 +10,10 @@ Basic usage:
     >>> geometry = maker.create_geometry(center=vector3(0, 0, 0), ...)
 """
 
-from .engine import ReactorMaker, ReactorGeometry, ReactorMesh
+__version__ = "0.1.0"
+
 from .vector import vector3, vector2
 
-__version__ = "0.1.0"
 __all__ = [
     "ReactorMaker",
     "ReactorGeometry",
@@ -21,3 +21,14 @@ __all__ = [
     "vector3",
     "vector2",
 ]
+
+
+def __getattr__(name):
+    # The engine is only imported when used, the SALOME session itself starts with
+    # the first geometry
+    if name in ("ReactorMaker", "ReactorGeometry", "ReactorMesh"):
+        from . import engine
+
+        return getattr(engine, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,444 @@
+import argparse
+import copy
+import csv
+import itertools
+import json
+import multiprocessing
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from .config import load_configs, to_parameters
+from .engine.cache import default_cache_dir
+from .engine.compression import with_compression
+
+# Parameters of a configuration that can be swept : (option, section, key)
+SWEPT_PARAMETERS = [
+    ("radius", "reactor", "radius"),
+    ("height", "reactor", "height"),
+    ("chimney_width", "chimney", "width"),
+    ("chimney_height", "chimney", "height"),
+    ("mesh_size", "meshing", "size"),
+]
+
+SUMMARY_FIELDS = [
+    "job",
+    "status",
+    "radius",
+    "height",
+    "chimney_width",
+    "chimney_height",
+    "mesh_size",
+    "geometry_time",
+    "mesh_time",
+    "export_time",
+    "elements",
+    "min_ar",
+    "max_ar",
+    "mean_ar",
+]
+
+# Engine of a worker process, set once by `_init_worker`
+_worker_maker = None
+
+
+def pars_arg(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="reactor-maker batch",
+        description="Create and mesh several reactors with a single SALOME session",
+    )
+
+    parser.add_argument(
+        "configs",
+        nargs="*",
+        help="Configuration files (.yaml/.toml), each one holding a configuration or a list of configurations",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--base",
+        type=str,
+        help="Configuration completed by the values of the sweep. Default: first configuration given",
+    )
+
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument(
+        "--grid",
+        action="store_true",
+        help="Cartesian product of the values given for each swept parameter",
+    )
+    sampling.add_argument(
+        "--lhs",
+        type=int,
+        metavar="N",
+        help="N Latin hypercube samples, each swept parameter being given as MIN MAX",
+    )
+
+    for option, _, _ in SWEPT_PARAMETERS:
+        parser.add_argument(
+            f"--{option.replace('_', '-')}",
+            dest=option,
+            nargs="+",
+            type=float,
+            help=f"Values of the {option.replace('_', ' ')} swept",
+        )
+
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the Latin hypercube. Default: 0"
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=".",
+        help="Output directory, one sub directory per job. Default: current directory",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of reactors generated in parallel, each in its own SALOME session. Default: 1",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=["gz", "xz"],
+        help="Compress the STL and UNV files of the jobs while they are written",
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=2,
+        help="Meshes waiting for their export while the next reactor is computed. Default: 2",
+    )
+
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_true",
+        help="Write the exports of a job before computing the next one",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(default_cache_dir()),
+        help="Directory caching the generated geometries and meshes. Default: ~/.cache/reactor-maker",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the geometries and the meshes",
+    )
+
+    args = parser.parse_args(argv)
+
+    if not args.configs and args.base is None:
+        parser.error("at least a configuration or a base configuration is required")
+
+    if args.jobs < 1:
+        parser.error("the number of jobs must be at least 1")
+
+    if args.queue_size < 1:
+        parser.error("the queue size must be at least 1")
+
+    if args.lhs is not None:
+        for option, _, _ in SWEPT_PARAMETERS:
+            values = getattr(args, option)
+            if values is not None and len(values) not in (1, 2):
+                parser.error(f"--{option.replace('_', '-')} expects MIN MAX with --lhs")
+
+    return args
+
+
+def _with_values(base: Dict, values: Dict) -> Dict:
+    datas = copy.deepcopy(base)
+    for option, section, key in SWEPT_PARAMETERS:
+        if option in values:
+            datas[section][key] = values[option]
+    return datas
+
+
+def sweep(base: Dict, ranges: Dict, lhs: Optional[int] = None, seed: int = 0):
+    """
+    Configurations of a sweep around a base configuration
+
+    Args:
+        base    (Dict):             Configuration completed by the swept values
+        ranges  (Dict):             Values of each swept parameter
+        lhs     (Optional[int]):    None for the cartesian product of the values,
+                                    otherwise the number of Latin hypercube samples
+                                    between (min, max) of each parameter
+        seed    (int):              Seed of the Latin hypercube
+
+    Returns:
+        List[Dict]: The configurations
+
+    """
+    if lhs is None:
+        options = list(ranges)
+        return [
+            _with_values(base, dict(zip(options, values)))
+            for values in itertools.product(*[ranges[option] for option in options])
+        ]
+
+    from scipy.stats import qmc
+
+    fixed = {option: values[0] for option, values in ranges.items() if len(values) == 1}
+    swept = [option for option, values in ranges.items() if len(values) == 2]
+
+    if not swept:
+        return [_with_values(base, fixed)] * lhs
+
+    samples = qmc.LatinHypercube(d=len(swept), seed=seed).random(lhs)
+    samples = qmc.scale(
+        samples,
+        [ranges[option][0] for option in swept],
+        [ranges[option][1] for option in swept],
+    )
+
+    return [
+        _with_values(base, {**fixed, **dict(zip(swept, map(float, sample)))})
+        for sample in samples
+    ]
+
+
+def _finish_export(row: Dict, future, last: bool = True) -> None:
+    # Completes the row of a job once an export is done by the I/O thread, the row
+    # is printed after the last one
+    try:
+        row["export_time"] += future.result()
+    except Exception as e:
+        if row["status"] == "ok":
+            row["status"] = f"error: {e}"
+    if last:
+        print(f"Job {row['job']} : {row['status']}")
+
+
+def run_job(
+    maker,
+    index: int,
+    datas: Dict,
+    output_dir: Path,
+    compress: Optional[str] = None,
+    pipeline=None,
+) -> Dict:
+    """
+    Create, mesh and export one reactor
+
+    With a pipeline, the STL and UNV exports and the quality of the mesh run in its
+    I/O thread while the caller computes the next reactor : the row is completed
+    and printed once they are done
+
+    Returns:
+        Dict: The row of the job in the summary
+
+    """
+    job_dir = output_dir.joinpath(f"job_{index:04d}")
+    job_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(job_dir.joinpath("config.yaml"), "w") as f:
+        yaml.dump(datas, f)
+
+    row = {"job": index, "status": "ok"}
+    for option, section, key in SWEPT_PARAMETERS:
+        row[option] = datas[section][key]
+
+    try:
+        parameters = to_parameters(datas)
+
+        def stage(name, filename=None):
+            if pipeline is None:
+                return nullcontext()
+            return pipeline.stage(name, filename)
+
+        start = time.perf_counter()
+        with stage("geometry"):
+            geometry = maker.create_geometry(**parameters).unwrap()
+        row["geometry_time"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with stage("mesh"):
+            mesh = maker.mesh(geometry, parameters["optimize"]).unwrap()
+        row["mesh_time"] = time.perf_counter() - start
+
+        stl = with_compression(str(job_dir.joinpath("geometry.stl")), compress)
+        unv = with_compression(str(job_dir.joinpath("mesh.unv")), compress)
+
+        def export_mesh(filename):
+            # The quality is measured after the export, on the arrays of the mesh
+            # extracted by the same thread
+            mesh.export_to(filename)
+            quality = mesh.quality
+            row["elements"] = quality.nb_elements
+            row["min_ar"] = quality.min
+            row["max_ar"] = quality.max
+            row["mean_ar"] = quality.mean
+
+        if pipeline is None:
+            start = time.perf_counter()
+            geometry.export_to(stl)
+            export_mesh(unv)
+            row["export_time"] = time.perf_counter() - start
+        else:
+            # SMESH and GEOM export in C++ without the GIL, overlapping the next
+            # reactor computed by the caller on other objects
+            row["export_time"] = 0.0
+            future = pipeline.submit("export_stl", stl, geometry.export_to)
+            future.add_done_callback(
+                lambda future: _finish_export(row, future, last=False)
+            )
+            future = pipeline.submit("export_unv", unv, export_mesh)
+            future.add_done_callback(lambda future: _finish_export(row, future))
+
+    except Exception as e:
+        row["status"] = f"error: {e}"
+
+    return row
+
+
+def _init_worker(cache_dir, backend):
+    global _worker_maker
+
+    from .engine import ReactorMaker
+
+    backend.start()
+
+    _worker_maker = ReactorMaker(cache_dir=cache_dir, backend=backend)
+
+
+def _run_worker_job(job):
+    return run_job(_worker_maker, *job)
+
+
+def run_batch(
+    configs: List[Dict],
+    output_dir: Path,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    backend=None,
+    queue_size: Optional[int] = 2,
+    compress: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Run every configuration through one long lived engine, or through `jobs` engines
+    in parallel, and write the summary of the batch
+
+    With a single engine and a `queue_size`, the reactors are exported by a
+    background I/O thread while the next ones are computed, at most `queue_size` of
+    them waiting for their exports. The throughput of each stage is printed and
+    saved to pipeline.json. `compress` ("gz", "xz") compresses the STL and UNV files
+    while they are written
+
+    Returns:
+        List[Dict]: The rows of the summary, in the order of the configurations
+
+    """
+    from .engine.backend import SalomeBackend
+
+    backend = backend if backend is not None else SalomeBackend()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (index, datas, output_dir, compress) for index, datas in enumerate(configs)
+    ]
+
+    rows = []
+    if jobs > 1:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            processes=jobs, initializer=_init_worker, initargs=(cache_dir, backend)
+        ) as pool:
+            for row in pool.imap_unordered(_run_worker_job, tasks):
+                print(f"Job {row['job']} : {row['status']}")
+                rows.append(row)
+    else:
+        from .engine import ReactorMaker
+        from .engine.pipeline import ExportPipeline
+
+        maker = ReactorMaker(cache_dir=cache_dir, backend=backend)
+        # Each job queues its STL and its UNV
+        pipeline = None if queue_size is None else ExportPipeline(2 * queue_size)
+        with pipeline if pipeline is not None else nullcontext():
+            for task in tasks:
+                row = run_job(maker, *task, pipeline=pipeline)
+                # The jobs whose mesh is queued are printed by the I/O thread
+                if pipeline is None or row["status"] != "ok":
+                    print(f"Job {row['job']} : {row['status']}")
+                rows.append(row)
+
+        if pipeline is not None:
+            print()
+            print(pipeline)
+            with open(output_dir.joinpath("pipeline.json"), "w") as f:
+                json.dump(pipeline.to_dict(), f, indent=2)
+
+    rows.sort(key=lambda row: row["job"])
+
+    with open(output_dir.joinpath("summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
+def print_summary(rows: List[Dict]) -> None:
+    header = (
+        f"{'job':>4} {'geometry (s)':>12} {'mesh (s)':>9} {'export (s)':>10} "
+        f"{'elements':>9} {'max AR':>7}  status"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for row in rows:
+        print(
+            f"{row['job']:>4} {row.get('geometry_time', 0):>12.2f} "
+            f"{row.get('mesh_time', 0):>9.2f} {row.get('export_time', 0):>10.2f} "
+            f"{row.get('elements', 0):>9} {row.get('max_ar', 0):>7.3f}  {row['status']}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = pars_arg(argv)
+
+    configs = []
+    for filename in args.configs:
+        configs.extend(load_configs(filename))
+
+    ranges = {
+        option: getattr(args, option)
+        for option, _, _ in SWEPT_PARAMETERS
+        if getattr(args, option) is not None
+    }
+
+    if args.grid or args.lhs is not None or ranges:
+        base = load_configs(args.base)[0] if args.base is not None else configs[0]
+        configs = sweep(base, ranges, args.lhs, args.seed)
+
+    output_dir = Path(args.output).resolve()
+
+    print(f"Output directory: {output_dir}")
+    print(f"Running {len(configs)} jobs with {args.jobs} process(es)")
+    print()
+
+    rows = run_batch(
+        configs,
+        output_dir,
+        jobs=args.jobs,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        queue_size=None if args.no_pipeline else args.queue_size,
+        compress=args.compress,
+    )
+
+    print()
+    print_summary(rows)
+    print()
+    print(f"Summary saved to {output_dir.joinpath('summary.csv')}")
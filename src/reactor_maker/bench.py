@@ -0,0 +1,592 @@
+import argparse
+import copy
+import importlib.util
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import __version__
+from .config import load_config, to_parameters
+
+# Configuration seeding the corpus
+EXAMPLE_CONFIG = Path(__file__).parents[2].joinpath("datas", "example.yaml")
+
+# Factors applied to the radius and the height of the example, the mesh size being
+# kept : the number of elements grows with the square of the factor
+DEFAULT_SCALES = [1, 2, 4]
+
+STAGES = ["optimize", "geometry", "mesh", "arrays", "export"]
+
+STRATEGY_NAMES = ["lbfgsb", "grid", "nelder-mead", "bayesian"]
+
+# Relative margin over the best aspect ratio found, defining the target of a case
+_TARGET_TOLERANCE = 1e-3
+
+
+def pars_arg(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="reactor-maker bench",
+        description="Benchmark the stages of the engine on a fixed corpus of reactors",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the corpus and write the results")
+    run.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="bench.json",
+        help="JSON file of the results. Default: bench.json",
+    )
+    run.add_argument(
+        "--config",
+        type=str,
+        default=str(EXAMPLE_CONFIG),
+        help="Configuration seeding the corpus. Default: datas/example.yaml",
+    )
+    run.add_argument(
+        "--scales",
+        nargs="+",
+        type=float,
+        default=DEFAULT_SCALES,
+        help="Factors applied to the radius and the height. Default: 1 2 4",
+    )
+    run.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="Skip the optimization stage, the most expensive one",
+    )
+    run.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=1,
+        help="Number of runs of each case, the median time is kept. Default: 1",
+    )
+    run.add_argument(
+        "--backend",
+        choices=["auto", "salome", "standin"],
+        default="auto",
+        help="Backend benchmarked, auto uses SALOME when it is installed. Default: auto",
+    )
+
+    strategies = commands.add_parser(
+        "strategies",
+        help="Count the evaluations each optimization strategy needs to reach a target",
+    )
+    strategies.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="strategies.json",
+        help="JSON file of the results. Default: strategies.json",
+    )
+    strategies.add_argument(
+        "--config",
+        type=str,
+        default=str(EXAMPLE_CONFIG),
+        help="Configuration seeding the corpus. Default: datas/example.yaml",
+    )
+    strategies.add_argument(
+        "--scales",
+        nargs="+",
+        type=float,
+        default=DEFAULT_SCALES,
+        help="Factors applied to the radius and the height. Default: 1 2 4",
+    )
+    strategies.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=STRATEGY_NAMES,
+        default=STRATEGY_NAMES,
+        help="Strategies compared. Default: all",
+    )
+    strategies.add_argument(
+        "--max-evaluations",
+        type=int,
+        default=100,
+        help="Budget of meshings computed by each run. Default: 100",
+    )
+    strategies.add_argument(
+        "--target-ar",
+        type=float,
+        help="Maximum aspect ratio to reach. Default: best one found by any strategy",
+    )
+    strategies.add_argument(
+        "--backend",
+        choices=["auto", "salome", "standin"],
+        default="auto",
+        help="Backend benchmarked, auto uses SALOME when it is installed. Default: auto",
+    )
+
+    compare = commands.add_parser("compare", help="Compare results against a baseline")
+    compare.add_argument("baseline", type=str, help="JSON results of reference")
+    compare.add_argument("current", type=str, help="JSON results to check")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown of a stage reported as a regression. Default: 0.1",
+    )
+    compare.add_argument(
+        "--min-time",
+        type=float,
+        default=0.01,
+        help="Slowdowns below this duration (s) are ignored as noise. Default: 0.01",
+    )
+    compare.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=0.2,
+        help="Relative growth of the peak RSS reported as a regression. Default: 0.2",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run" and args.repeat < 1:
+        parser.error("the number of runs must be at least 1")
+
+    return args
+
+
+def corpus(base: Dict, scales: List[float], optimize: bool = True) -> Dict[str, Dict]:
+    """
+    Configurations of the benchmark, named after their scale
+
+    Args:
+        base        (Dict):         Configuration seeding the corpus
+        scales      (List[float]):  Factors applied to the radius and the height
+        optimize    (bool):         Add the optimization of the smallest case
+
+    Returns:
+        Dict[str, Dict]: The configurations by name
+
+    """
+    cases = {}
+    for scale in scales:
+        datas = copy.deepcopy(base)
+        datas["reactor"]["radius"] = float(base["reactor"]["radius"]) * scale
+        datas["reactor"]["height"] = float(base["reactor"]["height"]) * scale
+        datas["meshing"]["optimize"] = 0
+        cases[f"x{scale:g}"] = datas
+
+    if optimize:
+        datas = copy.deepcopy(cases[f"x{min(scales):g}"])
+        datas["meshing"]["optimize"] = 1
+        cases[f"x{min(scales):g}-optimize"] = datas
+
+    return cases
+
+
+def backend_name(name: str) -> str:
+    if name != "auto":
+        return name
+    return "salome" if importlib.util.find_spec("salome") is not None else "standin"
+
+
+def _peak_rss() -> int:
+    # Peak resident set size of the process, in kB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _Stage:
+    def __init__(self, backend, timings: Dict, calls: Dict, name: str):
+        self._backend = backend
+        self._timings = timings
+        self._calls = calls
+        self._name = name
+
+    def __enter__(self):
+        self._counts = dict(getattr(self._backend, "calls", {}))
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu
+        self._timings.setdefault(self._name, []).append((wall, cpu))
+
+        counts = getattr(self._backend, "calls", None)
+        if counts is not None:
+            self._calls[self._name] = sum(counts.values()) - sum(self._counts.values())
+
+
+def run_case(datas: Dict, backend, output_dir: Path) -> Dict:
+    """
+    Run the stages of one configuration with a fresh engine
+
+    Returns:
+        Dict: Durations (wall, cpu) of each stage, number of elements and calls
+              made to the backend by stage
+
+    """
+    from .engine import ReactorMaker
+    from .engine.arrays import EDGE, QUADRANGLE, HEXAHEDRON
+
+    maker = ReactorMaker(cache_dir=None, backend=backend)
+    parameters = to_parameters(datas)
+    optimize = parameters["optimize"]
+
+    timings, calls = {}, {}
+
+    def stage(name):
+        return _Stage(backend, timings, calls, name)
+
+    if optimize:
+        with stage("optimize"):
+            maker._optimize_geom_mesh(
+                parameters["center"],
+                parameters["reactor_dim"],
+                parameters["chimney_dim"],
+                parameters["mesh_size"],
+            )
+
+    # The optimization of `create_geometry` is deterministic and replays the
+    # evaluations cached by the optimize stage, leaving the cost of the geometry
+    with stage("geometry"):
+        geometry = maker.create_geometry(**parameters).unwrap()
+
+    with stage("mesh"):
+        mesh = maker.mesh(geometry, optimize).unwrap()
+
+    with stage("arrays"):
+        arrays = mesh.to_arrays()
+
+    with stage("export"):
+        geometry.export_to(str(output_dir.joinpath("geometry.stl")))
+        mesh.export_to(str(output_dir.joinpath("mesh.unv")))
+
+    return {
+        "timings": timings,
+        "calls": calls,
+        "elements": {
+            "nodes": int(len(arrays.nodes)),
+            "edges": int(len(arrays.element_ids(EDGE))),
+            "faces": int(len(arrays.element_ids(QUADRANGLE))),
+            "volumes": int(len(arrays.element_ids(HEXAHEDRON))),
+        },
+    }
+
+
+def run_bench(cases: Dict[str, Dict], backend_name: str, repeat: int = 1) -> Dict:
+    """
+    Run every case of the corpus `repeat` times
+
+    Returns:
+        Dict: The results, serializable to JSON
+
+    """
+    import tempfile
+
+    from .engine.backend import get_backend
+
+    backend = get_backend(backend_name)
+
+    results = {
+        "version": __version__,
+        "backend": backend_name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "cases": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, datas in cases.items():
+            print(f"Case {name}...")
+
+            timings, calls, elements = {}, {}, {}
+            for _ in range(repeat):
+                run = run_case(datas, backend, Path(tmp))
+                for stage, values in run["timings"].items():
+                    timings.setdefault(stage, []).extend(values)
+                calls, elements = run["calls"], run["elements"]
+
+            results["cases"][name] = {
+                "radius": datas["reactor"]["radius"],
+                "height": datas["reactor"]["height"],
+                "mesh_size": datas["meshing"]["size"],
+                "stages": {
+                    stage: {
+                        "wall": statistics.median(wall for wall, _ in values),
+                        "cpu": statistics.median(cpu for _, cpu in values),
+                        "runs": [wall for wall, _ in values],
+                        "calls": calls.get(stage),
+                    }
+                    for stage, values in timings.items()
+                },
+                "elements": elements,
+                # The peak of the process only grows, cases run by increasing size
+                "peak_rss_kb": _peak_rss(),
+            }
+
+    return results
+
+
+def run_strategy(datas: Dict, backend, strategy: str, max_evaluations: int) -> Dict:
+    """
+    Optimize one configuration with a strategy and a fresh engine
+
+    Returns:
+        Dict: Best maximum aspect ratio after each improvement, as
+              [meshings computed, aspect ratio], the reason of the stop and the time
+
+    """
+    from .engine import ReactorMaker
+    from .engine.budget import OptimizationBudget
+    from .engine.events import EventStream, PROGRESS
+
+    trace = []
+
+    def listener(event):
+        if event.kind == PROGRESS and "best" in event.data:
+            trace.append([event.data["evaluations"], event.data["best"] + 1])
+
+    maker = ReactorMaker(
+        cache_dir=None, backend=backend, events=EventStream([listener])
+    )
+    parameters = to_parameters(datas)
+
+    start = time.perf_counter()
+    best, reason = maker._optimize_geom_mesh(
+        parameters["center"],
+        parameters["reactor_dim"],
+        parameters["chimney_dim"],
+        parameters["mesh_size"],
+        budget=OptimizationBudget(max_evaluations=max_evaluations),
+        strategy=strategy,
+    )
+
+    return {
+        "trace": trace,
+        "evaluations": maker.evaluation_cache.misses,
+        "best_ar": trace[-1][1] if trace else None,
+        "parameters": best,
+        "reason": reason,
+        "wall": time.perf_counter() - start,
+    }
+
+
+def run_strategies(
+    cases: Dict[str, Dict],
+    backend_name: str,
+    strategies: List[str],
+    max_evaluations: int = 100,
+    target: Optional[float] = None,
+) -> Dict:
+    """
+    Run every strategy on every case, and count the meshings each one computed
+    before reaching the target, by default the best aspect ratio of the case
+
+    Returns:
+        Dict: The results, serializable to JSON
+
+    """
+    from .engine.backend import get_backend
+
+    backend = get_backend(backend_name)
+
+    results = {
+        "version": __version__,
+        "backend": backend_name,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "max_evaluations": max_evaluations,
+        "cases": {},
+    }
+
+    for name, datas in cases.items():
+        runs = {}
+        for strategy in strategies:
+            print(f"Case {name}, strategy {strategy}...")
+            runs[strategy] = run_strategy(datas, backend, strategy, max_evaluations)
+
+        reached = [
+            run["best_ar"] for run in runs.values() if run["best_ar"] is not None
+        ]
+        case_target = target
+        if case_target is None and reached:
+            case_target = min(reached) * (1 + _TARGET_TOLERANCE)
+
+        for run in runs.values():
+            run["to_target"] = next(
+                (
+                    evaluations
+                    for evaluations, ar in run["trace"]
+                    if case_target is not None and ar <= case_target
+                ),
+                None,
+            )
+
+        results["cases"][name] = {"target_ar": case_target, "strategies": runs}
+
+    return results
+
+
+def print_strategies(results: Dict) -> None:
+    header = (
+        f"{'case':<8} {'strategy':<12} {'to target':>9} {'computed':>9} "
+        f"{'best AR':>9} {'time (s)':>9}  reason"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for name, case in results["cases"].items():
+        for strategy, run in case["strategies"].items():
+            to_target = "-" if run["to_target"] is None else run["to_target"]
+            best = "-" if run["best_ar"] is None else f"{run['best_ar']:.4f}"
+            print(
+                f"{name:<8} {strategy:<12} {to_target:>9} {run['evaluations']:>9} "
+                f"{best:>9} {run['wall']:>9.2f}  {run['reason']}"
+            )
+
+
+def print_results(results: Dict) -> None:
+    header = f"{'case':<14} " + " ".join(f"{stage:>10}" for stage in STAGES)
+    header += f" {'volumes':>9} {'faces':>8} {'peak RSS (MB)':>14}"
+    print(header)
+    print("-" * len(header))
+
+    for name, case in results["cases"].items():
+        times = [
+            (
+                f"{case['stages'][stage]['wall']:>10.3f}"
+                if stage in case["stages"]
+                else f"{'-':>10}"
+            )
+            for stage in STAGES
+        ]
+        print(
+            f"{name:<14} {' '.join(times)} {case['elements']['volumes']:>9} "
+            f"{case['elements']['faces']:>8} {case['peak_rss_kb'] / 1024:>14.1f}"
+        )
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    threshold: float = 0.1,
+    min_time: float = 0.01,
+    rss_threshold: float = 0.2,
+) -> List[str]:
+    """
+    Differences between two results beyond the thresholds
+
+    Returns:
+        List[str]: The regressions, empty if there is none
+
+    """
+    regressions = []
+
+    if baseline["backend"] != current["backend"]:
+        regressions.append(
+            f"backends differ : {baseline['backend']} -> {current['backend']}"
+        )
+
+    for name, reference in baseline["cases"].items():
+        case = current["cases"].get(name)
+        if case is None:
+            regressions.append(f"{name} : missing case")
+            continue
+
+        for stage, timing in reference["stages"].items():
+            if stage not in case["stages"]:
+                regressions.append(f"{name} {stage} : missing stage")
+                continue
+
+            before, after = timing["wall"], case["stages"][stage]["wall"]
+            if after > before * (1 + threshold) and after - before > min_time:
+                regressions.append(
+                    f"{name} {stage} : {before:.3f}s -> {after:.3f}s "
+                    f"(+{(after / before - 1) * 100 if before > 0 else float('inf'):.0f}%)"
+                )
+
+            calls_before, calls_after = timing.get("calls"), case["stages"][stage].get(
+                "calls"
+            )
+            if calls_before is not None and calls_after is not None:
+                if calls_after > calls_before:
+                    regressions.append(
+                        f"{name} {stage} : {calls_before} -> {calls_after} backend calls"
+                    )
+
+        if case["elements"] != reference["elements"]:
+            regressions.append(
+                f"{name} : elements changed {reference['elements']} -> {case['elements']}"
+            )
+
+        rss_before, rss_after = reference["peak_rss_kb"], case["peak_rss_kb"]
+        if rss_after > rss_before * (1 + rss_threshold):
+            regressions.append(
+                f"{name} : peak RSS {rss_before / 1024:.1f} MB -> {rss_after / 1024:.1f} MB"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = pars_arg(argv)
+
+    if args.command == "compare":
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        with open(args.current, "r") as f:
+            current = json.load(f)
+
+        regressions = compare(
+            baseline, current, args.threshold, args.min_time, args.rss_threshold
+        )
+        for regression in regressions:
+            print(regression)
+
+        if regressions:
+            print()
+            print(f"{len(regressions)} regression(s)")
+            sys.exit(1)
+
+        print("No regression")
+        return
+
+    if args.command == "strategies":
+        cases = corpus(load_config(args.config), args.scales, optimize=False)
+        name = backend_name(args.backend)
+
+        print(f"Backend: {name}")
+        print(f"Running {len(args.strategies)} strategies on {len(cases)} cases")
+        print()
+
+        results = run_strategies(
+            cases, name, args.strategies, args.max_evaluations, args.target_ar
+        )
+
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+        print()
+        print_strategies(results)
+        print()
+        print(f"Results saved to {args.output}")
+        return
+
+    cases = corpus(load_config(args.config), args.scales, not args.no_optimize)
+    name = backend_name(args.backend)
+
+    print(f"Backend: {name}")
+    print(f"Running {len(cases)} cases, {args.repeat} time(s) each")
+    print()
+
+    results = run_bench(cases, name, args.repeat)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print()
+    print_results(results)
+    print()
+    print(f"Results saved to {args.output}")
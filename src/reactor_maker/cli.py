@@ -1,7 +1,9 @@
 import argparse
+import sys
 from pathlib import Path
 
-from .engine import ReactorMaker
+from . import __version__
+from .engine.cache import default_cache_dir
 from .vector import vector3, vector2
 
 from typing import Union, Tuple
@@ -11,6 +13,7 @@ def pars_arg():
     parser = argparse.ArgumentParser(
         prog="reactor-maker",
         description="Create and mesh a reactor",
+        epilog="Use `reactor-maker batch --help` to generate several reactors in one session, `reactor-maker bench --help` to benchmark the engine",
     )
 
     parser.add_argument(
@@ -77,7 +80,134 @@ def pars_arg():
         help="Try to optimize the meshing. 0 : no optimization. 1 : optimization",
     )
 
-    parser.add_argument("-v", "--version", action="version", version="%(prog)s 0.1.0")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes evaluating the optimization in parallel. Default: 1",
+    )
+
+    parser.add_argument(
+        "--surrogate",
+        action="store_true",
+        help="Search the optimization on an analytic model of the meshing, SALOME only confirms the best candidates",
+    )
+
+    parser.add_argument(
+        "--strategy",
+        choices=["lbfgsb", "grid", "nelder-mead", "bayesian"],
+        default="lbfgsb",
+        help="Search of the optimization. Default: lbfgsb",
+    )
+
+    parser.add_argument(
+        "--fidelity",
+        nargs="+",
+        type=float,
+        default=[1],
+        metavar="FACTOR",
+        help="Coarsening factors of the mesh size searched before the target one, e.g. 4 2. Default: 1 (target size only)",
+    )
+
+    parser.add_argument(
+        "--max-evaluations",
+        type=int,
+        metavar="N",
+        help="Stop the optimization after N meshings computed",
+    )
+
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the optimization after this duration",
+    )
+
+    parser.add_argument(
+        "--target-ar",
+        type=float,
+        metavar="AR",
+        help="Stop the optimization once the maximum aspect ratio is below AR",
+    )
+
+    parser.add_argument(
+        "--stall",
+        type=int,
+        metavar="N",
+        help="Stop the optimization after N meshings computed without improvement",
+    )
+
+    parser.add_argument(
+        "--no-warm-start",
+        action="store_true",
+        help="Start the optimization from the default parameters, ignoring the past optimizations of similar reactors",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(default_cache_dir()),
+        help="Directory caching the generated geometries and meshes. Default: ~/.cache/reactor-maker",
+    )
+
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Mesh only the base with SALOME and sweep it into hexahedra with NumPy",
+    )
+
+    parser.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="Mesh a quadrant of the base and rotate it, implies --sweep. The mesh "
+        "is symmetric but its elements differ from the ones of the full mesh",
+    )
+
+    parser.add_argument(
+        "--hex-quality",
+        action="store_true",
+        help="Print the scaled Jacobian, skewness, non-orthogonality, warpage and volume ratio of the hexahedra, by region and by group",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=["gz", "xz"],
+        help="Compress the STL and UNV files while they are written (geometry.stl.gz, mesh.unv.gz)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always rebuild the geometry and the mesh, without reading or filling the cache",
+    )
+
+    parser.add_argument(
+        "--report",
+        type=str,
+        metavar="FILE",
+        help="Print the duration and memory of every stage and save them as JSON",
+    )
+
+    parser.add_argument(
+        "--chrome-trace",
+        type=str,
+        metavar="FILE",
+        help="Save the stages in the Chrome trace format (chrome://tracing, Perfetto)",
+    )
+
+    parser.add_argument(
+        "--trace-calls",
+        nargs="?",
+        type=int,
+        const=20,
+        metavar="N",
+        help="Count the calls to SALOME by stage and print the N slowest ones. Default N: 20",
+    )
+
+    parser.add_argument(
+        "-v", "--version", action="version", version=f"%(prog)s {__version__}"
+    )
 
     return parser.parse_args()
 
@@ -97,6 +227,18 @@ def personnalized_per_square_constraint(value: Union[str, float, int]) -> float:
 
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from .batch import main as batch_main
+
+        batch_main(sys.argv[2:])
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from .bench import main as bench_main
+
+        bench_main(sys.argv[2:])
+        return
+
     args = pars_arg()
 
     output_dir = Path(args.output).resolve()
@@ -115,7 +257,20 @@ def main() -> None:
 
     optimize = args.optimize != 0
 
-    maker = ReactorMaker()
+    from .engine import ReactorMaker
+    from .engine.budget import OptimizationBudget
+    from .engine.compression import with_compression
+
+    limits = [args.max_evaluations, args.time_limit, args.target_ar, args.stall]
+    budget = None
+    if any(limit is not None for limit in limits):
+        budget = OptimizationBudget(*limits)
+
+    maker = ReactorMaker(
+        cache_dir=None if args.no_cache else args.cache_dir,
+        trace_calls=args.trace_calls is not None,
+        warm_start=not args.no_warm_start,
+    )
 
     geometry = maker.create_geometry(
         center=vector3(*args.center),
@@ -125,15 +280,47 @@ def main() -> None:
         mesh_size=args.meshing,
         per_curvature=args.per_square_curve[1],
         optimize=optimize,
+        workers=args.workers,
+        surrogate=args.surrogate,
+        budget=budget,
+        strategy=args.strategy,
+        fidelities=args.fidelity,
     ).unwrap()
 
-    if geometry.export_to(f"{args.output}/geometry.stl"):
+    if geometry.export_to(
+        with_compression(f"{args.output}/geometry.stl", args.compress)
+    ):
         print("File succesfully saved !")
-    mesh = maker.mesh(geometry, optimize).unwrap()
+    mesh = maker.mesh(
+        geometry, optimize, sweep=args.sweep, symmetric=args.symmetric
+    ).unwrap()
+
+    print(mesh.quality)
+    print()
 
-    if mesh.export_to(f"{args.output}/mesh.unv"):
+    if args.hex_quality:
+        print(mesh.hex_quality)
+        print()
+
+    if mesh.export_to(with_compression(f"{args.output}/mesh.unv", args.compress)):
         print("File succesfully saved !")
 
+    if args.report is not None or args.chrome_trace is not None:
+        print()
+        print(maker.report)
+
+    if args.report is not None:
+        maker.report.save(args.report)
+        print(f"Report saved to {args.report}")
+
+    if args.chrome_trace is not None:
+        maker.report.save_chrome_trace(args.chrome_trace)
+        print(f"Chrome trace saved to {args.chrome_trace}")
+
+    if args.trace_calls is not None:
+        print()
+        print(maker.call_stats.summary(args.trace_calls))
+
 
 if __name__ == "__main__":
     main()
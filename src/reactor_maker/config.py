@@ -0,0 +1,68 @@
+import sys
+from typing import Dict, List
+
+import yaml
+
+from .vector import vector2, vector3
+
+
+def load_config(filename: str) -> Dict:
+    """
+    Load a reactor configuration (see datas/example.yaml or datas/example.toml)
+
+    Args:
+        filename    (str):  Path of a .yaml/.yml or .toml file
+
+    Returns:
+        Dict: The configuration
+
+    """
+    if filename.endswith((".yaml", ".yml")):
+        with open(filename, "r") as f:
+            return yaml.safe_load(f)
+
+    if filename.endswith(".toml"):
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            import tomli as tomllib
+
+        with open(filename, "rb") as f:
+            return tomllib.load(f)
+
+    raise ValueError(f"Extension of {filename} not supported")
+
+
+def load_configs(filename: str) -> List[Dict]:
+    """
+    Load one or several reactor configurations : a single configuration, a YAML list
+    of configurations or a `jobs` list of configurations
+    """
+    datas = load_config(filename)
+
+    if isinstance(datas, list):
+        return datas
+
+    if "jobs" in datas:
+        return datas["jobs"]
+
+    return [datas]
+
+
+def to_parameters(datas: Dict) -> Dict:
+    """
+    Arguments of `ReactorMaker.create_geometry` described by a configuration
+    """
+    reactor = datas["reactor"]
+    chimney = datas["chimney"]
+    meshing = datas["meshing"]
+
+    return {
+        "center": vector3(*[float(value) for value in reactor["center"]]),
+        "reactor_dim": vector2(float(reactor["radius"]), float(reactor["height"])),
+        "chimney_dim": vector2(float(chimney["width"]), float(chimney["height"])),
+        "per_square": float(meshing["square_ratio"]),
+        "mesh_size": float(meshing["size"]),
+        "per_curvature": float(meshing["curvature_ratio"]),
+        "optimize": int(meshing["optimize"]) != 0,
+    }
@@ -1,6 +1,20 @@
-from .core import ReactorMaker
-from .geometry import ReactorGeometry
-from .mesh import ReactorMesh
-from .sketcher import Sketcher
+_EXPORTS = {
+    "ReactorMaker": ".core",
+    "ReactorGeometry": ".geometry",
+    "ReactorMesh": ".mesh",
+    "MeshQuality": ".quality",
+    "Sketcher": ".sketcher",
+}
 
-__all__ = ["ReactorMesh", "ReactorGeometry", "ReactorMaker", "Sketcher"]
+__all__ = ["ReactorMesh", "ReactorGeometry", "ReactorMaker", "Sketcher", "MeshQuality"]
+
+
+def __getattr__(name):
+    # Submodules are imported on first use, so that `reactor_maker.engine.cache`
+    # doesn't pull scipy and the builders
+    if name in _EXPORTS:
+        import importlib
+
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
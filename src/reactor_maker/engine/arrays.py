@@ -0,0 +1,191 @@
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Element codes of the SMESH DAT format : 100 * dimension + number of nodes
+EDGE = 102
+TRIANGLE = 203
+QUADRANGLE = 204
+HEXAHEDRON = 308
+
+# Bottom and top faces of a hexahedron turned the other way : from the SMDS order of
+# `MeshArrays` to the direct one, whose bottom face turns counterclockwise seen from
+# the top face, and back
+REVERSED_HEXAHEDRON = np.array([0, 3, 2, 1, 4, 7, 6, 5])
+
+
+class MeshArrays:
+    """
+    Nodes and connectivity of a mesh held in contiguous NumPy arrays
+
+    Args:
+        node_ids    (np.ndarray):   SMESH ids of the nodes, shape (N,)
+        nodes       (np.ndarray):   Coordinates of the nodes, shape (N, 3)
+        elements    (Dict):         For each element code, the SMESH ids of the
+                                    elements (E,) and their nodes as row indices
+                                    in `nodes` (E, nb_nodes)
+        groups      (Dict):         SMESH ids of the elements of each named group
+
+    The hexahedra follow the SMDS convention of SMESH : the bottom face 0-1-2-3 turns
+    clockwise seen from the top face 4-5-6-7, its normal pointing out of the cell,
+    and the node i + 4 is above the node i. The meshes built without SMESH are
+    converted to it when they are created
+
+    The arrays hold no SALOME object : they can be pickled, sent to other processes
+    or saved as .npz, and outlive the mesh they come from
+
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        nodes: np.ndarray,
+        elements: Dict[int, Tuple[np.ndarray, np.ndarray]],
+        groups: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self._node_ids = node_ids
+        self._nodes = nodes
+        self._elements = elements
+        self._groups = {} if groups is None else groups
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        return self._node_ids
+
+    @property
+    def nodes(self) -> np.ndarray:
+        return self._nodes
+
+    @property
+    def codes(self):
+        return sorted(self._elements)
+
+    def element_ids(self, code: int) -> np.ndarray:
+        if code not in self._elements:
+            return np.empty(0, dtype=np.int64)
+        return self._elements[code][0]
+
+    def connectivity(self, code: int) -> np.ndarray:
+        if code not in self._elements:
+            return np.empty((0, code % 100), dtype=np.int64)
+        return self._elements[code][1]
+
+    @property
+    def groups(self) -> Dict[str, np.ndarray]:
+        return self._groups
+
+    def group_rows(self, name: str, code: int = QUADRANGLE) -> np.ndarray:
+        """
+        Rows of the elements of a group in `connectivity(code)`, its elements of
+        another type being ignored
+        """
+        group = self._groups.get(name, np.empty(0, dtype=np.int64))
+        return np.flatnonzero(np.isin(self.element_ids(code), group))
+
+    def group_connectivity(self, name: str, code: int = QUADRANGLE) -> np.ndarray:
+        """
+        Nodes of the elements of a group, as row indices in `nodes`
+        """
+        return self.connectivity(code)[self.group_rows(name, code)]
+
+    @classmethod
+    def from_mesh(cls, mesh, groups: bool = True) -> "MeshArrays":
+        """
+        Extract the whole mesh with a single export instead of one request per
+        element, and the ids of its groups with one request per group
+        """
+        fd, filename = tempfile.mkstemp(suffix=".dat")
+        os.close(fd)
+
+        try:
+            mesh.ExportDAT(filename, renumber=False)
+            arrays = cls.from_dat(filename)
+        finally:
+            os.remove(filename)
+
+        if groups:
+            arrays._groups = {
+                group.GetName(): np.asarray(group.GetIDs(), dtype=np.int64)
+                for group in mesh.GetGroups()
+            }
+
+        return arrays
+
+    def save(self, filename: str, compressed: bool = True) -> None:
+        """
+        Write the arrays to a .npz file
+        """
+        content = {"node_ids": self._node_ids, "nodes": self._nodes}
+        for code, (ids, conn) in self._elements.items():
+            content[f"element_ids_{code}"] = ids
+            content[f"connectivity_{code}"] = conn
+        for name, ids in self._groups.items():
+            content[f"group_{name}"] = ids
+
+        (np.savez_compressed if compressed else np.savez)(filename, **content)
+
+    @classmethod
+    def load(cls, filename: str) -> "MeshArrays":
+        with np.load(filename) as content:
+            elements, groups = {}, {}
+            for key in content.files:
+                if key.startswith("element_ids_"):
+                    code = int(key[len("element_ids_") :])
+                    elements[code] = (content[key], content[f"connectivity_{code}"])
+                elif key.startswith("group_"):
+                    groups[key[len("group_") :]] = content[key]
+
+            return cls(content["node_ids"], content["nodes"], elements, groups)
+
+    @classmethod
+    def from_dat(cls, filename: str) -> "MeshArrays":
+        with open(filename, "r") as f:
+            header = f.readline().split()
+            nb_nodes = int(header[0])
+
+            node_lines = [f.readline() for _ in range(nb_nodes)]
+            element_tokens = f.read().split()
+
+        if nb_nodes > 0:
+            node_block = np.array(" ".join(node_lines).split(), dtype=np.float64)
+            node_block = node_block.reshape(nb_nodes, 4)
+        else:
+            node_block = np.empty((0, 4), dtype=np.float64)
+
+        node_ids = node_block[:, 0].astype(np.int64)
+        nodes = np.ascontiguousarray(node_block[:, 1:])
+
+        lookup = np.full(node_ids.max() + 1 if nb_nodes else 1, -1, dtype=np.int64)
+        lookup[node_ids] = np.arange(nb_nodes)
+
+        elements = {}
+        for code, block in _split_runs(np.array(element_tokens, dtype=np.int64)):
+            ids, conn = block[:, 0], lookup[block[:, 2:]]
+            if code in elements:
+                ids = np.concatenate([elements[code][0], ids])
+                conn = np.concatenate([elements[code][1], conn])
+            elements[code] = (ids, conn)
+
+        return cls(node_ids, nodes, elements)
+
+
+def _split_runs(tokens: np.ndarray):
+    # Elements are written grouped by type, so every run of elements of a same code
+    # can be reshaped at once instead of being parsed line by line
+    position = 0
+    while position < len(tokens):
+        code = int(tokens[position + 1])
+        width = 2 + code % 100
+
+        nb_rows = (len(tokens) - position) // width
+        rows = tokens[position : position + nb_rows * width].reshape(nb_rows, width)
+
+        mismatch = np.flatnonzero(rows[:, 1] != code)
+        nb_run = mismatch[0] if len(mismatch) else nb_rows
+        if nb_run == 0:
+            raise ValueError("Malformed DAT file")
+
+        yield code, rows[:nb_run]
+        position += nb_run * width
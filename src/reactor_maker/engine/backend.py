@@ -0,0 +1,204 @@
+from typing import Any, Dict, List, Protocol, Sequence, Tuple
+
+from . import session
+
+
+class GeomBuilder(Protocol):
+    """
+    Calls of `salome.geom.geomBuilder` used by the engine
+    """
+
+    ShapeType: Dict[str, int]
+    kind: Any
+
+    def MakeVertex(self, x: float, y: float, z: float): ...
+
+    def MakeVectorDXDYDZ(self, dx: float, dy: float, dz: float): ...
+
+    def MakeLine(self, point, direction): ...
+
+    def MakeLineTwoPnt(self, point1, point2): ...
+
+    def MakeArc(self, point1, point2, point3): ...
+
+    def MakeDiskPntVecR(self, center, normal, radius: float): ...
+
+    def MakeWire(self, edges: Sequence): ...
+
+    def MakeFace(self, wire, planar: bool): ...
+
+    def MakeRotation(self, shape, axis, angle: float): ...
+
+    def MakePartition(self, shapes: Sequence, tools: Sequence = ()): ...
+
+    def MakeGlueEdges(self, shape, tolerance: float): ...
+
+    def MakeGlueFaces(self, shape, tolerance: float): ...
+
+    def MakePrismVecH(self, shape, direction, height: float): ...
+
+    def CheckShape(self, shape) -> bool: ...
+
+    def GetEdgeNearPoint(self, shape, point): ...
+
+    def GetFaceNearPoint(self, shape, point): ...
+
+    def GetShapesOnPlaneWithLocationIDs(
+        self, shape, shape_type: int, direction, point, state
+    ) -> List[int]: ...
+
+    def SubShapeAllSortedCentres(self, shape, shape_type: int) -> List: ...
+
+    def SubShapeAllSortedCentresIDs(self, shape, shape_type: int) -> List[int]: ...
+
+    def KindOfShape(self, shape) -> List: ...
+
+    def MakeCDG(self, shape): ...
+
+    def MakeVertexOnCurve(self, edge, parameter: float): ...
+
+    def PointCoordinates(self, point) -> Tuple[float, float, float]: ...
+
+    def BasicProperties(self, shape) -> Tuple[float, float, float]: ...
+
+    def CreateGroup(self, shape, shape_type: int): ...
+
+    def UnionIDs(self, group, ids: Sequence[int]) -> None: ...
+
+    def UnionList(self, group, shapes: Sequence) -> None: ...
+
+    def GetObjectIDs(self, group) -> List[int]: ...
+
+    def ExportSTL(self, shape, filename: str) -> None: ...
+
+    def ExportBREP(self, shape, filename: str) -> None: ...
+
+    def ImportBREP(self, filename: str): ...
+
+
+class Group(Protocol):
+    """
+    Calls of `SMESH.SMESH_GroupBase` used by the engine
+    """
+
+    def GetName(self) -> str: ...
+
+    def GetIDs(self) -> List[int]: ...
+
+
+class Mesh(Protocol):
+    """
+    Calls of `salome.smesh.smeshBuilder.Mesh` used by the engine
+    """
+
+    def Segment(self, geom=None): ...
+
+    def Quadrangle(self, geom=None): ...
+
+    def Hexahedron(self, geom=None): ...
+
+    def GroupOnGeom(self, group, name: str, element_type) -> Group: ...
+
+    def GetGroups(self) -> List[Group]: ...
+
+    def Compute(self) -> bool: ...
+
+    def NbFaces(self) -> int: ...
+
+    def NbVolumes(self) -> int: ...
+
+    def GetMinMax(self, functor) -> Tuple[float, float]: ...
+
+    def GetElementsByType(self, element_type) -> List[int]: ...
+
+    def GetAspectRatio(self, element_id: int) -> float: ...
+
+    def ExportDAT(self, filename: str, renumber: bool = True) -> None: ...
+
+    def ExportUNV(self, filename: str) -> None: ...
+
+    def ExportMED(self, filename: str) -> None: ...
+
+
+class SmeshBuilder(Protocol):
+    """
+    Calls of `salome.smesh.smeshBuilder` used by the engine
+    """
+
+    def Mesh(self, shape) -> Mesh: ...
+
+    def CreateMeshesFromMED(self, filename: str) -> Tuple[List[Mesh], Any]: ...
+
+
+class Backend(Protocol):
+    """
+    CAD and meshing kernel behind the engine : builders and the enumerations of the
+    GEOM and SMESH modules (`ST_ON`, `FACE`, `FT_AspectRatio`)
+    """
+
+    name: str
+    # Exports of the builders verified to write to a named pipe, see `stream_export`
+    pipe_exports: bool
+
+    def start(self) -> None: ...
+
+    def geom_builder(self) -> GeomBuilder: ...
+
+    def smesh_builder(self) -> SmeshBuilder: ...
+
+    def geom_module(self): ...
+
+    def smesh_module(self): ...
+
+
+class SalomeBackend:
+    """
+    The SALOME platform, started with the session of the process
+    """
+
+    name = "salome"
+    # GEOM writes its STL files in sequence. A file renamed over the pipe is still
+    # compressed and a seeking export fails, see `stream_export`. Compressed UNV
+    # files are written from the mesh arrays, see `ReactorMesh.export_to`
+    pipe_exports = True
+
+    def start(self) -> None:
+        session.start()
+
+    def geom_builder(self) -> GeomBuilder:
+        return session.geom_builder()
+
+    def smesh_builder(self) -> SmeshBuilder:
+        return session.smesh_builder()
+
+    def geom_module(self):
+        session.start()
+
+        import GEOM
+
+        return GEOM
+
+    def smesh_module(self):
+        session.start()
+
+        import SMESH
+
+        return SMESH
+
+
+BACKENDS = ("salome", "standin")
+
+
+def get_backend(name: str) -> Backend:
+    """
+    Backend registered under a name, see `BACKENDS`
+    """
+    if name == "salome":
+        return SalomeBackend()
+
+    if name == "standin":
+        from .standin import StandInBackend
+
+        return StandInBackend()
+
+    raise ValueError(f"Unknown backend {name}, expected one of {', '.join(BACKENDS)}")
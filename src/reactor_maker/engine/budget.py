@@ -0,0 +1,151 @@
+import time
+from typing import Optional
+
+# Reasons of the end of an optimization
+CONVERGED = "converged"
+MAX_EVALUATIONS = "max_evaluations"
+TIME_LIMIT = "time_limit"
+TARGET_REACHED = "target_reached"
+STALLED = "stalled"
+FAILED = "failed"
+# Parameters of an identical shape read from the warm start store
+WARM_START = "warm_start"
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised from the objective to stop the optimizer, holding the reason of the stop
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class OptimizationBudget:
+    """
+    Limits of an optimization, checked after every batch of evaluations
+
+    Args:
+        max_evaluations     (Optional[int]):    Maximum number of meshings computed,
+                                                the ones read from the cache are free
+        time_limit          (Optional[float]):  Maximum duration, in seconds
+        target_aspect_ratio (Optional[float]):  Stop once the maximum aspect ratio
+                                                is below this value
+        stall               (Optional[int]):    Stop after this number of meshings
+                                                computed without improvement
+        stall_tolerance     (float):            Smallest decrease of the maximum
+                                                aspect ratio taken as an improvement
+
+    """
+
+    def __init__(
+        self,
+        max_evaluations: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        target_aspect_ratio: Optional[float] = None,
+        stall: Optional[int] = None,
+        stall_tolerance: float = 1e-3,
+    ):
+        if max_evaluations is not None and max_evaluations < 1:
+            raise ValueError("The maximum number of evaluations must be at least 1")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("The time limit must be positive")
+        if target_aspect_ratio is not None and target_aspect_ratio < 1:
+            raise ValueError("The target aspect ratio can't be below 1")
+        if stall is not None and stall < 1:
+            raise ValueError("The stall length must be at least 1")
+
+        self._max_evaluations = max_evaluations
+        self._time_limit = time_limit
+        self._target_aspect_ratio = target_aspect_ratio
+        self._stall = stall
+        self._stall_tolerance = stall_tolerance
+
+        self.start()
+
+    @property
+    def max_evaluations(self) -> Optional[int]:
+        return self._max_evaluations
+
+    @property
+    def time_limit(self) -> Optional[float]:
+        return self._time_limit
+
+    @property
+    def target_aspect_ratio(self) -> Optional[float]:
+        return self._target_aspect_ratio
+
+    @property
+    def stall(self) -> Optional[int]:
+        return self._stall
+
+    @property
+    def evaluations(self) -> int:
+        return self._evaluations
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._evaluations = 0
+        self._best = float("inf")
+        self._since_improvement = 0
+
+    def _exhausted(self) -> Optional[str]:
+        if (
+            self._max_evaluations is not None
+            and self._evaluations >= self._max_evaluations
+        ):
+            return MAX_EVALUATIONS
+
+        if self._time_limit is not None and self.elapsed >= self._time_limit:
+            return TIME_LIMIT
+
+        return None
+
+    def spend(self, computed: int) -> Optional[str]:
+        """
+        Account for a batch of evaluations whose values aren't comparable to the
+        target, only the number of evaluations and the time are checked
+
+        Returns:
+            Optional[str]: The reason to stop, None to go on
+
+        """
+        self._evaluations += computed
+        return self._exhausted()
+
+    def update(self, computed: int, best: float) -> Optional[str]:
+        """
+        Account for a batch of evaluations
+
+        Args:
+            computed    (int):      Number of meshings computed by the batch
+            best        (float):    Best maximum aspect ratio found so far
+
+        Returns:
+            Optional[str]: The reason to stop, None to go on
+
+        """
+        self._evaluations += computed
+
+        if best < self._best - self._stall_tolerance:
+            self._best = best
+            self._since_improvement = 0
+        else:
+            self._since_improvement += computed
+
+        if self._target_aspect_ratio is not None and best <= self._target_aspect_ratio:
+            return TARGET_REACHED
+
+        exhausted = self._exhausted()
+        if exhausted is not None:
+            return exhausted
+
+        if self._stall is not None and self._since_improvement >= self._stall:
+            return STALLED
+
+        return None
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .. import __version__
+
+# Default bound of the size of an artifact cache : 2 GB
+DEFAULT_CACHE_SIZE = 2 * 1024**3
+
+_METADATA = "meta.json"
+# Locked shared by the readers of entries, exclusively by the eviction
+_LOCK = ".lock"
+
+T = TypeVar("T")
+
+
+def quantize(value: float, step: float) -> int:
+    return round(value / step)
+
+
+class LRUCache:
+    """
+    Least recently used cache in memory, counting its hits and misses
+
+    Args:
+        maxsize (int):  Maximum number of values kept
+
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self._maxsize = maxsize
+        self._values = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: Hashable):
+        if key not in self._values:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._values.move_to_end(key)
+        return self._values[key]
+
+    def put(self, key: Hashable, value) -> None:
+        self._values[key] = value
+        self._values.move_to_end(key)
+
+        while len(self._values) > self._maxsize:
+            self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key: Hashable):
+        return key in self._values
+
+
+def default_cache_dir() -> Path:
+    root = os.environ.get("XDG_CACHE_HOME", Path.home().joinpath(".cache"))
+    return Path(root).joinpath("reactor-maker")
+
+
+def _normalize(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(round(float(value), 12) + 0.0)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    return value
+
+
+class ArtifactCache:
+    """
+    Content addressed cache of generated files on disk. An entry is a directory named
+    after the hash of the normalized parameters and the version of the package, the
+    least recently used entries are evicted when the cache exceeds its size
+
+    The cache can be shared by several processes (`reactor-maker batch -j N`) : an
+    entry is written in a temporary directory and renamed once complete, the first
+    one stored for a key is kept, and the entries being read with `read` can't be
+    evicted meanwhile (lock file, POSIX only)
+
+    Args:
+        directory   (Path): Root directory of the cache
+        max_size    (int):  Maximum size of the cache in bytes
+
+    """
+
+    def __init__(self, directory, max_size: int = DEFAULT_CACHE_SIZE):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def key(self, kind: str, params: Dict) -> str:
+        content = json.dumps(
+            {"kind": kind, "version": __version__, "params": _normalize(params)},
+            sort_keys=True,
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @contextmanager
+    def _lock(self, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._directory.joinpath(_LOCK), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def load(self, key: str) -> Optional[Tuple[Path, Dict]]:
+        """
+        Directory of the entry and its metadata, None if the entry isn't cached or
+        was evicted meanwhile by another process
+        """
+        entry = self._directory.joinpath(key)
+        metadata = entry.joinpath(_METADATA)
+
+        try:
+            metadata.touch(exist_ok=True)
+            with open(metadata, "r") as f:
+                return entry, json.load(f)
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+            return None
+
+    def read(self, key: str, reader: Callable[[Path, Dict], T]) -> Optional[T]:
+        """
+        Read an entry with `reader(directory, metadata)`, the entry being kept from
+        eviction until `reader` returns
+
+        Returns:
+            Optional: What `reader` returned, None if the entry isn't cached
+
+        """
+        with self._lock(exclusive=False):
+            cached = self.load(key)
+            if cached is None:
+                return None
+            return reader(*cached)
+
+    def store(self, key: str, writer: Callable[[Path], Dict]) -> None:
+        """
+        Create an entry. `writer` fills the given directory and returns the metadata.
+        An entry already stored for `key`, by another process for example, is kept
+        """
+        tmp = self._directory.joinpath(f".tmp-{uuid.uuid4().hex}")
+        tmp.mkdir()
+
+        try:
+            metadata = writer(tmp)
+            with open(tmp.joinpath(_METADATA), "w") as f:
+                json.dump(metadata, f)
+
+            entry = self._directory.joinpath(key)
+            with self._lock(exclusive=True):
+                if not entry.exists():
+                    try:
+                        tmp.rename(entry)
+                    except OSError:
+                        # Stored meanwhile by a process without the lock
+                        pass
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        # Last use, size and directory of the complete entries
+        entries = []
+        for entry in self._directory.iterdir():
+            try:
+                mtime = entry.joinpath(_METADATA).stat().st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            entries.append((mtime, _size(entry), entry))
+        return entries
+
+    def size(self) -> int:
+        """
+        Size of the entries, the ones the eviction bounds. The other files of the
+        directory (lock, entries being written, the warm start store of the engine)
+        aren't counted
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        with self._lock(exclusive=True):
+            entries = self._entries()
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries, key=lambda item: item[0]):
+                if total <= self._max_size:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock(exclusive=True):
+            for entry in self._directory.iterdir():
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+
+
+def _size(path: Path) -> int:
+    # Size of a file or of the files of a directory, the files removed meanwhile by
+    # another process being ignored
+    paths = path.rglob("*") if path.is_dir() else [path]
+    size = 0
+    for f in paths:
+        try:
+            if f.is_file():
+                size += f.stat().st_size
+        except FileNotFoundError:
+            pass
+    return size
@@ -0,0 +1,173 @@
+import gzip
+import lzma
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+# Compressors chosen by the suffix of the file name. On UNV files, gzip 9 and xz 6
+# (the defaults) are several times slower than gzip 6 and xz 1 for a few percents,
+# xz 1 being faster and smaller than gzip 9
+COMPRESSIONS = {
+    ".gz": lambda filename, mode: gzip.open(filename, mode, compresslevel=6),
+    ".xz": lambda filename, mode: lzma.open(
+        filename, mode, preset=1 if "w" in mode else None
+    ),
+}
+
+# Size of the blocks copied from a named pipe to the compressor
+_BLOCK = 1 << 20
+# Seconds left to the reader of a named pipe to finish once the export returned
+EXPORT_TIMEOUT = 60.0
+
+
+def compression(filename: str) -> Optional[str]:
+    """
+    Suffix of the compression of a file (".gz", ".xz"), None for a plain file
+    """
+    suffix = Path(filename).suffix.lower()
+    return suffix if suffix in COMPRESSIONS else None
+
+
+def with_compression(filename: str, compress: Optional[str]) -> str:
+    """
+    `filename` followed by the suffix of the compression `compress` ("gz", "xz"),
+    unchanged when `compress` is None
+    """
+    if compress is None:
+        return filename
+    suffix = f".{compress.lstrip('.')}"
+    if suffix not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compress}")
+    return filename + suffix
+
+
+def open_stream(filename: str, mode: str = "r"):
+    """
+    Open a file, compressed or not depending on its suffix. Text modes ("r", "w")
+    are opened as text through the compressor, the content being compressed or
+    decompressed while it is written or read
+    """
+    suffix = compression(filename)
+    if suffix is None:
+        return open(filename, mode)
+
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    return COMPRESSIONS[suffix](filename, mode)
+
+
+def _compress(source: str, filename: str) -> None:
+    with open(source, "rb") as src, open_stream(filename, "wb") as dst:
+        shutil.copyfileobj(src, dst, _BLOCK)
+
+
+def _pump(fifo: str, filename: str, errors: list) -> None:
+    # Copy the named pipe to the compressed file until the writer closes it. When
+    # the compression fails, the pipe is drained so that the writer isn't blocked
+    # on a full pipe and can return
+    try:
+        with open(fifo, "rb") as src:
+            try:
+                with open_stream(filename, "wb") as dst:
+                    shutil.copyfileobj(src, dst, _BLOCK)
+            except Exception as e:
+                errors.append(e)
+                while src.read(_BLOCK):
+                    pass
+    except Exception as e:
+        errors.append(e)
+
+
+def _release(fifo: str, reader: threading.Thread, timeout: float) -> None:
+    # A writer failing before opening the pipe leaves the reader waiting for it :
+    # opening the pipe for writing unblocks the reader, which then reads the end of
+    # file. The opening fails (ENXIO) until the reader has opened its end, and once
+    # it is gone. A writer keeping the pipe open leaves the reader alive after
+    # `timeout`
+    deadline = time.monotonic() + timeout
+    while reader.is_alive() and time.monotonic() < deadline:
+        try:
+            os.close(os.open(fifo, os.O_WRONLY | os.O_NONBLOCK))
+        except OSError:
+            reader.join(0.01)
+        else:
+            reader.join(max(0.0, deadline - time.monotonic()))
+
+
+def _pipe_export(
+    export: Callable[[str], None], source: str, filename: str, timeout: float
+) -> None:
+    # The reader opens the pipe by a second name, a hard link : if the exporter
+    # replaces the file it is given (a temporary file renamed), the pipe can still
+    # be released and the file is compressed instead
+    fifo = os.path.join(os.path.dirname(source), ".pipe")
+    os.mkfifo(fifo)
+    os.link(fifo, source)
+
+    errors = []
+    reader = threading.Thread(target=_pump, args=(fifo, filename, errors), daemon=True)
+    reader.start()
+    try:
+        export(source)
+    finally:
+        _release(fifo, reader, timeout)
+
+    if reader.is_alive():
+        raise TimeoutError(
+            f"The export to {filename} still holds its pipe after {timeout:g}s"
+        )
+    if errors:
+        raise errors[0]
+
+    if not stat.S_ISFIFO(os.stat(source).st_mode):
+        _compress(source, filename)
+
+
+def stream_export(
+    export: Callable[[str], None],
+    filename: str,
+    pipe: bool = True,
+    timeout: float = EXPORT_TIMEOUT,
+) -> None:
+    """
+    Run an export writing to a file name, such as `ExportSTL` of GEOM or `ExportUNV`
+    of SMESH, and compress its output when `filename` ends with .gz or .xz. With
+    `pipe`, the export writes to a named pipe read by a thread feeding the
+    compressor, so no uncompressed file is written. Otherwise, or without named
+    pipes (Windows), the export goes through a temporary file compressed afterwards
+
+    Args:
+        export      (Callable): Function writing the export to the path it is given
+        filename    (str):      Path of the output
+        pipe        (bool):     Stream the export through a named pipe
+        timeout     (float):    Seconds waited for the end of the compression once
+                                the export returned, TimeoutError past them
+
+    """
+    if compression(filename) is None:
+        export(filename)
+        return
+
+    directory = tempfile.mkdtemp(prefix="reactor-maker-")
+    # Same name without the compression, for the writers checking the extension
+    source = os.path.join(directory, Path(filename).stem)
+
+    try:
+        if pipe and hasattr(os, "mkfifo"):
+            _pipe_export(export, source, filename, timeout)
+        else:
+            export(source)
+            _compress(source, filename)
+
+    except BaseException:
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -1,49 +1,162 @@
-import salome, sys
-
-salome.salome_init_without_session()
-
-import GEOM, SMESH
-from salome.geom import geomBuilder
-from salome.smesh import smeshBuilder
+import time
 
 from pathlib import Path
-from math import pi, ceil, log, sqrt
-from typing import Optional, Tuple, List
-from scipy.optimize import minimize
+from math import pi, ceil, cos, sin
+from typing import Optional, Sequence, Tuple, List
 
 from ..error import Result
 from ..vector import vector3, vector2
 
+from .backend import Backend, SalomeBackend
 from .geometry import ReactorGeometry
+from .index import SubShapeIndex
 from .mesh import ReactorMesh
+from .hexquality import ReactorRegions
+from .arrays import MeshArrays
+from .sweep import sweep as sweep_base
+from .symmetry import replicate_quadrant
+from .unv import read_unv
+from .quality import MeshQuality
+from .events import EventStream
+from .report import RunReport, traced
+from .tracing import CallStats, TracingProxy
 from .sketcher import Sketcher
-
-from ..text_redirector import TextRedirector
+from .evaluator import make_evaluator
+from .budget import (
+    OptimizationBudget,
+    BudgetExhausted,
+    CONVERGED,
+    FAILED,
+    STALLED,
+    TARGET_REACHED,
+    WARM_START,
+)
+from .cache import ArtifactCache, LRUCache, DEFAULT_CACHE_SIZE, quantize
+from .strategies import (
+    GRADIENT_STEP,
+    STRATEGIES,
+    NelderMeadStrategy,
+    make_strategy,
+    fidelity_levels,
+)
+from .surrogate import BaseSurrogate, geometric_progression
+from .warmstart import ShapeFeatures, WarmStartStore
+
+# Resolution of the evaluation cache keys : the square width is rounded to this
+# fraction of the mesh size, the curvature ratio to this value. Points of a line
+# search closer than that mesh the same base. Must stay below the finite difference
+# step of the L-BFGS-B strategy, whose stencil would otherwise hit its own point
+_KEY_RESOLUTION = GRADIENT_STEP / 10
+# Half width of the bounds around the parameters of a similar shape, widened by the
+# distance between the shapes
+_WARM_START_MARGIN = 0.1
+# Half width of the bounds of a level of the fidelity schedule around the best point
+# of the coarser level
+_FIDELITY_MARGIN = 0.1
+
+
+def _around(x0, bounds, margin: float):
+    return [
+        (max(low, value - margin), min(high, value + margin))
+        for value, (low, high) in zip(x0, bounds)
+    ]
 
 
 class ReactorMaker:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        backend: Optional[Backend] = None,
+        trace_calls: bool = False,
+        events: Optional[EventStream] = None,
+        warm_start: bool = True,
+    ):
         script_dir = Path(__file__).parent
         project_root = script_dir.parent.parent
         self._OUTPUT_DIR = project_root.joinpath("outputs")
 
-        self._geompy = geomBuilder.New()
-        self._smesh = smeshBuilder.New()
-
-    def set_output_widget(self, widget):
-        self._old_output = sys.stdout
-        sys.stdout = TextRedirector(widget)
-
-    def reset_output(self):
-        sys.stdout = self._old_output
+        self._backend = backend if backend is not None else SalomeBackend()
+        # Builders created on first use, which starts the SALOME session
+        self._geom_builder = None
+        self._smesh_builder = None
 
+        self._evaluations = LRUCache(maxsize=1024)
+        # 2D bases shared by geometries which only differ by their heights
+        self._bases = LRUCache(maxsize=16)
+        self._cache = (
+            ArtifactCache(cache_dir, cache_size) if cache_dir is not None else None
+        )
+        # Outcomes of the past optimizations, kept beside the artifacts, outside of
+        # their size and their eviction
+        self._warm_start = (
+            WarmStartStore(Path(cache_dir).joinpath("warmstart.sqlite"))
+            if cache_dir is not None and warm_start
+            else None
+        )
+        self._report = RunReport()
+        # Calls to the builders counted by stage, only when traced
+        self._call_stats = CallStats() if trace_calls else None
+        # Progress of the engine, printed unless a listener is given
+        self._events = events if events is not None else EventStream()
+
+    def _traced_builder(self, builder):
+        if self._call_stats is None:
+            return builder
+        return TracingProxy(builder, self._call_stats, self._report)
+
+    @property
+    def _geompy(self):
+        if self._geom_builder is None:
+            self._geom_builder = self._traced_builder(self._backend.geom_builder())
+        return self._geom_builder
+
+    @property
+    def _smesh(self):
+        if self._smesh_builder is None:
+            self._smesh_builder = self._traced_builder(self._backend.smesh_builder())
+        return self._smesh_builder
+
+    @property
+    def call_stats(self) -> Optional[CallStats]:
+        return self._call_stats
+
+    @property
+    def backend(self) -> Backend:
+        return self._backend
+
+    @property
+    def report(self) -> RunReport:
+        return self._report
+
+    @property
+    def evaluation_cache(self) -> LRUCache:
+        return self._evaluations
+
+    @property
+    def warm_start_store(self) -> Optional[WarmStartStore]:
+        return self._warm_start
+
+    @property
+    def events(self) -> EventStream:
+        return self._events
+
+    @traced("groups")
     def _create_group(
-        self, geometry, center: vector3, reactor_dim: vector2, chimney_dim: vector2
+        self,
+        geometry,
+        index: SubShapeIndex,
+        center: vector3,
+        reactor_dim: vector2,
+        chimney_dim: vector2,
     ) -> Result:
         radius = reactor_dim.x
         height = reactor_dim.y
 
         inlet = self._geompy.CreateGroup(geometry, self._geompy.ShapeType["FACE"])
+
+        GEOM = self._backend.geom_module()
+
         base = self._geompy.MakeVertex(center.x, center.y, center.z)
         direction = self._geompy.MakeVectorDXDYDZ(0, 0, 1)
         items = self._geompy.GetShapesOnPlaneWithLocationIDs(
@@ -89,11 +202,7 @@ class ReactorMaker:
             ),
         ]
 
-        vertices = [self._geompy.MakeVertex(pt.x, pt.y, pt.z) for pt in pts]
-
-        faces = [
-            self._geompy.GetFaceNearPoint(geometry, vertice) for vertice in vertices
-        ]
+        faces = [index.face_near_point(pt) for pt in pts]
         self._geompy.UnionList(wall, faces)
 
         base = self._geompy.MakeVertex(center.x, center.y, center.z + reactor_dim.y)
@@ -101,14 +210,16 @@ class ReactorMaker:
         items = self._geompy.GetShapesOnPlaneWithLocationIDs(
             geometry, self._geompy.ShapeType["FACE"], direction, base, GEOM.ST_ON
         )
-        top_center_face = self._geompy.GetFaceNearPoint(geometry, base)
-        top_face_id = self._geompy.GetSubShapeID(geometry, top_center_face)
+        top_face_id = index.face_ids[
+            index.nearest_face(vector3(center.x, center.y, center.z + reactor_dim.y))
+        ]
 
         items.remove(top_face_id)
 
         self._geompy.UnionIDs(wall, items)
         return Result(value=(inlet, outlet, wall))
 
+    @traced("base")
     def _create_base(
         self, sketcher, center, reactor_dim, chimney_dim, square_width, per_curvature
     ):
@@ -121,6 +232,24 @@ class ReactorMaker:
         )
         disk = self._geompy.MakeRotation(disk, rotation_axis, pi / 4)
 
+        rectangle, lines, base_lines = self._base_tools(
+            sketcher, center, reactor_dim, chimney_dim, square_width, per_curvature
+        )
+
+        with self._report.span("partition"):
+            meshing_square = self._geompy.MakePartition([rectangle], [*base_lines])
+            meshing_square = self._geompy.MakeGlueEdges(meshing_square, 1e-7)
+
+            partition = self._geompy.MakePartition([disk], [meshing_square, *lines])
+            partition = self._geompy.MakeGlueEdges(partition, 1e-7)
+
+        return partition
+
+    def _base_tools(
+        self, sketcher, center, reactor_dim, chimney_dim, square_width, per_curvature
+    ):
+        # Curved square, the spokes joining its corners to the disk, and the lines
+        # of the chimney splitting the square
         rectangle = sketcher._create_square_curvature(
             center=vector2(center.x, center.y),
             size=vector2(square_width, square_width),
@@ -169,109 +298,401 @@ class ReactorMaker:
             ),
         ]
 
-        meshing_square = self._geompy.MakePartition([rectangle], [*base_lines])
-        meshing_square = self._geompy.MakeGlueEdges(meshing_square, 1e-7)
+        return rectangle, lines, base_lines
 
-        partition = self._geompy.MakePartition([disk], [meshing_square, *lines])
-        partition = self._geompy.MakeGlueEdges(partition, 1e-7)
+    @traced("quadrant")
+    def _create_quadrant(
+        self, sketcher, center, reactor_dim, chimney_dim, square_width, per_curvature
+    ):
+        """
+        Quadrant x >= 0, y >= 0 of the base : the base is unchanged by a quarter turn
+        around the axis, its mesh is the mesh of the quadrant rotated three times,
+        see `replicate_quadrant`
+        """
+        radius = reactor_dim.x
+
+        arc = self._geompy.MakeArc(
+            self._geompy.MakeVertex(center.x + radius, center.y, 0),
+            self._geompy.MakeVertex(
+                center.x + radius * cos(pi / 4), center.y + radius * sin(pi / 4), 0
+            ),
+            self._geompy.MakeVertex(center.x, center.y + radius, 0),
+        )
+        wire = self._geompy.MakeWire(
+            [
+                sketcher._create_line(vector2(center.x, center.y), 0, radius),
+                arc,
+                sketcher._create_line(vector2(center.x, center.y), pi / 2, radius),
+            ]
+        )
+        quadrant = self._geompy.MakeFace(wire, True)
+
+        rectangle, lines, base_lines = self._base_tools(
+            sketcher, center, reactor_dim, chimney_dim, square_width, per_curvature
+        )
+
+        with self._report.span("partition"):
+            meshing_square = self._geompy.MakePartition([rectangle], [*base_lines])
+            meshing_square = self._geompy.MakeGlueEdges(meshing_square, 1e-7)
+
+            # The first spoke is the only one crossing the quadrant
+            partition = self._geompy.MakePartition(
+                [quadrant], [meshing_square, lines[0]]
+            )
+            partition = self._geompy.MakeGlueEdges(partition, 1e-7)
 
         return partition
 
+    @traced("evaluation")
+    def _evaluate_base(self, center, reactor_dim, chimney_dim, mesh_size, x) -> float:
+        per_square, per_curvature = x
+
+        square_width = per_square * reactor_dim.x
+
+        try:
+            base = self._create_base(
+                Sketcher(self._geompy),
+                center,
+                reactor_dim,
+                chimney_dim,
+                square_width,
+                per_curvature,
+            )
+
+            geometry = ReactorGeometry(
+                base,
+                None,
+                reactor_dim,
+                chimney_dim,
+                per_square,
+                mesh_size,
+                square_width,
+                backend=self._backend,
+                report=self._report,
+                geompy=self._geompy,
+            )
+
+            mesh = self._smesh.Mesh(base)
+
+            mesh.Segment().NumberOfSegments(1)
+
+            self._create_base_mesh(geometry, mesh, True)
+
+            mesh.Quadrangle()
+
+            with self._report.span("compute"):
+                mesh.Compute()
+
+            return self._get_max_aspect_ratio(mesh) - 1
+
+        except Exception as e:
+            self._events.log(str(e))
+            return 1e6
+
+    def _evaluation_key(self, center, reactor_dim, chimney_dim, mesh_size, x) -> Tuple:
+        # Only the inputs of the base are part of the key, the heights don't change
+        # the meshing evaluated by the optimizer
+        per_square, per_curvature = x
+        square_width = per_square * reactor_dim.x
+
+        return (
+            (center.x, center.y, center.z),
+            reactor_dim.x,
+            chimney_dim.x,
+            mesh_size,
+            quantize(square_width, mesh_size * _KEY_RESOLUTION),
+            quantize(per_curvature, _KEY_RESOLUTION),
+            ceil(square_width / mesh_size),
+        )
+
+    @traced("optimize")
     def _optimize_geom_mesh(
-        self, center, reactor_dim, chimney_dim, mesh_size
-    ) -> Tuple[float, float]:
-        sketcher = Sketcher(self._geompy)
+        self,
+        center,
+        reactor_dim,
+        chimney_dim,
+        mesh_size,
+        workers: int = 1,
+        surrogate: bool = False,
+        budget: Optional[OptimizationBudget] = None,
+        strategy: str = "lbfgsb",
+        fidelities: Sequence[float] = (1,),
+    ) -> Tuple[List[float], str]:
+        """
+        Search the ratios (per_square, per_curvature) minimizing the maximum aspect
+        ratio of the base with a strategy of `STRATEGIES`, until convergence or the
+        end of the budget. With several `fidelities`, the search runs first on bases
+        meshed coarser by these factors, the finer levels refining with Nelder-Mead
+        around the best point of the previous one
+
+        Returns:
+            Tuple[List[float], str]: The best ratios found and the reason of the stop
+
+        """
+        self._events.stage("optimize")
+
+        budget = budget if budget is not None else OptimizationBudget()
+        budget.start()
 
         best_param = None
         res_min = float("inf")
 
-        def residus(x):
-            nonlocal best_param, res_min
-            per_square, per_curvature = x
+        bounds = [(0.05, 0.99), (0.05, 0.8)]
+        x0 = [0.8, 0.2]
+
+        features = ShapeFeatures.of(reactor_dim.x, chimney_dim.x, mesh_size)
+        if self._warm_start is not None:
+            # An outcome above the current target isn't reused, it only seeds the
+            # search as a nearest one
+            outcome = self._warm_start.exact(
+                features,
+                (CONVERGED, TARGET_REACHED, STALLED),
+                budget.target_aspect_ratio,
+            )
+            if outcome is not None:
+                self._events.log(
+                    f"Parameters of an identical shape reused, maximum aspect ratio "
+                    f"{outcome.max_aspect_ratio:0.4f}"
+                )
+                self._events.log()
+                return list(outcome.parameters), WARM_START
+
+            nearest = self._warm_start.nearest(features)
+            if nearest is not None:
+                outcome, distance = nearest
+                x0 = list(outcome.parameters)
+                bounds = _around(x0, bounds, _WARM_START_MARGIN + distance)
+                self._events.log(
+                    f"Search seeded by a similar shape (distance {distance:0.3f}) : "
+                    f"{x0}"
+                )
 
-            square_width = per_square * reactor_dim.x
+        levels = fidelity_levels(chimney_dim.x, mesh_size, fidelities)
 
-            try:
-                base = self._create_base(
-                    sketcher,
-                    center,
-                    reactor_dim,
-                    chimney_dim,
-                    square_width,
-                    per_curvature,
-                )
+        evaluator = make_evaluator(
+            self, workers, (center, reactor_dim, chimney_dim, mesh_size)
+        )
 
-                geometry = ReactorGeometry(
-                    base,
-                    None,
-                    reactor_dim,
-                    chimney_dim,
-                    per_square,
-                    mesh_size,
-                    square_width,
-                )
+        hits, misses = self._evaluations.hits, self._evaluations.misses
 
-                mesh = self._smesh.Mesh(base)
+        # Level of the schedule being searched, the values of the coarse levels are
+        # only compared between themselves
+        level_size, final, computed = mesh_size, True, 0
 
-                mesh.Segment().NumberOfSegments(1)
+        def evaluate_many(points):
+            nonlocal best_param, res_min, computed
 
-                all_edges = self._geompy.SubShapeAllSortedCentres(
-                    geometry.geometry, self._geompy.ShapeType["EDGE"]
-                )
+            keys = [
+                self._evaluation_key(center, reactor_dim, chimney_dim, level_size, x)
+                for x in points
+            ]
 
-                self._create_base_mesh(geometry, mesh, True, all_edges)
+            results = {}
+            missing = {}
+            for key, x in zip(keys, points):
+                if key in results or key in missing:
+                    continue
 
-                mesh.Quadrangle()
+                value = self._evaluations.get(key)
+                if value is None:
+                    missing[key] = x
+                else:
+                    results[key] = value
 
-                mesh.Compute()
+            if missing:
+                values = evaluator.map(list(missing.values()), level_size)
+                for key, value in zip(missing, values):
+                    self._evaluations.put(key, value)
+                    results[key] = value
+            computed += len(missing)
 
-                aspect_ratios = self._get_aspect_ratio(mesh)
-                res = max(aspect_ratios) - 1
+            values = [results[key] for key in keys]
 
+            for x, res in zip(points, values):
                 if res < res_min:
-                    best_param = x
+                    best_param = [float(value) for value in x]
                     res_min = res
-                    print(res)
+                    self._events.progress(
+                        f"{res}",
+                        evaluations=self._evaluations.misses - misses,
+                        best=res,
+                        parameters=best_param,
+                        mesh_size=level_size,
+                    )
+
+            # The objective is the maximum aspect ratio minus 1
+            if final:
+                reason = budget.update(len(missing), res_min + 1)
+            else:
+                reason = budget.spend(len(missing))
+            if reason is not None:
+                raise BudgetExhausted(reason)
+
+            return values
+
+        search = make_strategy(strategy)
+        refine = NelderMeadStrategy(size=0.25)
+
+        reason = None
+        success, message = True, ""
+        timings = []
+        with evaluator:
+            try:
+                if surrogate:
+                    model = BaseSurrogate(reactor_dim.x, chimney_dim.x, mesh_size)
+                    candidates = model.search(bounds, nb_candidates=max(4, workers))
+
+                    self._events.log(
+                        f"Confirming {len(candidates)} candidates of the surrogate..."
+                    )
+                    evaluate_many(candidates)
+                else:
+                    for factor, level_size in levels:
+                        final = factor == levels[-1][0]
+                        # The finer levels only refine locally the best coarse point
+                        level_search = search if factor == levels[0][0] else refine
+                        best_param, res_min, computed = None, float("inf"), 0
+
+                        start = time.perf_counter()
+                        try:
+                            with self._report.span(f"fidelity_x{factor:g}"):
+                                success, message = level_search.search(
+                                    evaluate_many, bounds, x0, workers
+                                )
+                        finally:
+                            timings.append(
+                                (
+                                    factor,
+                                    level_size,
+                                    computed,
+                                    time.perf_counter() - start,
+                                )
+                            )
+
+                        if not final:
+                            # The finer level refines around the best coarse point
+                            x0 = best_param
+                            bounds = _around(x0, bounds, _FIDELITY_MARGIN)
+            except BudgetExhausted as e:
+                reason = e.reason
+
+            if not final and best_param is not None:
+                # The budget ran out on a coarse level : its best point is meshed once
+                # at the target size, the coarse values aren't the ones of the base
+                level_size, final = mesh_size, True
+                key = self._evaluation_key(
+                    center, reactor_dim, chimney_dim, mesh_size, best_param
+                )
+                res_min = self._evaluations.get(key)
+                if res_min is None:
+                    res_min = evaluator.map([best_param], mesh_size)[0]
+                    self._evaluations.put(key, res_min)
+                self._events.log(
+                    f"Best coarse point at the target size : {res_min + 1:0.4f}"
+                )
 
-                return res
+        if len(timings) > 1:
+            self._log_fidelities(timings)
 
-            except Exception as e:
-                print(e)
-                return 1e6
+        self._events.log(
+            f"Evaluations : {self._evaluations.misses - misses} computed, "
+            f"{self._evaluations.hits - hits} reused from the cache"
+        )
 
-        bounds = [(0.05, 0.99), (0.05, 0.8)]
+        if reason is None:
+            reason = CONVERGED if success else FAILED
+
+        if best_param is None:
+            raise RuntimeError("Error during the optimization")
 
-        result = minimize(
-            fun=residus,
-            x0=[0.8, 0.2],
-            bounds=bounds,
-            method="L-BFGS-B",
-            options={'disp': True},
+        if self._warm_start is not None:
+            self._warm_start.record(
+                features,
+                best_param,
+                res_min + 1,
+                budget.evaluations,
+                "surrogate" if surrogate else strategy,
+                reason,
+            )
+
+        if reason == FAILED:
+            self._events.log()
+            self._events.log(f"Error : {message}")
+            self._events.log()
+            self._events.log("==================================")
+            self._events.log("Failed to optimize the geometry...")
+            self._events.log("==================================")
+            self._events.log()
+            self._events.log("Using the best parameters found to compute the meshing")
+            self._events.log()
+
+            return best_param, reason
+
+        if reason != CONVERGED:
+            self._events.log()
+            self._events.log("==================================")
+            self._events.log(
+                f"Optimization stopped : {reason.replace('_', ' ')} after "
+                f"{budget.evaluations} evaluations in {budget.elapsed:0.1f}s"
+            )
+            self._events.log("==================================")
+            self._events.log()
+
+            return best_param, reason
+
+        self._events.log()
+        self._events.log("==================================")
+        self._events.log("Optimization succeded...")
+        self._events.log("==================================")
+        self._events.log()
+
+        return best_param, reason
+
+    def _log_fidelities(self, timings) -> None:
+        # Meshings of the coarse levels against their cost at the target size, the
+        # mean duration of a meshing of the final level being the reference
+        _, _, final_count, final_time = timings[-1]
+        reference = final_time / final_count if final_count else None
+
+        self._events.log()
+        self._events.log(
+            f"{'fidelity':>8} {'mesh size':>10} {'meshings':>9} {'time (s)':>9}"
         )
+        for factor, size, count, elapsed in timings:
+            self._events.log(
+                f"{'x' + format(factor, 'g'):>8} {size:>10.4g} {count:>9} {elapsed:>9.2f}"
+            )
 
-        if not result.success:
-            print("")
-            print("Error : ", result.message)
-            print("")
-            print("==================================")
-            print("Failed to optimize the geometry...")
-            print("==================================")
-            print("")
-            print("Using the best parameters found to compute the meshing")
-            print("")
+        coarse = sum(count for _, _, count, _ in timings[:-1])
+        coarse_time = sum(elapsed for _, _, _, elapsed in timings[:-1])
+        if reference is None:
+            self._events.log(f"{coarse} coarse meshings, no meshing at the target size")
+            return
+
+        saved = coarse - coarse_time / reference
+        self._events.log(
+            f"{coarse} coarse meshings costing as much as "
+            f"{coarse_time / reference:0.1f} at the target size : "
+            f"{saved:0.1f} meshings and {saved * reference:0.2f}s saved",
+            coarse=coarse,
+            equivalent=coarse_time / reference,
+            saved=saved,
+            saved_time=saved * reference,
+        )
 
-            if best_param is None:
-                raise RuntimeError("Error during the optimization")
+    def _check_dimensions(
+        self, reactor_dim: vector2, chimney_dim: vector2, mesh_size: float
+    ) -> Result:
+        if reactor_dim.x <= 0 or reactor_dim.y <= 0:
+            return Result(error="The dimensions of the reactor must be positive")
 
-            return best_param
+        if chimney_dim.x <= 0 or chimney_dim.y <= 0:
+            return Result(error="The dimensions of the chimney must be positive")
 
-        print("")
-        print("==================================")
-        print("Optimization succeded...")
-        print("==================================")
-        print("")
+        if mesh_size <= 0:
+            return Result(error="The mesh size must be positive")
 
-        return result.x
+        return Result(value=True)
 
     def _handling_optimization(
         self,
@@ -282,22 +703,48 @@ class ReactorMaker:
         msh_sz,
         per_square,
         per_curvature,
+        workers: int = 1,
+        surrogate: bool = False,
+        budget: Optional[OptimizationBudget] = None,
+        strategy: str = "lbfgsb",
+        fidelities: Sequence[float] = (1,),
     ) -> Result:
         square_width = 0
         per_curve = 0
 
         if optimize:
-            print()
-            print("Optimize option selected...")
-            print("Optimizing...")
+            self._events.log()
+            self._events.log("Optimize option selected...")
+            self._events.log("Optimizing...")
             if chimney_dim.x > reactor_dim.x:
                 return Result(
                     error="Chimney width can't be greater than the max size of the meshing square"
                 )
 
-            result = self._optimize_geom_mesh(center, reactor_dim, chimney_dim, msh_sz)
+            if workers < 1:
+                return Result(error="The number of workers must be at least 1")
 
-            print("Best parameters : ", result)
+            if any(factor < 1 for factor in fidelities):
+                return Result(error="The fidelity factors must be at least 1")
+
+            if strategy not in STRATEGIES:
+                return Result(
+                    error=f"Unknown strategy {strategy}, expected one of {', '.join(STRATEGIES)}"
+                )
+
+            result, _ = self._optimize_geom_mesh(
+                center,
+                reactor_dim,
+                chimney_dim,
+                msh_sz,
+                workers,
+                surrogate,
+                budget,
+                strategy,
+                fidelities,
+            )
+
+            self._events.log(f"Best parameters : {result}")
             square_width = result[0] * reactor_dim.x
             per_curve = result[1]
 
@@ -321,6 +768,7 @@ class ReactorMaker:
 
         return Result(value=(square_width, per_curve))
 
+    @traced("create_geometry")
     def create_geometry(
         self,
         center: vector3,
@@ -330,16 +778,61 @@ class ReactorMaker:
         mesh_size: float,
         per_curvature: float = 0.1,
         optimize: bool = False,
+        workers: int = 1,
+        surrogate: bool = False,
+        budget: Optional[OptimizationBudget] = None,
+        strategy: str = "lbfgsb",
+        fidelities: Sequence[float] = (1,),
     ) -> Result:
+        # Checked before anything starts the SALOME session
+        checked = self._check_dimensions(reactor_dim, chimney_dim, mesh_size)
+        if not checked:
+            return checked
+
+        self._events.stage("geometry")
+
+        cache_key = None
+        if self._cache is not None:
+            parameters = {
+                "center": [center.x, center.y, center.z],
+                "reactor_dim": [reactor_dim.x, reactor_dim.y],
+                "chimney_dim": [chimney_dim.x, chimney_dim.y],
+                "per_square": per_square,
+                "mesh_size": mesh_size,
+                "per_curvature": per_curvature,
+                "optimize": optimize,
+                "surrogate": surrogate,
+                "backend": self._backend.name,
+            }
+            # The strategy, the fidelities and the budget change the parameters found, the keys of
+            # the entries using the defaults are kept
+            if optimize and strategy != "lbfgsb":
+                parameters["strategy"] = strategy
+            if optimize and set(fidelities) != {1}:
+                parameters["fidelities"] = sorted(set(fidelities) | {1})
+            if optimize and budget is not None:
+                parameters["budget"] = [
+                    budget.max_evaluations,
+                    budget.time_limit,
+                    budget.target_aspect_ratio,
+                    budget.stall,
+                ]
+
+            cache_key = self._cache.key("geometry", parameters)
+
+            geometry = self._load_geometry(cache_key)
+            if geometry is not None:
+                self._events.log("Geometry loaded from the cache")
+                self._events.log()
+                return Result(value=geometry)
+
         nb_seg = ceil(chimney_dim.x / mesh_size)
         msh_sz = chimney_dim.x / nb_seg
 
-        print(
+        self._events.log(
             f"New characteristics mesh size to maximize the aspect ratio : {mesh_size:0.2f} ⭢ {msh_sz:0.2f}"
         )
-        print()
-
-        sketcher = Sketcher(self._geompy)
+        self._events.log()
 
         square_width, per_curve = self._handling_optimization(
             optimize,
@@ -349,54 +842,152 @@ class ReactorMaker:
             msh_sz,
             per_square,
             per_curvature,
+            workers,
+            surrogate,
+            budget,
+            strategy,
+            fidelities,
         ).unwrap()
 
-        base = self._create_base(
-            sketcher, center, reactor_dim, chimney_dim, square_width, per_curve
+        # The base only depends on the radius and the chimney width, a change of
+        # height only needs new extrusions
+        base_key = (
+            (center.x, center.y, center.z),
+            reactor_dim.x,
+            chimney_dim.x,
+            round(square_width, 12),
+            round(per_curve, 12),
         )
 
-        print(
-            f"Quality of the meshing : {"Ok" if self._geompy.CheckShape(base) else "No"}"
+        base = self._bases.get(base_key)
+        if base is None:
+            base = self._create_base(
+                Sketcher(self._geompy),
+                center,
+                reactor_dim,
+                chimney_dim,
+                square_width,
+                per_curve,
+            )
+            self._bases.put(base_key, base)
+
+            self._events.log(
+                f"Quality of the meshing : {'Ok' if self._geompy.CheckShape(base) else 'No'}"
+            )
+        else:
+            self._events.log("Base reused from a previous geometry")
+        self._events.log()
+
+        with self._report.span("extrusion"):
+            direction = self._geompy.MakeVectorDXDYDZ(0, 0, 1)
+            solid = self._geompy.MakePrismVecH(base, direction, reactor_dim.y)
+            solid = self._geompy.MakeGlueFaces(solid, 1e-6)
+
+            face_chimney = self._geompy.GetFaceNearPoint(
+                solid,
+                self._geompy.MakeVertex(center.x, center.y, center.z + reactor_dim.y),
+            )
+            chimney = self._geompy.MakePrismVecH(face_chimney, direction, chimney_dim.y)
+
+        with self._report.span("glue"):
+            reactor = self._geompy.MakePartition([solid, chimney])
+            reactor = self._geompy.MakeGlueFaces(reactor, 1e-6)
+
+        with self._report.span("index"):
+            index = SubShapeIndex(self._geompy, reactor)
+
+        self._events.log("Creation of the groups...")
+        groups = self._create_group(
+            reactor, index, center, reactor_dim, chimney_dim
+        ).unwrap()
+        self._events.log("Done !")
+        self._events.log()
+
+        geometry = ReactorGeometry(
+            geometry=reactor,
+            groups=groups,
+            reactor_dim=reactor_dim,
+            chimney_dim=chimney_dim,
+            per_square=per_square,
+            mesh_size=msh_sz,
+            square_width=square_width,
+            cache_key=cache_key,
+            base_key=base_key,
+            index=index,
+            backend=self._backend,
+            report=self._report,
+            geompy=self._geompy,
         )
-        print()
 
-        direction = self._geompy.MakeVectorDXDYDZ(0, 0, 1)
-        solid = self._geompy.MakePrismVecH(base, direction, reactor_dim.y)
-        solid = self._geompy.MakeGlueFaces(solid, 1e-6)
+        if cache_key is not None:
+            self._store_geometry(geometry)
+
+        return Result(value=geometry)
 
-        face_chimney = self._geompy.GetFaceNearPoint(
-            solid, self._geompy.MakeVertex(center.x, center.y, center.z + reactor_dim.y)
+    @traced("load_cache")
+    def _load_geometry(self, cache_key: str) -> Optional[ReactorGeometry]:
+        return self._cache.read(
+            cache_key,
+            lambda entry, metadata: self._read_geometry(cache_key, entry, metadata),
         )
-        chimney = self._geompy.MakePrismVecH(face_chimney, direction, chimney_dim.y)
-
-        reactor = self._geompy.MakePartition([solid, chimney])
-        reactor = self._geompy.MakeGlueFaces(reactor, 1e-6)
-
-        print("Creation of the groups...")
-        groups = self._create_group(reactor, center, reactor_dim, chimney_dim).unwrap()
-        print("Done !")
-        print()
-
-        return Result(
-            value=ReactorGeometry(
-                geometry=reactor,
-                groups=groups,
-                reactor_dim=reactor_dim,
-                chimney_dim=chimney_dim,
-                per_square=per_square,
-                mesh_size=msh_sz,
-                square_width=square_width,
-            )
+
+    def _read_geometry(self, cache_key: str, entry, metadata) -> ReactorGeometry:
+        reactor = self._geompy.ImportBREP(str(entry.joinpath("geometry.brep")))
+
+        # Entries stored before the key of the base was kept can't be swept
+        base_key = metadata.get("base_key")
+        if base_key is not None:
+            base_key = (tuple(base_key[0]), *base_key[1:])
+
+        groups = []
+        for ids in metadata["groups"]:
+            group = self._geompy.CreateGroup(reactor, self._geompy.ShapeType["FACE"])
+            self._geompy.UnionIDs(group, ids)
+            groups.append(group)
+
+        return ReactorGeometry(
+            geometry=reactor,
+            groups=tuple(groups),
+            reactor_dim=vector2(*metadata["reactor_dim"]),
+            chimney_dim=vector2(*metadata["chimney_dim"]),
+            per_square=metadata["per_square"],
+            mesh_size=metadata["mesh_size"],
+            square_width=metadata["square_width"],
+            cache_key=cache_key,
+            base_key=base_key,
+            backend=self._backend,
+            report=self._report,
+            geompy=self._geompy,
         )
 
+    @traced("store_cache")
+    def _store_geometry(self, geometry: ReactorGeometry) -> None:
+        def writer(entry):
+            self._geompy.ExportBREP(
+                geometry.geometry, str(entry.joinpath("geometry.brep"))
+            )
+
+            return {
+                "groups": [
+                    list(self._geompy.GetObjectIDs(group)) for group in geometry.groups
+                ],
+                "reactor_dim": [geometry.reactor_dim.x, geometry.reactor_dim.y],
+                "chimney_dim": [geometry.chimney_dim.x, geometry.chimney_dim.y],
+                "per_square": geometry.per_square,
+                "mesh_size": geometry.mesh_size,
+                "square_width": geometry.square_width,
+                "base_key": geometry.base_key,
+            }
+
+        self._cache.store(geometry.cache_key, writer)
+
     def _mesh_near_points(self, points, geometry, mesh, base: bool) -> None:
         nb_seg_tot = 0
         for i, point in enumerate(points):
-            vertice = self._geompy.MakeVertex(point.x, point.y, point.z)
-            edge = self._geompy.GetEdgeNearPoint(geometry.geometry, vertice)
+            edge_index, _ = geometry.index.nearest_edge(point)
+            edge = geometry.index.edges[edge_index]
 
-            length = self._geompy.BasicProperties(edge)[0]
-            nb_seg = ceil(length / geometry.mesh_size)
+            nb_seg = ceil(geometry.index.edge_lengths[edge_index] / geometry.mesh_size)
 
             if base:
                 if i >= 0 and i <= 2:
@@ -409,7 +1000,8 @@ class ReactorMaker:
             algo.NumberOfSegments(nb_seg)
             algo.Propagation()
 
-    def _create_base_mesh(self, geometry, mesh, optimize: bool, all_edges) -> None:
+    @traced("base_hypotheses")
+    def _create_base_mesh(self, geometry, mesh, optimize: bool) -> None:
         points = [
             vector3(geometry.chimney_dim.x / 2, 0, 0),
             vector3(geometry.chimney_dim.x / 2, geometry.chimney_dim.x / 2 + 1, 0),
@@ -425,12 +1017,16 @@ class ReactorMaker:
 
         self._mesh_near_points(points, geometry, mesh, True)
 
+        self._mesh_spoke(geometry, mesh, optimize)
+
+    def _mesh_spoke(self, geometry, mesh, optimize: bool) -> None:
         # different way to mesh this segment
         on_line_pos = (
             geometry.square_width / 2 + (1 / 2 ** (1 / 2)) * geometry.reactor_dim.x
         ) / 2
         point = vector3(on_line_pos, on_line_pos, 0)
-        edge = self._find_egde_by_geometry(all_edges, point).unwrap()
+        edge_index = self._find_egde_by_geometry(geometry.index, point).unwrap()
+        edge = geometry.index.edges[edge_index]
 
         algo = mesh.Segment(edge)
         if optimize:
@@ -439,11 +1035,49 @@ class ReactorMaker:
             )
             algo.GeometricProgression(edge_length_min, ratio)
         else:
-            length = self._geompy.BasicProperties(edge)[0]
-            nb_seg = ceil(length / geometry.mesh_size)
+            nb_seg = ceil(geometry.index.edge_lengths[edge_index] / geometry.mesh_size)
             algo.NumberOfSegments(nb_seg)
         algo.Propagation()
 
+    @traced("quadrant_hypotheses")
+    def _create_quadrant_mesh(self, geometry, mesh, optimize: bool) -> None:
+        width = geometry.chimney_dim.x
+        middle = (geometry.chimney_dim.x + geometry.square_width) / 4
+
+        # Halves of the sides of the chimney, then the sides of the corner of the
+        # square, mirrored by the diagonal so that both rays get the same nodes
+        counts = []
+        for point in (
+            vector3(width / 4, 0, 0),
+            vector3(0, width / 4, 0),
+            vector3(width / 2, middle, 0),
+            vector3(middle, width / 2, 0),
+        ):
+            edge_index, _ = geometry.index.nearest_edge(point)
+            nb_seg = ceil(geometry.index.edge_lengths[edge_index] / geometry.mesh_size)
+            counts.append(nb_seg)
+
+            algo = mesh.Segment(geometry.index.edges[edge_index])
+            algo.NumberOfSegments(nb_seg)
+            algo.Propagation()
+
+        # Each arc of the disk faces a half side of the chimney and a side of the
+        # corner of the square
+        for angle in (pi / 8, 3 * pi / 8):
+            point = vector3(
+                geometry.reactor_dim.x * cos(angle),
+                geometry.reactor_dim.x * sin(angle),
+                0,
+            )
+            edge_index, _ = geometry.index.nearest_edge(point)
+
+            algo = mesh.Segment(geometry.index.edges[edge_index])
+            algo.NumberOfSegments(counts[0] + counts[2])
+            algo.Propagation()
+
+        self._mesh_spoke(geometry, mesh, optimize)
+
+    @traced("extrusion_hypotheses")
     def _create_extrusion_mesh(self, geometry, mesh) -> None:
         points = [
             vector3(
@@ -460,101 +1094,320 @@ class ReactorMaker:
 
         self._mesh_near_points(points, geometry, mesh, False)
 
-    def mesh(self, geometry: ReactorGeometry, optimize: bool) -> Result:
+    @traced("mesh")
+    def mesh(
+        self,
+        geometry: ReactorGeometry,
+        optimize: bool,
+        sweep: bool = False,
+        symmetric: bool = False,
+    ) -> Result:
+        """
+        Mesh the reactor with hexahedra
+
+        Args:
+            geometry    (ReactorGeometry):  The geometry of the reactor
+            optimize    (bool):             Grade the segments of the base like the
+                                            optimization did
+            sweep       (bool):             Only mesh the base with SMESH and sweep
+                                            it into hexahedra with NumPy, see `sweep`
+            symmetric   (bool):             Only mesh a quadrant of the base with
+                                            SMESH and rotate it, implies `sweep`.
+                                            Its segments follow the topology of
+                                            the quadrant : the mesh covers the
+                                            same base, it isn't the full one
+
+        Returns:
+            Result: The ReactorMesh
+
+        """
         if geometry.geometry is None:
             return Result(error="Geometry has not yet been created")
 
-        all_edges = self._geompy.SubShapeAllSortedCentres(
-            geometry.geometry, self._geompy.ShapeType["EDGE"]
-        )
+        self._events.stage("mesh")
+
+        # SMESH can't sweep a base it hasn't meshed itself
+        sweep = sweep or symmetric
+        if sweep and geometry.base_key is None:
+            self._events.log(
+                "Base of the geometry unknown, the reactor is meshed by SMESH"
+            )
+            self._events.log()
+            sweep = symmetric = False
+
+        cache_key = self._mesh_cache_key(geometry, optimize, sweep, symmetric)
+        if cache_key is not None:
+
+            def reader(entry, _):
+                with self._report.span("load_cache"):
+                    # Swept and imported meshes are stored as arrays
+                    if entry.joinpath("mesh.npz").exists():
+                        arrays = MeshArrays.load(str(entry.joinpath("mesh.npz")))
+                        return self._reactor_mesh(geometry, None, arrays)
+
+                    meshes, _ = self._smesh.CreateMeshesFromMED(
+                        str(entry.joinpath("mesh.med"))
+                    )
+                    return self._reactor_mesh(geometry, meshes[0])
+
+            cached = self._cache.read(cache_key, reader)
+            if cached is not None:
+                self._events.log("Mesh loaded from the cache")
+                self._events.log()
+                return Result(value=cached)
+
+        if sweep:
+            return self._sweep_mesh(geometry, optimize, symmetric, cache_key)
 
         mesh = self._smesh.Mesh(geometry.geometry)
 
         mesh.Segment().NumberOfSegments(1)
 
-        self._create_base_mesh(geometry, mesh, optimize, all_edges)
+        self._create_base_mesh(geometry, mesh, optimize)
 
         self._create_extrusion_mesh(geometry, mesh)
 
         mesh.Quadrangle()
         mesh.Hexahedron()
 
+        SMESH = self._backend.smesh_module()
+
         mesh.GroupOnGeom(geometry.groups[0], "Inlet", SMESH.FACE)
         mesh.GroupOnGeom(geometry.groups[1], "Outlet", SMESH.FACE)
         mesh.GroupOnGeom(geometry.groups[2], "Wall", SMESH.FACE)
 
-        if not mesh.Compute():
-            return Result(error="Error when computing mesh")
-
-        all_elements = mesh.GetElementsId()
-
-        aspect_ratios = []
-        for elem_id in all_elements:
-            ar = mesh.GetAspectRatio(elem_id)
-            if ar > 0:
-                aspect_ratios.append(ar)
-
-        print(f"Total elements: {len(aspect_ratios)}")
-        print(f"Min AR: {min(aspect_ratios):.3f}")
-        print(f"Max AR: {max(aspect_ratios):.3f}")
-        print(f"Mean AR: {sum(aspect_ratios)/len(aspect_ratios):.3f}")
-        print()
-
-        return Result(
-            value=ReactorMesh(
-                mesh=mesh,
-                radius=geometry.reactor_dim.x,
-                height=geometry.reactor_dim.y,
-                per_square=geometry.per_square,
-                geompy=self._geompy,
+        self._events.stage("compute")
+        with self._report.span("compute"):
+            if not mesh.Compute():
+                return Result(error="Error when computing mesh")
+
+        if cache_key is not None:
+
+            def writer(entry):
+                mesh.ExportMED(str(entry.joinpath("mesh.med")))
+                return {}
+
+            with self._report.span("store_cache"):
+                self._cache.store(cache_key, writer)
+
+        return Result(value=self._reactor_mesh(geometry, mesh))
+
+    def _mesh_cache_key(
+        self, geometry: ReactorGeometry, optimize: bool, sweep: bool, symmetric: bool
+    ) -> Optional[str]:
+        if self._cache is None or geometry.cache_key is None:
+            return None
+
+        parameters = {"geometry": geometry.cache_key, "optimize": optimize}
+        if sweep:
+            parameters["sweep"] = True
+        if symmetric:
+            parameters["symmetric"] = True
+        return self._cache.key("mesh", parameters)
+
+    @traced("import_mesh")
+    def import_mesh(
+        self,
+        geometry: ReactorGeometry,
+        filename: str,
+        optimize: bool,
+        sweep: bool = False,
+        symmetric: bool = False,
+    ) -> Result:
+        """
+        Read a mesh of the geometry from a UNV file, plain or compressed (.gz, .xz),
+        and store it in the cache as the mesh `mesh` computes with the same
+        arguments, which then loads it instead of computing it
+
+        Args:
+            geometry    (ReactorGeometry):  The geometry of the mesh
+            filename    (str):              Path of the UNV file
+            optimize    (bool):             Same as `mesh`
+            sweep       (bool):             Same as `mesh`
+            symmetric   (bool):             Same as `mesh`
+
+        Returns:
+            Result: The ReactorMesh, without its SMESH counterpart
+
+        """
+        if geometry.geometry is None:
+            return Result(error="Geometry has not yet been created")
+
+        with self._report.span("read_unv"):
+            try:
+                arrays = read_unv(filename)
+            except (OSError, EOFError, ValueError) as e:
+                return Result(error=f"Error when reading {filename}: {e}")
+
+        sweep = sweep or symmetric
+        if geometry.base_key is None:
+            sweep = symmetric = False
+
+        cache_key = self._mesh_cache_key(geometry, optimize, sweep, symmetric)
+        if cache_key is not None:
+
+            def writer(entry):
+                arrays.save(str(entry.joinpath("mesh.npz")))
+                return {}
+
+            with self._report.span("store_cache"):
+                self._cache.store(cache_key, writer)
+
+        return Result(value=self._reactor_mesh(geometry, None, arrays))
+
+    def _base_geometry(self, geometry: ReactorGeometry, shape) -> ReactorGeometry:
+        # Geometry holding a planar shape, indexed to find the edges of the hypotheses
+        return ReactorGeometry(
+            shape,
+            None,
+            geometry.reactor_dim,
+            geometry.chimney_dim,
+            geometry.per_square,
+            geometry.mesh_size,
+            geometry.square_width,
+            backend=self._backend,
+            report=self._report,
+            geompy=self._geompy,
+        )
+
+    def _compute_base(self, geometry: ReactorGeometry, optimize: bool) -> Result:
+        center, _, _, square_width, per_curve = geometry.base_key
+
+        base = self._bases.get(geometry.base_key)
+        if base is None:
+            base = self._create_base(
+                Sketcher(self._geompy),
+                vector3(*center),
+                geometry.reactor_dim,
+                geometry.chimney_dim,
+                square_width,
+                per_curve,
+            )
+            self._bases.put(geometry.base_key, base)
+
+        mesh = self._smesh.Mesh(base)
+        mesh.Segment().NumberOfSegments(1)
+        self._create_base_mesh(self._base_geometry(geometry, base), mesh, optimize)
+        mesh.Quadrangle()
+
+        self._events.stage("compute")
+        with self._report.span("compute"):
+            if not mesh.Compute():
+                return Result(error="Error when computing mesh")
+
+        return Result(value=MeshArrays.from_mesh(mesh, groups=False))
+
+    def _compute_quadrant(self, geometry: ReactorGeometry, optimize: bool) -> Result:
+        center, _, _, square_width, per_curve = geometry.base_key
+
+        key = ("quadrant", geometry.base_key)
+        quadrant = self._bases.get(key)
+        if quadrant is None:
+            quadrant = self._create_quadrant(
+                Sketcher(self._geompy),
+                vector3(*center),
+                geometry.reactor_dim,
+                geometry.chimney_dim,
+                square_width,
+                per_curve,
             )
+            self._bases.put(key, quadrant)
+
+        mesh = self._smesh.Mesh(quadrant)
+        mesh.Segment().NumberOfSegments(1)
+        self._create_quadrant_mesh(
+            self._base_geometry(geometry, quadrant), mesh, optimize
         )
+        mesh.Quadrangle()
 
-    def _get_aspect_ratio(self, mesh) -> List:
-        all_elements = mesh.GetElementsId()
+        self._events.stage("compute")
+        with self._report.span("compute"):
+            if not mesh.Compute():
+                return Result(error="Error when computing mesh")
 
-        aspect_ratios = []
-        for elem_id in all_elements:
-            ar = mesh.GetAspectRatio(elem_id)
-            if ar > 0:
-                aspect_ratios.append(ar)
+        with self._report.span("replicate"):
+            try:
+                arrays = replicate_quadrant(
+                    MeshArrays.from_mesh(mesh, groups=False),
+                    (center[0], center[1]),
+                    1e-6 * geometry.mesh_size,
+                )
+            except ValueError as e:
+                return Result(error=str(e))
 
-        return aspect_ratios
+        return Result(value=arrays)
 
-    def _get_max_length(self, R, square_width, mesh_size) -> Tuple[float, float]:
-        N_theta = ceil(square_width / mesh_size)
-        # r0 = sqrt(2) * (square_width / 2)
-        r0 = (mesh_size * 4 * N_theta) / (2 * pi)
-        q = 1 + (2 * pi) / (4 * N_theta)
+    def _sweep_mesh(
+        self, geometry: ReactorGeometry, optimize: bool, symmetric: bool, cache_key
+    ) -> Result:
+        center, _, chimney_width, _, _ = geometry.base_key
 
-        def r_i(i):
-            return r0 * (1 + (2 * pi) / (4 * N_theta)) ** i
+        if symmetric:
+            base = self._compute_quadrant(geometry, optimize)
+        else:
+            base = self._compute_base(geometry, optimize)
+        if not base:
+            return base
+
+        # Same number of layers as the segments of the vertical edges of a mesh
+        # computed by SMESH
+        with self._report.span("sweep"):
+            arrays = sweep_base(
+                base.unwrap(),
+                (center[0], center[1]),
+                chimney_width,
+                geometry.reactor_dim.y,
+                geometry.chimney_dim.y,
+                ceil(geometry.reactor_dim.y / geometry.mesh_size),
+                ceil(geometry.chimney_dim.y / geometry.mesh_size),
+            )
 
-        N = log(R / r0) / log(1 + (2 * pi) / (4 * N_theta))
+        if cache_key is not None:
 
-        dr_min = r_i(1) - r_i(0)
-        dr_max = r_i(N) - r_i(N - 1)
+            def writer(entry):
+                arrays.save(str(entry.joinpath("mesh.npz")))
+                return {}
 
-        return dr_min, q
+            with self._report.span("store_cache"):
+                self._cache.store(cache_key, writer)
 
-    def _find_egde_by_geometry(
-        self, all_edges, center_pt: vector3, tol: float = 1e-1
-    ) -> Result:
-        for edge in all_edges:
-            vertices = self._geompy.ExtractShapes(
-                edge, self._geompy.ShapeType["VERTEX"]
+        return Result(value=self._reactor_mesh(geometry, None, arrays))
+
+    def _reactor_mesh(
+        self, geometry: ReactorGeometry, mesh, arrays: MeshArrays = None
+    ) -> ReactorMesh:
+        regions = None
+        if geometry.base_key is not None:
+            center, _, _, square_width, per_curve = geometry.base_key
+            regions = ReactorRegions(
+                (center[0], center[1]), square_width, per_curve, geometry.reactor_dim.y
             )
 
-            coords1 = self._geompy.PointCoordinates(vertices[0])
-            coords2 = self._geompy.PointCoordinates(vertices[1])
-            coords = [abs(coords1[i] + coords2[i]) / 2 for i in range(3)]
+        return ReactorMesh(
+            mesh=mesh,
+            radius=geometry.reactor_dim.x,
+            height=geometry.reactor_dim.y,
+            per_square=geometry.per_square,
+            geompy=self._geompy,
+            backend=self._backend,
+            report=self._report,
+            arrays=arrays,
+            regions=regions,
+        )
+
+    @traced("quality")
+    def _get_max_aspect_ratio(self, mesh) -> float:
+        return MeshQuality.from_mesh(mesh, sample=0, backend=self._backend).max
+
+    def _get_max_length(self, R, square_width, mesh_size) -> Tuple[float, float]:
+        return geometric_progression(R, square_width, mesh_size)
 
-            if (
-                abs(coords[0] - center_pt.x) < tol
-                and abs(coords[1] - center_pt.y) < tol
-                and abs(coords[2] - center_pt.z) < tol
-            ):
+    def _find_egde_by_geometry(
+        self, index: SubShapeIndex, center_pt: vector3, tol: float = 1e-1
+    ) -> Result:
+        edge_index, distance = index.nearest_edge(center_pt)
 
-                return Result(value=edge)
+        if distance > tol:
+            return Result(error="No edge find")
 
-        return Result(error="No edge find")
+        return Result(value=edge_index)
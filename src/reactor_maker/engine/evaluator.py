@@ -0,0 +1,104 @@
+import multiprocessing
+from typing import List, Optional, Sequence
+
+# State of a worker process, set once by `_init_worker`
+_worker_maker = None
+_worker_problem = None
+
+
+def _init_worker(problem, backend):
+    global _worker_maker, _worker_problem
+
+    # Each worker owns its SALOME session, started here rather than on the first
+    # evaluation so that a broken installation fails when the pool starts
+    from .core import ReactorMaker
+
+    backend.start()
+
+    _worker_maker = ReactorMaker(backend=backend)
+    _worker_problem = problem
+
+
+def _evaluate(task) -> float:
+    x, mesh_size = task
+    center, reactor_dim, chimney_dim, default_size = _worker_problem
+    return _worker_maker._evaluate_base(
+        center, reactor_dim, chimney_dim, mesh_size or default_size, x
+    )
+
+
+class SerialEvaluator:
+    """
+    Evaluate the optimizer objective one point after the other in the current session
+
+    Args:
+        maker   (ReactorMaker): Engine used to build and mesh the base
+        problem (Tuple):        (center, reactor_dim, chimney_dim, mesh_size)
+
+    """
+
+    def __init__(self, maker, problem):
+        self._maker = maker
+        self._problem = problem
+
+    def map(
+        self, points: Sequence[Sequence[float]], mesh_size: Optional[float] = None
+    ) -> List[float]:
+        center, reactor_dim, chimney_dim, default_size = self._problem
+        return [
+            self._maker._evaluate_base(
+                center, reactor_dim, chimney_dim, mesh_size or default_size, x
+            )
+            for x in points
+        ]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParallelEvaluator:
+    """
+    Evaluate batches of points of the optimizer objective concurrently. Each worker
+    process holds its own SALOME session and builders
+
+    Args:
+        workers (int):      Number of worker processes
+        problem (Tuple):    (center, reactor_dim, chimney_dim, mesh_size)
+        backend (Backend):  Backend started by each worker
+
+    """
+
+    def __init__(self, workers: int, problem, backend):
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(
+            processes=workers, initializer=_init_worker, initargs=(problem, backend)
+        )
+
+    def map(
+        self, points: Sequence[Sequence[float]], mesh_size: Optional[float] = None
+    ) -> List[float]:
+        return self._pool.map(
+            _evaluate, [(tuple(x), mesh_size) for x in points], chunksize=1
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_evaluator(maker, workers: int, problem):
+    if workers > 1:
+        return ParallelEvaluator(workers, problem, maker.backend)
+    return SerialEvaluator(maker, problem)
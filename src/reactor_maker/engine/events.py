@@ -0,0 +1,133 @@
+import queue
+import time
+from typing import Callable, Dict, List, Optional
+
+LOG = "log"
+STAGE = "stage"
+PROGRESS = "progress"
+
+
+class Event:
+    """
+    Message emitted by the engine
+
+    Args:
+        kind    (str):      LOG, STAGE or PROGRESS
+        message (str):      Human readable text of the event
+        data    (Dict):     Structured values of the event (stage name, number of
+                            evaluations, best aspect ratio...)
+
+    """
+
+    def __init__(self, kind: str, message: str = "", data: Optional[Dict] = None):
+        self._kind = kind
+        self._message = message
+        self._data = data if data is not None else {}
+        self._time = time.time()
+
+    @property
+    def kind(self) -> str:
+        return self._kind
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+    @property
+    def data(self) -> Dict:
+        return self._data
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    def __repr__(self):
+        return f"Event({self._kind!r}, {self._message!r}, {self._data!r})"
+
+
+def print_event(event: Event) -> None:
+    # Console output of the engine, the default listener, stages only mark the
+    # progress of the run
+    if event.kind != STAGE:
+        print(event.message)
+
+
+class EventStream:
+    """
+    Dispatch the events of the engine to its listeners, printing them when no
+    listener is given
+    """
+
+    def __init__(self, listeners: Optional[List[Callable[[Event], None]]] = None):
+        self._listeners = list(listeners) if listeners is not None else [print_event]
+
+    @property
+    def listeners(self) -> List[Callable[[Event], None]]:
+        return self._listeners
+
+    def subscribe(self, listener: Callable[[Event], None]) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Event], None]) -> None:
+        self._listeners.remove(listener)
+
+    def emit(self, event: Event) -> None:
+        for listener in self._listeners:
+            listener(event)
+
+    def log(self, message: str = "", **data) -> None:
+        self.emit(Event(LOG, message, data))
+
+    def stage(self, name: str, message: str = "") -> None:
+        self.emit(Event(STAGE, message, {"stage": name}))
+
+    def progress(self, message: str = "", **data) -> None:
+        self.emit(Event(PROGRESS, message, data))
+
+    def __getstate__(self):
+        # Listeners hold widgets and queues of the parent process, the copies sent
+        # to the workers print
+        return {"_listeners": [print_event]}
+
+
+class EventQueue:
+    """
+    Thread-safe listener keeping the events until a consumer drains them in batches,
+    the oldest ones being dropped beyond `maxsize`
+
+    Args:
+        maxsize (int):  Maximum number of pending events
+
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._queue = queue.Queue(maxsize)
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def __call__(self, event: Event) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._dropped += 1
+                except queue.Empty:
+                    pass
+
+    def drain(self, limit: Optional[int] = None) -> List[Event]:
+        """
+        Pending events, at most `limit`, without blocking
+        """
+        events = []
+        while limit is None or len(events) < limit:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
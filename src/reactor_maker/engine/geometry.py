@@ -1,8 +1,7 @@
-import salome
-
-salome.salome_init_without_session()
-
-from salome.geom import geomBuilder
+from .backend import Backend, SalomeBackend
+from .compression import stream_export
+from .index import SubShapeIndex
+from .report import RunReport, traced
 
 
 class ReactorGeometry:
@@ -15,8 +14,17 @@ class ReactorGeometry:
         per_square,
         mesh_size,
         square_width,
+        cache_key=None,
+        base_key=None,
+        index=None,
+        backend: Backend = None,
+        report: RunReport = None,
+        geompy=None,
     ):
-        self._geompy = geomBuilder.New()
+        self._backend = backend if backend is not None else SalomeBackend()
+        # Builder of the engine, or created on first use
+        self._geompy = geompy
+        self._report = report if report is not None else RunReport()
 
         self._geometry = geometry
         self._reactor_dim = reactor_dim
@@ -25,6 +33,18 @@ class ReactorGeometry:
         self._groups = groups
         self._mesh_size = mesh_size
         self._square_width = square_width
+        self._cache_key = cache_key
+        self._base_key = base_key
+        self._index = index
+
+    def _builder(self):
+        if self._geompy is None:
+            self._geompy = self._backend.geom_builder()
+        return self._geompy
+
+    @property
+    def report(self) -> RunReport:
+        return self._report
 
     @property
     def geometry(self):
@@ -54,10 +74,37 @@ class ReactorGeometry:
     def square_width(self):
         return self._square_width
 
+    @property
+    def cache_key(self):
+        return self._cache_key
+
+    @property
+    def base_key(self):
+        return self._base_key
+
+    @property
+    def index(self) -> SubShapeIndex:
+        if self._index is None:
+            if self._geometry is None:
+                raise ValueError("Geometry has not yet been created")
+            with self._report.span("index"):
+                self._index = SubShapeIndex(self._builder(), self._geometry)
+        return self._index
+
+    @traced("export_geometry")
     def export_to(self, filename: str) -> bool:
+        """
+        Write the geometry to STL, compressed while it is written when `filename`
+        ends with .gz or .xz
+        """
         if self._geometry is None:
             raise ValueError("Geometry has not yet been created")
 
-        self._geompy.ExportSTL(self._geometry, filename)
+        builder = self._builder()
+        stream_export(
+            lambda path: builder.ExportSTL(self._geometry, path),
+            filename,
+            pipe=self._backend.pipe_exports,
+        )
 
         return True
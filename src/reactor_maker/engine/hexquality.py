@@ -0,0 +1,464 @@
+from math import sqrt
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .arrays import MeshArrays, QUADRANGLE, HEXAHEDRON, REVERSED_HEXAHEDRON
+
+METRICS = (
+    "scaled_jacobian",
+    "skewness",
+    "non_orthogonality",
+    "warpage",
+    "volume_ratio",
+)
+# Metrics whose lowest values are the worst ones
+_LOW_IS_WORSE = {"scaled_jacobian"}
+
+# Faces of a hexahedron turning counterclockwise seen from outside, the bottom face
+# 0-1-2-3 turning counterclockwise seen from the top face 4-5-6-7
+_FACES = np.array(
+    [
+        [0, 3, 2, 1],
+        [4, 5, 6, 7],
+        [0, 1, 5, 4],
+        [1, 2, 6, 5],
+        [2, 3, 7, 6],
+        [3, 0, 4, 7],
+    ]
+)
+# Each node followed by its three neighbours, in the order giving a positive
+# Jacobian on a valid hexahedron
+_CORNERS = np.array(
+    [
+        [0, 1, 3, 4],
+        [1, 2, 0, 5],
+        [2, 3, 1, 6],
+        [3, 0, 2, 7],
+        [4, 7, 5, 0],
+        [5, 4, 6, 1],
+        [6, 5, 7, 2],
+        [7, 6, 4, 3],
+    ]
+)
+# Normalized Jacobian of a corner below which, in absolute value, the hexahedron is
+# counted as degenerate : flat or with a collapsed edge
+_DEGENERATE = 1e-9
+
+# Hexahedra processed at once, small enough for the temporary arrays to stay in the
+# cache of the processor
+_CHUNK = 1 << 12
+
+
+# Vectors are held as (x, y, z) tuples of contiguous arrays, far faster than the
+# last axis of an (..., 3) array for the small cross and dot products
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _add(*vectors):
+    return tuple(sum(components) for components in zip(*vectors))
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _cosine(a, b):
+    # Cosine of the angle between vectors, 1 when one of them is null
+    norms = np.sqrt(_dot(a, a) * _dot(b, b))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norms > 0, _dot(a, b) / norms, 1.0)
+
+
+def _degrees(cosine):
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def _cell_metrics(points) -> Dict[str, np.ndarray]:
+    # Metrics of each cell, points given as (x, y, z) arrays of shape (H, 8)
+    def node(*indices):
+        return tuple(component[:, list(indices)] for component in points)
+
+    # Edges from each corner to its three neighbours, shape (H, 8)
+    corner = node(*_CORNERS[:, 0])
+    e1, e2, e3 = (_sub(node(*_CORNERS[:, i]), corner) for i in (1, 2, 3))
+    determinants = _dot(e1, _cross(e2, e3))
+    lengths = np.sqrt(_dot(e1, e1) * _dot(e2, e2) * _dot(e3, e3))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corners = determinants / lengths
+    scaled = np.where(lengths > 0, corners, -1.0).min(axis=1)
+
+    def vertex(i):
+        return tuple(component[:, i] for component in points)
+
+    p = [vertex(i) for i in range(8)]
+    axes = [
+        _add(_sub(p[1], p[0]), _sub(p[2], p[3]), _sub(p[5], p[4]), _sub(p[6], p[7])),
+        _add(_sub(p[3], p[0]), _sub(p[2], p[1]), _sub(p[7], p[4]), _sub(p[6], p[5])),
+        _add(_sub(p[4], p[0]), _sub(p[5], p[1]), _sub(p[6], p[2]), _sub(p[7], p[3])),
+    ]
+    norms = [np.sqrt(_dot(axis, axis)) for axis in axes]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centre = _dot(axes[0], _cross(axes[1], axes[2])) / (
+            norms[0] * norms[1] * norms[2]
+        )
+    centre = np.nan_to_num(centre, nan=-1.0)
+    skewness = np.maximum.reduce(
+        [
+            np.abs(_cosine(axes[0], axes[1])),
+            np.abs(_cosine(axes[0], axes[2])),
+            np.abs(_cosine(axes[1], axes[2])),
+        ]
+    )
+
+    # Angle between the two triangles of each diagonal of the faces, shape (H, 6)
+    f0, f1, f2, f3 = (node(*_FACES[:, i]) for i in range(4))
+    d02, d13 = _sub(f2, f0), _sub(f3, f1)
+    flatness = np.minimum(
+        _cosine(_cross(_sub(f1, f0), d02), _cross(d02, _sub(f3, f0))),
+        _cosine(_cross(_sub(f1, f0), _sub(f3, f0)), _cross(_sub(f2, f1), d13)),
+    ).min(axis=1)
+
+    # Divergence theorem over the faces, exact for planar faces
+    areas = _cross(d02, d13)
+    centres = _add(f0, f1, f2, f3)
+    volumes = _dot(centres, areas).sum(axis=1) / 24
+
+    return {
+        "scaled_jacobian": np.minimum(scaled, centre),
+        # Lowest normalized Jacobian of the corners, 0 on a collapsed edge
+        "jacobian": np.where(lengths > 0, corners, 0.0).min(axis=1),
+        "skewness": skewness,
+        "warpage": _degrees(flatness),
+        "volume": volumes,
+        "centroid": np.column_stack([component.mean(axis=1) for component in points]),
+    }
+
+
+def _face_keys(faces: np.ndarray, nb_nodes: int) -> np.ndarray:
+    # A quadrangle of a conforming mesh is identified by its lowest node and the
+    # node opposite to it, no other face holds this diagonal
+    rows = np.arange(len(faces))
+    lowest = faces.argmin(axis=1)
+    return faces[rows, lowest] * nb_nodes + faces[rows, (lowest + 2) % 4]
+
+
+class MetricSummary(NamedTuple):
+    minimum: float
+    maximum: float
+    mean: float
+    # Ids of the worst elements, the worst first
+    worst: np.ndarray
+
+
+class ReactorRegions:
+    """
+    Regions of a reactor a hexahedron belongs to, given its centroid : the chimney
+    above the body, the curved centre square of the base and the outer ring around
+    it
+
+    Args:
+        center          (Tuple[float, float]):  (x, y) of the axis
+        square_width    (float):                Width of the centre square
+        per_curvature   (float):                Curvature of its sides
+        height          (float):                Height of the body
+
+    """
+
+    def __init__(
+        self,
+        center: Tuple[float, float],
+        square_width: float,
+        per_curvature: float,
+        height: float,
+    ):
+        self._center = np.asarray(center, dtype=np.float64)
+        self._height = height
+        self._half = square_width / 2
+
+        # The side x = width / 2 bulges by `bulge` at y = 0 : arc of the circle of
+        # center (offset, 0) going through the corners of the square
+        self._bulge = per_curvature * (sqrt(2) - 1) * self._half
+        if self._bulge > 0:
+            u = (self._half**2 - self._bulge**2) / (2 * self._bulge)
+            self._offset = self._half - u
+            self._radius = u + self._bulge
+
+    def __call__(self, centroids: np.ndarray, bottom: float) -> Dict[str, np.ndarray]:
+        relative = np.abs(centroids[:, :2] - self._center)
+        # By symmetry, the side facing the point is taken as the side x = width / 2
+        along = relative.max(axis=1)
+        across = relative.min(axis=1)
+
+        if self._bulge > 0:
+            square = (along - self._offset) ** 2 + across**2 <= self._radius**2
+            square &= along <= self._half + self._bulge
+        else:
+            square = along <= self._half
+
+        chimney = centroids[:, 2] > bottom + self._height
+        return {
+            "centre square": square & ~chimney,
+            "outer ring": ~square & ~chimney,
+            "chimney": chimney,
+        }
+
+
+class HexQuality:
+    """
+    Quality of the hexahedra of a mesh, computed for all of them at once :
+
+    - scaled Jacobian : lowest normalized Jacobian over the corners and the centre,
+      1 for a cube, negative for an inverted element
+    - skewness : highest |cos| between the principal axes, 0 for a cube
+    - non-orthogonality : highest angle between the line joining the centroids of
+      two neighbours and the normal of their common face, in degrees
+    - warpage : highest angle between the two triangles of a face, in degrees
+    - volume ratio : highest ratio between the volumes of two neighbours
+
+    Args:
+        element_ids (np.ndarray):               SMESH ids of the hexahedra
+        values      (Dict[str, np.ndarray]):    Value of each metric of `METRICS`
+        negative    (int):                      Hexahedra with a negative Jacobian
+        regions     (Dict[str, np.ndarray]):    Mask of the hexahedra of each region
+        groups      (Dict[str, np.ndarray]):    Rows of the hexahedra touching the
+                                                faces of each group
+        degenerate  (int):                      Hexahedra with a null Jacobian and
+                                                no negative one, flat or collapsed
+
+    """
+
+    def __init__(
+        self,
+        element_ids: np.ndarray,
+        values: Dict[str, np.ndarray],
+        negative: int,
+        regions: Optional[Dict[str, np.ndarray]] = None,
+        groups: Optional[Dict[str, np.ndarray]] = None,
+        degenerate: int = 0,
+    ):
+        self._element_ids = element_ids
+        self._values = values
+        self._negative = negative
+        self._degenerate = degenerate
+        self._regions = {} if regions is None else regions
+        self._groups = {} if groups is None else groups
+
+    @property
+    def element_ids(self) -> np.ndarray:
+        return self._element_ids
+
+    @property
+    def nb_elements(self) -> int:
+        return len(self._element_ids)
+
+    @property
+    def negative_jacobians(self) -> int:
+        return self._negative
+
+    @property
+    def degenerate(self) -> int:
+        return self._degenerate
+
+    @property
+    def regions(self) -> Dict[str, np.ndarray]:
+        return self._regions
+
+    @property
+    def groups(self) -> Dict[str, np.ndarray]:
+        return self._groups
+
+    def values(self, metric: str) -> np.ndarray:
+        return self._values[metric]
+
+    def summary(
+        self, metric: str, cells: Optional[np.ndarray] = None, worst: int = 10
+    ) -> Optional[MetricSummary]:
+        """
+        Statistics of a metric over the hexahedra `cells` (mask or rows), all of them
+        by default. None when there is no hexahedron
+        """
+        rows = np.arange(self.nb_elements) if cells is None else np.asarray(cells)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        if len(rows) == 0:
+            return None
+
+        values = self._values[metric][rows]
+        badness = -values if metric in _LOW_IS_WORSE else values
+        count = min(worst, len(rows))
+        picked = np.argpartition(badness, len(rows) - count)[len(rows) - count :]
+        picked = picked[np.argsort(badness[picked])[::-1]]
+
+        return MetricSummary(
+            float(values.min()),
+            float(values.max()),
+            float(values.mean()),
+            self._element_ids[rows[picked]],
+        )
+
+    def summaries(
+        self, cells: Optional[np.ndarray] = None, worst: int = 10
+    ) -> Dict[str, MetricSummary]:
+        return {metric: self.summary(metric, cells, worst) for metric in METRICS}
+
+    def by_region(self, worst: int = 10) -> Dict[str, Dict[str, MetricSummary]]:
+        return {
+            name: self.summaries(mask, worst) for name, mask in self._regions.items()
+        }
+
+    def by_group(self, worst: int = 10) -> Dict[str, Dict[str, MetricSummary]]:
+        return {
+            name: self.summaries(rows, worst) for name, rows in self._groups.items()
+        }
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: MeshArrays,
+        regions: Optional[Callable[[np.ndarray, float], Dict]] = None,
+    ) -> "HexQuality":
+        """
+        Compute the metrics of every hexahedron of the mesh
+
+        Args:
+            arrays  (MeshArrays):   The mesh, with its groups of faces
+            regions (Callable):     Masks of the regions from the centroids of the
+                                    hexahedra and the lowest z, see `ReactorRegions`
+
+        Returns:
+            HexQuality: The metrics
+
+        """
+        # The metrics expect the direct order, the arrays hold the SMDS one : an
+        # inverted hexahedron keeps a negative Jacobian
+        hexas = arrays.connectivity(HEXAHEDRON)[:, REVERSED_HEXAHEDRON]
+        if len(hexas) == 0:
+            raise ValueError("The mesh has no hexahedron")
+
+        nodes = arrays.nodes
+        nb_nodes, nb_cells = len(nodes), len(hexas)
+        coordinates = tuple(np.ascontiguousarray(nodes[:, i]) for i in range(3))
+
+        def gather(cells):
+            return tuple(component[cells] for component in coordinates)
+
+        metrics = {}
+        for start in range(0, nb_cells, _CHUNK):
+            chunk = _cell_metrics(gather(hexas[start : start + _CHUNK]))
+            for name, values in chunk.items():
+                metrics.setdefault(name, []).append(values)
+        metrics = {name: np.concatenate(values) for name, values in metrics.items()}
+
+        # Faces shared by two hexahedra, found by sorting the keys of all the faces
+        keys = np.concatenate(
+            [
+                _face_keys(
+                    hexas[start : start + _CHUNK][:, _FACES].reshape(-1, 4), nb_nodes
+                )
+                for start in range(0, nb_cells, _CHUNK)
+            ]
+        )
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        shared = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+        owner_faces, neighbour_faces = order[shared], order[shared + 1]
+        owners, neighbours = owner_faces // 6, neighbour_faces // 6
+
+        centroids, volumes = metrics["centroid"], metrics["volume"]
+
+        face = hexas[owners[:, None], _FACES[owner_faces % 6]]
+        f0, f1, f2, f3 = (gather(face[:, i]) for i in range(4))
+        normals = _cross(_sub(f2, f0), _sub(f3, f1))
+        centres = tuple(centroids[:, i] for i in range(3))
+        angles = _degrees(
+            _cosine(
+                tuple(c[neighbours] - c[owners] for c in centres),
+                normals,
+            )
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = volumes[owners] / volumes[neighbours]
+            ratios = np.abs(np.where(np.abs(ratios) < 1, 1 / ratios, ratios))
+
+        non_orthogonality = np.zeros(nb_cells)
+        volume_ratio = np.ones(nb_cells)
+        for cells in (owners, neighbours):
+            np.maximum.at(non_orthogonality, cells, angles)
+            np.maximum.at(volume_ratio, cells, ratios)
+
+        values = {
+            "scaled_jacobian": metrics["scaled_jacobian"],
+            "skewness": metrics["skewness"],
+            "non_orthogonality": non_orthogonality,
+            "warpage": metrics["warpage"],
+            "volume_ratio": volume_ratio,
+        }
+
+        # Hexahedra holding the faces of each group
+        groups = {}
+        for name in arrays.groups:
+            group_keys = _face_keys(
+                arrays.group_connectivity(name, QUADRANGLE), nb_nodes
+            )
+            positions = np.searchsorted(sorted_keys, group_keys)
+            positions = np.minimum(positions, len(sorted_keys) - 1)
+            found = sorted_keys[positions] == group_keys
+            groups[name] = np.unique(order[positions[found]] // 6)
+
+        return cls(
+            arrays.element_ids(HEXAHEDRON),
+            values,
+            int((metrics["jacobian"] < -_DEGENERATE).sum()),
+            None if regions is None else regions(centroids, float(nodes[:, 2].min())),
+            groups,
+            int((np.abs(metrics["jacobian"]) <= _DEGENERATE).sum()),
+        )
+
+    def _lines(self, summaries: Dict[str, MetricSummary], indent: str) -> list:
+        lines = []
+        for metric, summary in summaries.items():
+            if summary is None:
+                continue
+            worst = ", ".join(str(i) for i in summary.worst)
+            lines.append(
+                f"{indent}{metric:<18} min {summary.minimum:9.4f}  "
+                f"max {summary.maximum:9.4f}  mean {summary.mean:9.4f}  "
+                f"worst [{worst}]"
+            )
+        return lines
+
+    def report(self, worst: int = 5) -> str:
+        lines = [
+            f"Hexahedra: {self.nb_elements}",
+            f"Negative Jacobians: {self._negative}",
+            f"Degenerate hexahedra: {self._degenerate}",
+        ]
+        lines += self._lines(self.summaries(worst=worst), "  ")
+
+        for title, parts in (
+            ("Region", self.by_region(worst)),
+            ("Group", self.by_group(worst)),
+        ):
+            for name, summaries in parts.items():
+                if all(summary is None for summary in summaries.values()):
+                    continue
+                lines.append(f"{title} {name}:")
+                lines += self._lines(summaries, "  ")
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
@@ -0,0 +1,209 @@
+from typing import List, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..vector import vector3
+
+# Number of points sampling an arc, and a curve of unknown kind
+_ARC_SAMPLES = 33
+_CURVE_SAMPLES = 9
+
+
+def _segment_distances(point: np.ndarray, polyline: np.ndarray) -> float:
+    starts, ends = polyline[:-1], polyline[1:]
+    directions = ends - starts
+    lengths = np.maximum((directions**2).sum(axis=1), 1e-300)
+
+    t = np.clip(((point - starts) * directions).sum(axis=1) / lengths, 0, 1)
+    projections = starts + t[:, None] * directions
+
+    return float(np.linalg.norm(projections - point, axis=1).min())
+
+
+def _arc(center, normal, start, end, full: bool = False) -> Tuple[np.ndarray, float]:
+    # Arcs are oriented counterclockwise around their normal, from start to end
+    normal = normal / np.linalg.norm(normal)
+    v1, v2 = start - center, end - center
+    radius = np.linalg.norm(v1)
+
+    if full:
+        angle = 2 * np.pi
+    else:
+        angle = np.arctan2(np.dot(normal, np.cross(v1, v2)), np.dot(v1, v2))
+        if angle <= 0:
+            angle += 2 * np.pi
+
+    thetas = np.linspace(0, angle, _ARC_SAMPLES)[:, None]
+    points = (
+        center
+        + v1 * np.cos(thetas)
+        + np.cross(normal, v1) * np.sin(thetas)
+        + normal * np.dot(normal, v1) * (1 - np.cos(thetas))
+    )
+
+    return points, radius * angle
+
+
+class SubShapeIndex:
+    """
+    Spatial index of the edges and faces of a shape, answering nearest edge and
+    nearest face queries locally instead of asking GEOM for each one
+
+    The edges are described once by their kind (segment, arc, circle) and sampled,
+    their lengths being the ones of GEOM, the faces by their center of gravity on
+    the first face query
+
+    Args:
+        geompy  (geomBuilder):  Builder owning the shape
+        shape   (GEOM_Object):  The indexed shape
+
+    """
+
+    def __init__(self, geompy, shape):
+        self._geompy = geompy
+        self._shape = shape
+
+        self._edges = geompy.SubShapeAllSortedCentres(shape, geompy.ShapeType["EDGE"])
+
+        self._polylines = []
+        lengths = []
+        for edge in self._edges:
+            polyline, length = self._describe_edge(edge)
+            self._polylines.append(polyline)
+            lengths.append(length)
+        self._edge_lengths = np.array(lengths)
+
+        samples = [
+            (
+                np.linspace(polyline[0], polyline[-1], _CURVE_SAMPLES)
+                if len(polyline) == 2
+                else polyline
+            )
+            for polyline in self._polylines
+        ]
+        self._sample_owners = np.concatenate(
+            [np.full(len(points), i) for i, points in enumerate(samples)]
+        )
+        self._edge_tree = cKDTree(np.concatenate(samples))
+        # Every point of an edge is at most this far from a sample of the edge
+        self._margin = max(
+            np.linalg.norm(np.diff(points, axis=0), axis=1).max() / 2
+            for points in samples
+        )
+
+        self._faces = None
+        self._face_ids = None
+        self._face_centres = None
+        self._face_tree = None
+
+    def _index_faces(self) -> None:
+        if self._face_tree is not None:
+            return
+
+        face = self._geompy.ShapeType["FACE"]
+        self._faces = self._geompy.SubShapeAllSortedCentres(self._shape, face)
+        self._face_ids = self._geompy.SubShapeAllSortedCentresIDs(self._shape, face)
+
+        self._face_centres = np.array(
+            [
+                self._geompy.PointCoordinates(self._geompy.MakeCDG(face))
+                for face in self._faces
+            ]
+        )
+        self._face_tree = cKDTree(self._face_centres)
+
+    def _describe_edge(self, edge) -> Tuple[np.ndarray, float]:
+        length = self._geompy.BasicProperties(edge)[0]
+
+        description = self._geompy.KindOfShape(edge)
+        kind, values = description[0], np.array(description[1:], dtype=np.float64)
+
+        if kind == self._geompy.kind.SEGMENT:
+            return values[:6].reshape(2, 3), length
+
+        if kind == self._geompy.kind.ARC_CIRCLE:
+            center, normal = values[0:3], values[3:6]
+            start, end = values[7:10], values[10:13]
+            # The normal of an arc is the one of its curve, whatever the orientation
+            # of the edge : a reversed arc goes clockwise from its start to its end,
+            # the other way round of the circle, which its length tells
+            points, arc_length = _arc(center, normal, start, end)
+            if abs(arc_length - length) > abs(
+                2 * np.pi * values[6] - arc_length - length
+            ):
+                points, _ = _arc(center, normal, end, start)
+            return points, length
+
+        if kind == self._geompy.kind.CIRCLE:
+            center, normal, radius = values[0:3], values[3:6], values[6]
+            ortho = np.cross(normal, [1, 0, 0])
+            if np.linalg.norm(ortho) < 1e-12:
+                ortho = np.cross(normal, [0, 1, 0])
+            start = center + radius * ortho / np.linalg.norm(ortho)
+            return _arc(center, normal, start, start, full=True)[0], length
+
+        polyline = np.array(
+            [
+                self._geompy.PointCoordinates(self._geompy.MakeVertexOnCurve(edge, t))
+                for t in np.linspace(0, 1, _CURVE_SAMPLES)
+            ]
+        )
+        return polyline, length
+
+    @property
+    def edges(self) -> List:
+        return self._edges
+
+    @property
+    def edge_lengths(self) -> np.ndarray:
+        return self._edge_lengths
+
+    @property
+    def faces(self) -> List:
+        self._index_faces()
+        return self._faces
+
+    @property
+    def face_ids(self) -> List[int]:
+        self._index_faces()
+        return self._face_ids
+
+    @property
+    def face_centres(self) -> np.ndarray:
+        self._index_faces()
+        return self._face_centres
+
+    def nearest_edge(self, point: vector3) -> Tuple[int, float]:
+        """
+        Index of the edge closest to a point and its distance to the point
+        """
+        query = np.array([point.x, point.y, point.z])
+
+        # The closest sample bounds the distance to the closest edge, which has then
+        # a sample closer than this bound plus the margin
+        bound, _ = self._edge_tree.query(query)
+        samples = self._edge_tree.query_ball_point(query, bound + self._margin)
+        candidates = np.unique(self._sample_owners[samples])
+
+        distances = [_segment_distances(query, self._polylines[i]) for i in candidates]
+        best = int(np.argmin(distances))
+
+        return int(candidates[best]), distances[best]
+
+    def nearest_face(self, point: vector3) -> int:
+        """
+        Index of the face whose center of gravity is the closest to a point. Unlike
+        `GetFaceNearPoint`, the distance to the faces themselves isn't computed : a
+        point of a face can be closer to the center of a smaller neighbour. The
+        engine only asks for the centers of faces, the face found by GEOM there
+        """
+        self._index_faces()
+        _, i = self._face_tree.query([point.x, point.y, point.z])
+        return int(i)
+
+    def edge_near_point(self, point: vector3):
+        return self._edges[self.nearest_edge(point)[0]]
+
+    def face_near_point(self, point: vector3):
+        return self.faces[self.nearest_face(point)]
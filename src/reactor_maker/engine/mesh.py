@@ -1,10 +1,37 @@
+from .arrays import MeshArrays
+from .compression import compression
+from .hexquality import HexQuality, ReactorRegions
+from .quality import MeshQuality
+from .report import RunReport, traced
+from .unv import write_unv
+
+
 class ReactorMesh:
-    def __init__(self, mesh, radius, height, per_square, geompy):
+    def __init__(
+        self,
+        mesh,
+        radius,
+        height,
+        per_square,
+        geompy,
+        backend=None,
+        report=None,
+        arrays: MeshArrays = None,
+        regions: ReactorRegions = None,
+    ):
         self._mesh = mesh
         self._radius = radius
         self._height = height
         self._per_square = per_square
         self._geompy = geompy
+        self._backend = backend
+        self._report = report if report is not None else RunReport()
+
+        self._quality = None
+        self._hex_quality = None
+        self._regions = regions
+        # Meshes swept in NumPy have no SMESH counterpart, only their arrays
+        self._arrays = arrays
 
     @property
     def mesh(self):
@@ -22,9 +49,58 @@ class ReactorMesh:
     def per_square(self):
         return self._per_square
 
+    @property
+    def report(self) -> RunReport:
+        return self._report
+
+    @property
+    def quality(self) -> MeshQuality:
+        if self._quality is None:
+            # Same as `MeshQuality.from_mesh`, the arrays being shared with the
+            # exports and the quality of the hexahedra
+            arrays = self.to_arrays()
+            with self._report.span("quality"):
+                self._quality = MeshQuality.from_arrays(arrays)
+        return self._quality
+
+    @property
+    def hex_quality(self) -> HexQuality:
+        """
+        Scaled Jacobian, skewness, non-orthogonality, warpage and volume ratio of
+        every hexahedron, by region of the reactor and by boundary group
+        """
+        if self._hex_quality is None:
+            arrays = self.to_arrays()
+            with self._report.span("hex_quality"):
+                self._hex_quality = HexQuality.from_arrays(arrays, self._regions)
+        return self._hex_quality
+
+    def to_arrays(self) -> MeshArrays:
+        """
+        Nodes (N, 3) float64, connectivity of the hexahedra (E, 8) and of the faces,
+        and the element ids of the Inlet, Outlet and Wall groups, extracted in bulk
+
+        Returns:
+            MeshArrays: A snapshot of the mesh, picklable and savable as .npz
+
+        """
+        if self._arrays is None:
+            if self._mesh is None:
+                raise ValueError("Mesh has not yet been created")
+            with self._report.span("arrays"):
+                self._arrays = MeshArrays.from_mesh(self._mesh)
+        return self._arrays
+
+    @traced("export_mesh")
     def export_to(self, filename: str) -> bool:
-        if self._mesh is None:
-            raise ValueError("Mesh has not yet been created")
+        """
+        Write the mesh to UNV, compressed while it is written when `filename` ends
+        with .gz or .xz. Compressed files are written from the arrays of the mesh,
+        shared with its quality, straight into the compressor
+        """
+        if self._mesh is None or compression(filename) is not None:
+            write_unv(self.to_arrays(), filename)
+            return True
 
         self._mesh.ExportUNV(filename)
 
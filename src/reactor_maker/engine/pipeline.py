@@ -0,0 +1,223 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+class StageMetrics:
+    """
+    Items processed by a stage of the pipeline, the time spent on them and the
+    bytes they wrote
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._items = 0
+        self._busy = 0.0
+        self._bytes = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def items(self) -> int:
+        return self._items
+
+    @property
+    def busy(self) -> float:
+        return self._busy
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items per second of work of the stage
+        """
+        return self._items / self._busy if self._busy > 0 else 0.0
+
+    @property
+    def bandwidth(self) -> float:
+        """
+        MB written per second of work of the stage
+        """
+        return self._bytes / 1e6 / self._busy if self._busy > 0 else 0.0
+
+    def add(self, busy: float, nb_bytes: int = 0) -> None:
+        self._items += 1
+        self._busy += busy
+        self._bytes += nb_bytes
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self._name,
+            "items": self._items,
+            "busy": self._busy,
+            "bytes": self._bytes,
+            "throughput": self.throughput,
+            "bandwidth": self.bandwidth,
+        }
+
+
+class ExportPipeline:
+    """
+    Background I/O stage writing files while the caller computes the next reactor.
+    The writers may be the exports of GEOM and SMESH, which run in C++ without the
+    GIL : they only read objects the caller no longer uses, while it builds new ones
+
+    The queue is bounded : `submit` blocks while `queue_size` writes are pending,
+    so that at most `queue_size` meshes wait in memory for their export
+
+    Args:
+        queue_size  (int):  Number of pending writes before `submit` blocks
+
+    """
+
+    _STOP = object()
+
+    def __init__(self, queue_size: int = 2):
+        if queue_size < 1:
+            raise ValueError("The queue of the pipeline holds at least one write")
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+        self._waiting = 0.0
+        self._start = time.perf_counter()
+        self._wall = None
+
+        self._thread = threading.Thread(
+            target=self._run, name="reactor-maker-io", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def stages(self) -> List[StageMetrics]:
+        with self._lock:
+            return list(self._stages.values())
+
+    @property
+    def waiting(self) -> float:
+        """
+        Time the caller spent blocked on a full queue
+        """
+        return self._waiting
+
+    @property
+    def wall(self) -> float:
+        if self._wall is None:
+            return time.perf_counter() - self._start
+        return self._wall
+
+    def _record(self, name: str, busy: float, nb_bytes: int = 0) -> None:
+        with self._lock:
+            if name not in self._stages:
+                self._stages[name] = StageMetrics(name)
+            self._stages[name].add(busy, nb_bytes)
+
+    @contextmanager
+    def stage(self, name: str, filename: Optional[str] = None):
+        """
+        Measure a stage run by the caller, the size of `filename` being counted as
+        the bytes it wrote
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            busy = time.perf_counter() - start
+            nb_bytes = 0
+            if filename is not None and os.path.exists(filename):
+                nb_bytes = os.path.getsize(filename)
+            self._record(name, busy, nb_bytes)
+
+    def submit(self, name: str, filename: str, writer: Callable, *args) -> Future:
+        """
+        Queue `writer(*args, filename)` for the I/O thread
+
+        Args:
+            name        (str):      Stage of the write in the metrics
+            filename    (str):      File written
+            writer      (Callable): Function writing the file, without SALOME object
+
+        Returns:
+            Future: The duration of the write, or the exception it raised
+
+        """
+        if self._wall is not None:
+            raise ValueError("The pipeline is closed")
+
+        future = Future()
+        start = time.perf_counter()
+        self._queue.put((future, name, filename, writer, args))
+        self._waiting += time.perf_counter() - start
+
+        return future
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is self._STOP:
+                return
+
+            future, name, filename, writer, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            start = time.perf_counter()
+            try:
+                writer(*args, filename)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            busy = time.perf_counter() - start
+
+            self._record(name, busy, os.path.getsize(filename))
+            future.set_result(busy)
+
+    def close(self) -> None:
+        """
+        Wait for the pending writes and stop the I/O thread
+        """
+        if self._wall is not None:
+            return
+
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._wall = time.perf_counter() - self._start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def to_dict(self) -> Dict:
+        return {
+            "wall": self.wall,
+            "waiting": self._waiting,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def summary(self) -> str:
+        lines = [
+            f"{'stage':<16} {'items':>6} {'busy (s)':>9} {'items/s':>8} {'MB/s':>8}"
+        ]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.name:<16} {stage.items:>6} {stage.busy:>9.2f} "
+                f"{stage.throughput:>8.2f} {stage.bandwidth:>8.1f}"
+            )
+        lines.append(
+            f"Wall time {self.wall:.2f} s, blocked on the full queue {self._waiting:.2f} s"
+        )
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
@@ -0,0 +1,369 @@
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .arrays import MeshArrays, TRIANGLE, QUADRANGLE, HEXAHEDRON
+
+# Value returned by SMESH for degenerated elements
+_INFINITE = 1e100
+
+# Corners of a hexahedron and their three neighbours along its edges, the same for
+# both orientations of the faces
+_CORNERS = np.array(
+    [
+        [0, 1, 3, 4],
+        [1, 2, 0, 5],
+        [2, 3, 1, 6],
+        [3, 0, 2, 7],
+        [4, 7, 5, 0],
+        [5, 4, 6, 1],
+        [6, 5, 7, 2],
+        [7, 6, 4, 3],
+    ]
+)
+
+
+def _area(p1, p2, p3) -> np.ndarray:
+    return 0.5 * np.linalg.norm(np.cross(p2 - p1, p3 - p1), axis=-1)
+
+
+def triangle_aspect_ratio(points: np.ndarray) -> np.ndarray:
+    """
+    Aspect ratio of triangles as computed by SMESH (1 for an equilateral triangle)
+
+    Args:
+        points  (np.ndarray):   Coordinates of the nodes, shape (E, 3, 3)
+
+    Returns:
+        np.ndarray: The aspect ratio of each element
+
+    """
+    p1, p2, p3 = points[:, 0], points[:, 1], points[:, 2]
+
+    lengths = np.stack(
+        [
+            np.linalg.norm(p2 - p1, axis=-1),
+            np.linalg.norm(p3 - p2, axis=-1),
+            np.linalg.norm(p1 - p3, axis=-1),
+        ]
+    )
+    area = _area(p1, p2, p3)
+
+    alpha = np.sqrt(3) / 6
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = alpha * lengths.max(axis=0) * lengths.sum(axis=0) / (2 * area)
+
+    return np.where(area > 0, ratio, _INFINITE)
+
+
+def quadrangle_aspect_ratio(points: np.ndarray) -> np.ndarray:
+    """
+    Aspect ratio of quadrangles as computed by SMESH (1 for a square)
+
+    Args:
+        points  (np.ndarray):   Coordinates of the nodes, shape (E, 4, 3)
+
+    Returns:
+        np.ndarray: The aspect ratio of each element
+
+    """
+    p1, p2, p3, p4 = points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+
+    sides = np.stack(
+        [
+            np.linalg.norm(p2 - p1, axis=-1),
+            np.linalg.norm(p3 - p2, axis=-1),
+            np.linalg.norm(p4 - p3, axis=-1),
+            np.linalg.norm(p1 - p4, axis=-1),
+        ]
+    )
+    diagonals = np.stack(
+        [np.linalg.norm(p3 - p1, axis=-1), np.linalg.norm(p4 - p2, axis=-1)]
+    )
+    areas = np.stack(
+        [_area(p1, p2, p3), _area(p1, p2, p4), _area(p1, p3, p4), _area(p2, p3, p4)]
+    )
+
+    # Q = alpha * L * C1 / C2, L the longest side or diagonal, C1 the quadratic
+    # sum of the sides and C2 the smallest triangle made of three of the nodes
+    alpha = np.sqrt(1 / 32)
+    longest = np.maximum(sides.max(axis=0), diagonals.max(axis=0))
+    c1 = np.sqrt((sides**2).sum(axis=0))
+    c2 = areas.min(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = alpha * longest * c1 / c2
+
+    return np.where(c2 > 0, ratio, _INFINITE)
+
+
+def tetrahedron_aspect_ratio(points: np.ndarray) -> np.ndarray:
+    """
+    Aspect ratio of tetrahedra as computed by SMESH (1 for a regular tetrahedron)
+
+    Args:
+        points  (np.ndarray):   Coordinates of the nodes, shape (E, 4, 3)
+
+    Returns:
+        np.ndarray: The aspect ratio of each element
+
+    """
+    p1, p2, p3, p4 = points[:, 0], points[:, 1], points[:, 2], points[:, 3]
+
+    edges = np.stack([p2 - p1, p3 - p1, p4 - p1, p3 - p2, p4 - p2, p4 - p3])
+    areas = _area(p1, p2, p3) + _area(p1, p2, p4) + _area(p1, p3, p4)
+    areas += _area(p2, p3, p4)
+    volume = np.abs(np.einsum("ij,ij->i", p2 - p1, np.cross(p3 - p1, p4 - p1))) / 6
+
+    # Q = alpha * L * S / V, L the longest edge and S the area of the faces
+    alpha = np.sqrt(6) / 36
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = alpha * np.linalg.norm(edges, axis=-1).max(axis=0) * areas / volume
+
+    return np.where(volume > 0, ratio, _INFINITE)
+
+
+# Aspect ratio of the corner tetrahedra of a cube
+_CUBE_CORNER = float(
+    tetrahedron_aspect_ratio(np.vstack([np.zeros(3), np.eye(3)])[None])[0]
+)
+
+
+def hexahedron_aspect_ratio(points: np.ndarray) -> np.ndarray:
+    """
+    Aspect ratio of hexahedra (1 for a cube). Like FT_AspectRatio3D of SMESH, the
+    worst of the tetrahedra of the volume : the tetrahedra of its eight corners,
+    relative to the one of a cube. Stretched, sheared or flattened hexahedra have
+    a worse corner than a cube, whichever the orientation of their faces
+
+    Args:
+        points  (np.ndarray):   Coordinates of the nodes, shape (E, 8, 3)
+
+    Returns:
+        np.ndarray: The aspect ratio of each element
+
+    """
+    corners = points[:, _CORNERS].reshape(-1, 4, 3)
+    ratios = tetrahedron_aspect_ratio(corners).reshape(-1, 8).max(axis=1)
+    return np.where(ratios < _INFINITE, ratios / _CUBE_CORNER, _INFINITE)
+
+
+# Aspect ratio of the elements by their code, 2D then 3D
+ASPECT_RATIOS = {
+    TRIANGLE: triangle_aspect_ratio,
+    QUADRANGLE: quadrangle_aspect_ratio,
+    HEXAHEDRON: hexahedron_aspect_ratio,
+}
+
+
+def aspect_ratios(arrays: MeshArrays, codes=tuple(ASPECT_RATIOS)) -> np.ndarray:
+    """
+    Aspect ratio of every element of the mesh of the types `codes`, in this order,
+    the faces by default followed by the hexahedra like `GetAspectRatio` of SMESH
+    """
+    values = []
+
+    for code in codes:
+        function = ASPECT_RATIOS[code]
+        connectivity = arrays.connectivity(code)
+        if len(connectivity):
+            values.append(function(arrays.nodes[connectivity]))
+
+    if not values:
+        return np.empty(0, dtype=np.float64)
+
+    return np.concatenate(values)
+
+
+# Elements of the parts of the report, with the type and the aspect ratio functor
+# of SMESH counting and computing them
+_PARTS = {
+    "faces": ((TRIANGLE, QUADRANGLE), "FACE", "FT_AspectRatio"),
+    "volumes": ((HEXAHEDRON,), "VOLUME", "FT_AspectRatio3D"),
+}
+
+
+class MeshQuality:
+    """
+    Statistics of the aspect ratio of the elements of a mesh, the faces and the
+    volumes together like `GetAspectRatio` of SMESH, and each part on its own
+
+    Args:
+        minimum     (float):                        Lowest aspect ratio
+        maximum     (float):                        Highest aspect ratio
+        values      (Optional[np.ndarray]):         Aspect ratios used for the mean
+                                                    and the histogram
+        nb_elements (int):                          Number of elements of the mesh
+        bins        (int):                          Number of intervals of the
+                                                    histogram
+        parts       (Dict[str, MeshQuality]):       Quality of the "faces" and of the
+                                                    "volumes", when the mesh has some
+
+    """
+
+    def __init__(
+        self,
+        minimum: float,
+        maximum: float,
+        values: Optional[np.ndarray],
+        nb_elements: int,
+        bins: int = 10,
+        parts: Optional[Dict[str, "MeshQuality"]] = None,
+    ):
+        self._min = minimum
+        self._max = maximum
+        self._values = values
+        self._nb_elements = nb_elements
+        self._bins = bins
+        self._parts = parts if parts is not None else {}
+
+    @property
+    def nb_elements(self) -> int:
+        return self._nb_elements
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    @property
+    def faces(self) -> Optional["MeshQuality"]:
+        return self._parts.get("faces")
+
+    @property
+    def volumes(self) -> Optional["MeshQuality"]:
+        return self._parts.get("volumes")
+
+    @property
+    def sampled(self) -> bool:
+        return self._values is None or len(self._values) < self._nb_elements
+
+    @property
+    def mean(self) -> Optional[float]:
+        if self._values is None or len(self._values) == 0:
+            return None
+        return float(self._values.mean())
+
+    @property
+    def histogram(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self._values is None or len(self._values) == 0:
+            return None
+        low, high = self._min, self._max
+        if high - low < 1e-9 * max(abs(high), 1.0):
+            # Elements of a same quality, up to the rounding, in the middle bin
+            low, high = low - 0.5, high + 0.5
+        return np.histogram(self._values, bins=self._bins, range=(low, high))
+
+    @classmethod
+    def _from_parts(cls, parts: Dict[str, "MeshQuality"], bins: int) -> "MeshQuality":
+        if not parts:
+            raise ValueError("The mesh has no element")
+
+        values = None
+        if all(part._values is not None for part in parts.values()):
+            values = np.concatenate([part._values for part in parts.values()])
+
+        return cls(
+            min(part.min for part in parts.values()),
+            max(part.max for part in parts.values()),
+            values,
+            sum(part.nb_elements for part in parts.values()),
+            bins,
+            parts,
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: MeshArrays, bins: int = 10) -> "MeshQuality":
+        parts = {}
+        for name, (codes, _, _) in _PARTS.items():
+            values = aspect_ratios(arrays, codes)
+            values = values[values > 0]
+            if len(values):
+                parts[name] = cls(
+                    float(values.min()), float(values.max()), values, len(values), bins
+                )
+
+        return cls._from_parts(parts, bins)
+
+    @classmethod
+    def from_mesh(
+        cls, mesh, sample: Optional[int] = None, bins: int = 10, backend=None
+    ) -> "MeshQuality":
+        """
+        Compute the quality of a SMESH mesh
+
+        Args:
+            mesh    (Mesh):             The computed mesh
+            sample  (Optional[int]):    None for the full report. Otherwise the extremes
+                                        are computed by SMESH in a single call by part
+                                        and the mean/histogram are estimated on
+                                        `sample` faces and `sample` volumes picked at
+                                        a fixed stride (0 for the extremes only)
+            bins    (int):              Number of intervals of the histogram
+            backend (Backend):          Backend of the mesh, SALOME by default
+
+        Returns:
+            MeshQuality: The quality of the mesh
+
+        """
+        if sample is None:
+            return cls.from_arrays(MeshArrays.from_mesh(mesh), bins)
+
+        if backend is None:
+            from .backend import SalomeBackend
+
+            backend = SalomeBackend()
+        smesh = backend.smesh_module()
+
+        parts = {}
+        for name, (_, element_type, functor) in _PARTS.items():
+            count = mesh.NbFaces() if name == "faces" else mesh.NbVolumes()
+            if count == 0:
+                continue
+
+            minimum, maximum = mesh.GetMinMax(getattr(smesh, functor))
+
+            values = None
+            if sample > 0:
+                elements = mesh.GetElementsByType(getattr(smesh, element_type))
+                picked = elements[:: max(1, ceil(len(elements) / sample))]
+                values = np.array([mesh.GetAspectRatio(elem_id) for elem_id in picked])
+                values = values[values > 0]
+
+            parts[name] = cls(minimum, maximum, values, count, bins)
+
+        return cls._from_parts(parts, bins)
+
+    def report(self) -> str:
+        lines = [
+            f"Total elements: {self._nb_elements}",
+            f"Min AR: {self._min:.3f}",
+            f"Max AR: {self._max:.3f}",
+        ]
+
+        if self.mean is not None:
+            lines.append(
+                f"Mean AR: {self.mean:.3f}" + (" (sampled)" if self.sampled else "")
+            )
+
+        histogram = self.histogram
+        if histogram is not None:
+            lines.append("Histogram:")
+            counts, edges = histogram
+            for count, low, high in zip(counts, edges[:-1], edges[1:]):
+                lines.append(f"  [{low:.3f}, {high:.3f}] : {count}")
+
+        for name, part in self._parts.items():
+            lines.append(
+                f"{name.capitalize()}: {part.nb_elements} elements, "
+                f"AR [{part.min:.3f}, {part.max:.3f}]"
+            )
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
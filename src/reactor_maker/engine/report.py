@@ -0,0 +1,191 @@
+import functools
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def _rss() -> int:
+    # Resident set size of the process in bytes, the peak when /proc isn't available
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Span:
+    """
+    Timed stage of a run, holding the stages it is made of
+
+    Args:
+        name    (str):      Name of the stage
+        start   (float):    Start of the stage, seconds since the start of the report
+
+    """
+
+    def __init__(self, name: str, start: float):
+        self._name = name
+        self._start = start
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._rss_delta = 0
+        self._children = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def start(self) -> float:
+        return self._start
+
+    @property
+    def wall(self) -> float:
+        return self._wall
+
+    @property
+    def cpu(self) -> float:
+        return self._cpu
+
+    @property
+    def rss_delta(self) -> int:
+        return self._rss_delta
+
+    @property
+    def children(self) -> List["Span"]:
+        return self._children
+
+    def finish(self, wall: float, cpu: float, rss_delta: int) -> None:
+        self._wall = wall
+        self._cpu = cpu
+        self._rss_delta = rss_delta
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self._name,
+            "start": self._start,
+            "wall": self._wall,
+            "cpu": self._cpu,
+            "rss_delta": self._rss_delta,
+            "children": [child.to_dict() for child in self._children],
+        }
+
+
+class RunReport:
+    """
+    Nested spans measuring the wall time, the CPU time of the process and the change
+    of its resident memory for every stage of the engine. Each thread nests its own
+    spans, the ones of a background thread start at the top level
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._spans = []
+        self._stacks = {}
+
+    @property
+    def spans(self) -> List[Span]:
+        return self._spans
+
+    @property
+    def _stack(self) -> List[Span]:
+        return self._stacks.setdefault(threading.get_ident(), [])
+
+    @property
+    def current(self) -> Optional[Span]:
+        stack = self._stack
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Measure the enclosed block as a stage, nested in the enclosing span
+        """
+        span = Span(name, time.perf_counter() - self._origin)
+        stack = self._stack
+        (stack[-1].children if stack else self._spans).append(span)
+        stack.append(span)
+
+        rss, cpu, start = _rss(), time.process_time(), time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.finish(
+                time.perf_counter() - start, time.process_time() - cpu, _rss() - rss
+            )
+            stack.pop()
+
+    def clear(self) -> None:
+        self._origin = time.perf_counter()
+        self._spans = []
+        self._stacks = {}
+
+    def _walk(self, spans=None, depth: int = 0):
+        for span in self._spans if spans is None else spans:
+            yield depth, span
+            yield from self._walk(span.children, depth + 1)
+
+    def to_dict(self) -> Dict:
+        return {"spans": [span.to_dict() for span in self._spans]}
+
+    def to_chrome_trace(self) -> Dict:
+        """
+        Spans as complete events of the Chrome trace format (chrome://tracing,
+        Perfetto), times in microseconds
+        """
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.wall * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"cpu": span.cpu, "rss_delta": span.rss_delta},
+            }
+            for _, span in self._walk()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def save_chrome_trace(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def summary(self) -> str:
+        header = f"{'stage':<40} {'wall (s)':>9} {'cpu (s)':>9} {'RSS (MB)':>9}"
+        lines = [header, "-" * len(header)]
+
+        for depth, span in self._walk():
+            lines.append(
+                f"{'  ' * depth + span.name:<40} {span.wall:>9.3f} {span.cpu:>9.3f} "
+                f"{span.rss_delta / 1024**2:>+9.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+def traced(name: str):
+    """
+    Measure every call of a method as a span of the `report` of its instance
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.report.span(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
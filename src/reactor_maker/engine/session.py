@@ -0,0 +1,41 @@
+"""
+SALOME session of the process, started on the first use of a builder so that
+importing the package, reading the help or validating parameters stays instant
+"""
+
+_started = False
+
+
+def start() -> None:
+    """
+    Start the SALOME session of the process, once
+    """
+    global _started
+
+    if _started:
+        return
+
+    import salome
+
+    salome.salome_init_without_session()
+    _started = True
+
+
+def is_started() -> bool:
+    return _started
+
+
+def geom_builder():
+    start()
+
+    from salome.geom import geomBuilder
+
+    return geomBuilder.New()
+
+
+def smesh_builder():
+    start()
+
+    from salome.smesh import smeshBuilder
+
+    return smeshBuilder.New()
@@ -0,0 +1,815 @@
+import functools
+import pickle
+from collections import Counter
+from math import ceil
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .arrays import MeshArrays, QUADRANGLE, HEXAHEDRON, REVERSED_HEXAHEDRON
+from .quality import aspect_ratios
+from .unv import write_unv
+
+_SHAPE_TYPES = {
+    "COMPOUND": 0,
+    "COMPSOLID": 1,
+    "SOLID": 2,
+    "SHELL": 3,
+    "FACE": 4,
+    "WIRE": 5,
+    "EDGE": 6,
+    "VERTEX": 7,
+}
+
+# Enumerations of the GEOM and SMESH modules used by the engine
+_KIND = SimpleNamespace(SEGMENT=1, ARC_CIRCLE=2, CIRCLE=3)
+_GEOM = SimpleNamespace(ST_ON=0)
+_SMESH = SimpleNamespace(FACE=2, VOLUME=3, FT_AspectRatio=0, FT_AspectRatio3D=1)
+
+# Number of points sampling a curved edge
+_CURVE_SAMPLES = 33
+# Bound of the number of cells along each direction of a synthetic mesh
+_MAX_CELLS = 64
+
+
+def _recorded(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._backend.record(method.__name__)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class Shape:
+    """
+    Synthetic shape : a point, a vector, an edge sampled by points, or a collection
+    of edges and faces. Faces are only described by their center and their normal
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        point=None,
+        vector=None,
+        points=None,
+        description=None,
+        edges=(),
+        faces=(),
+        normal=None,
+    ):
+        self.kind = kind
+        self.point = None if point is None else np.asarray(point, dtype=np.float64)
+        self.vector = None if vector is None else np.asarray(vector, dtype=np.float64)
+        self.points = None if points is None else np.asarray(points, dtype=np.float64)
+        self.description = description
+        self.edges = list(edges)
+        self.faces = list(faces)
+        self.normal = None if normal is None else np.asarray(normal, dtype=np.float64)
+        # Parent shape and ids of the sub shapes of a group
+        self.parent = None
+        self.ids = []
+
+    @property
+    def centre(self) -> np.ndarray:
+        if self.point is not None:
+            return self.point
+        if self.points is not None:
+            return self.points.mean(axis=0)
+        return np.mean([edge.centre for edge in self.edges], axis=0)
+
+    def sub_shapes(self, shape_type: int) -> List["Shape"]:
+        if shape_type == _SHAPE_TYPES["EDGE"]:
+            return self.edges
+        if shape_type == _SHAPE_TYPES["FACE"]:
+            return self.faces
+        raise ValueError(f"Sub shapes of type {shape_type} aren't synthesized")
+
+    def sub_shape_id(self, shape: "Shape") -> int:
+        for i, face in enumerate(self.faces):
+            if face is shape:
+                return i + 1
+        for i, edge in enumerate(self.edges):
+            if edge is shape:
+                return len(self.faces) + i + 1
+        raise ValueError("Not a sub shape")
+
+    def sub_shape(self, shape_id: int) -> "Shape":
+        if shape_id <= len(self.faces):
+            return self.faces[shape_id - 1]
+        return self.edges[shape_id - len(self.faces) - 1]
+
+
+def _segment(start, end) -> Shape:
+    start, end = np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64)
+    return Shape(
+        "EDGE",
+        points=[start, end],
+        description=[_KIND.SEGMENT, *start, *end],
+    )
+
+
+def _circle_points(center, normal, start, angle: float) -> np.ndarray:
+    v = start - center
+    thetas = np.linspace(0, angle, _CURVE_SAMPLES)[:, None]
+    return (
+        center
+        + v * np.cos(thetas)
+        + np.cross(normal, v) * np.sin(thetas)
+        + normal * np.dot(normal, v) * (1 - np.cos(thetas))
+    )
+
+
+def _moved(shape: Shape, point, vector, cache: Optional[Dict] = None) -> Shape:
+    # Copy of a shape moved by a rigid transformation, given by its action on the
+    # points and on the vectors. Sub shapes shared by several shapes stay shared
+    cache = {} if cache is None else cache
+    if id(shape) in cache:
+        return cache[id(shape)]
+
+    description = shape.description
+    if description is not None:
+        kind, values = description[0], list(description[1:])
+        if kind == _KIND.SEGMENT:
+            values = [*point(values[0:3]), *point(values[3:6])]
+        elif kind == _KIND.ARC_CIRCLE:
+            values = [
+                *point(values[0:3]),
+                *vector(values[3:6]),
+                values[6],
+                *point(values[7:10]),
+                *point(values[10:13]),
+            ]
+        else:
+            values = [*point(values[0:3]), *vector(values[3:6]), values[6]]
+        description = [kind, *values]
+
+    moved = Shape(
+        shape.kind,
+        point=None if shape.point is None else point(shape.point),
+        vector=None if shape.vector is None else vector(shape.vector),
+        points=(
+            None if shape.points is None else np.array([point(p) for p in shape.points])
+        ),
+        description=description,
+        edges=[_moved(edge, point, vector, cache) for edge in shape.edges],
+        faces=[_moved(face, point, vector, cache) for face in shape.faces],
+        normal=None if shape.normal is None else vector(shape.normal),
+    )
+    cache[id(shape)] = moved
+    return moved
+
+
+def _unique(shapes) -> List[Shape]:
+    seen = set()
+    unique = []
+    for shape in shapes:
+        if id(shape) not in seen:
+            seen.add(id(shape))
+            unique.append(shape)
+    return unique
+
+
+def _distance(polyline: np.ndarray, point: np.ndarray) -> float:
+    # Distance of a point to the segments of a sampled edge
+    starts, directions = polyline[:-1], np.diff(polyline, axis=0)
+    t = (point - starts) * directions
+    t = np.clip(t.sum(axis=1) / np.maximum((directions**2).sum(axis=1), 1e-300), 0, 1)
+    return float(np.linalg.norm(starts + t[:, None] * directions - point, axis=1).min())
+
+
+def _sorted_by_centre(shapes) -> List[Shape]:
+    return sorted(shapes, key=lambda shape: tuple(np.round(shape.centre, 9)))
+
+
+class StandInGeom:
+    """
+    Pure Python stand-in of `geomBuilder` returning synthetic shapes. Shapes keep
+    their edges and faces but aren't split against each other by the partitions
+    """
+
+    ShapeType = _SHAPE_TYPES
+    kind = _KIND
+
+    def __init__(self, backend: "StandInBackend"):
+        self._backend = backend
+
+    @_recorded
+    def MakeVertex(self, x, y, z) -> Shape:
+        return Shape("VERTEX", point=[x, y, z])
+
+    @_recorded
+    def MakeVectorDXDYDZ(self, dx, dy, dz) -> Shape:
+        return Shape("VECTOR", vector=[dx, dy, dz])
+
+    @_recorded
+    def MakeLine(self, point, direction) -> Shape:
+        return Shape("LINE", point=point.point, vector=direction.vector)
+
+    @_recorded
+    def MakeLineTwoPnt(self, point1, point2) -> Shape:
+        return _segment(point1.point, point2.point)
+
+    @_recorded
+    def MakeArc(self, point1, point2, point3) -> Shape:
+        p1, p2, p3 = point1.point, point2.point, point3.point
+
+        # Circumscribed circle, the normal orients the arc from p1 to p3 through p2
+        normal = np.cross(p2 - p1, p3 - p2)
+        normal = normal / np.linalg.norm(normal)
+        a, b = p1 - p3, p2 - p3
+        center = p3 + np.cross(np.dot(a, a) * b - np.dot(b, b) * a, np.cross(a, b)) / (
+            2 * np.dot(np.cross(a, b), np.cross(a, b))
+        )
+        radius = float(np.linalg.norm(p1 - center))
+
+        v1, v3 = p1 - center, p3 - center
+        angle = np.arctan2(np.dot(normal, np.cross(v1, v3)), np.dot(v1, v3))
+        if angle <= 0:
+            angle += 2 * np.pi
+
+        return Shape(
+            "EDGE",
+            points=_circle_points(center, normal, p1, angle),
+            description=[_KIND.ARC_CIRCLE, *center, *normal, radius, *p1, *p3],
+        )
+
+    @_recorded
+    def MakeDiskPntVecR(self, center, normal, radius) -> Shape:
+        c = center.point
+        n = normal.vector / np.linalg.norm(normal.vector)
+        ortho = np.cross(n, [1.0, 0.0, 0.0])
+        if np.linalg.norm(ortho) < 1e-12:
+            ortho = np.cross(n, [0.0, 1.0, 0.0])
+        start = c + radius * ortho / np.linalg.norm(ortho)
+
+        circle = Shape(
+            "EDGE",
+            points=_circle_points(c, n, start, 2 * np.pi),
+            description=[_KIND.CIRCLE, *c, *n, radius],
+        )
+        return Shape("FACE", point=c, edges=[circle], normal=n)
+
+    @_recorded
+    def MakeWire(self, edges) -> Shape:
+        return Shape("WIRE", edges=edges)
+
+    @_recorded
+    def MakeFace(self, wire, planar=True) -> Shape:
+        points = np.concatenate([edge.points for edge in wire.edges])
+        normal = np.cross(points[1] - points[0], points[-1] - points[0])
+        if np.linalg.norm(normal) > 0:
+            normal = normal / np.linalg.norm(normal)
+        return Shape(
+            "FACE",
+            point=points.mean(axis=0),
+            edges=wire.edges,
+            normal=np.abs(normal),
+        )
+
+    @_recorded
+    def MakeRotation(self, shape, axis, angle) -> Shape:
+        origin = axis.point
+        n = axis.vector / np.linalg.norm(axis.vector)
+
+        def vector(v):
+            v = np.asarray(v, dtype=np.float64)
+            return (
+                v * np.cos(angle)
+                + np.cross(n, v) * np.sin(angle)
+                + n * np.dot(n, v) * (1 - np.cos(angle))
+            )
+
+        return _moved(shape, lambda p: origin + vector(np.asarray(p) - origin), vector)
+
+    def _compound(self, shapes) -> Shape:
+        faces, edges = [], []
+        for shape in shapes:
+            if shape.kind == "FACE":
+                faces.append(shape)
+            elif shape.kind == "EDGE":
+                edges.append(shape)
+            faces.extend(shape.faces)
+            edges.extend(shape.edges)
+            for face in shape.faces:
+                edges.extend(face.edges)
+
+        return Shape("COMPOUND", edges=_unique(edges), faces=_unique(faces))
+
+    @_recorded
+    def MakePartition(self, shapes, tools=()) -> Shape:
+        return self._compound([*shapes, *tools])
+
+    @_recorded
+    def MakeGlueEdges(self, shape, tolerance) -> Shape:
+        return self._compound([shape])
+
+    @_recorded
+    def MakeGlueFaces(self, shape, tolerance) -> Shape:
+        return self._compound([shape])
+
+    @_recorded
+    def MakePrismVecH(self, shape, direction, height) -> Shape:
+        shift = height * direction.vector / np.linalg.norm(direction.vector)
+
+        base = self._compound([shape])
+        cache = {}
+        top = _moved(base, lambda p: np.asarray(p) + shift, lambda v: v, cache)
+
+        vertices = {}
+        for edge in base.edges:
+            if edge.description[0] != _KIND.CIRCLE:
+                for point in (edge.points[0], edge.points[-1]):
+                    vertices.setdefault(tuple(np.round(point, 9)), point)
+        sides = [_segment(point, point + shift) for point in vertices.values()]
+
+        side_faces = [
+            Shape(
+                "FACE",
+                point=edge.centre + shift / 2,
+                edges=[edge, cache[id(edge)]],
+            )
+            for edge in base.edges
+        ]
+
+        return Shape(
+            "SOLID",
+            edges=[*base.edges, *top.edges, *sides],
+            faces=[*base.faces, *top.faces, *side_faces],
+        )
+
+    @_recorded
+    def CheckShape(self, shape) -> bool:
+        return True
+
+    @_recorded
+    def GetEdgeNearPoint(self, shape, point) -> Shape:
+        return min(shape.edges, key=lambda edge: _distance(edge.points, point.point))
+
+    @_recorded
+    def GetFaceNearPoint(self, shape, point) -> Shape:
+        return min(
+            shape.faces, key=lambda face: np.linalg.norm(face.centre - point.point)
+        )
+
+    @_recorded
+    def GetShapesOnPlaneWithLocationIDs(
+        self, shape, shape_type, direction, point, state
+    ) -> List[int]:
+        n = direction.vector / np.linalg.norm(direction.vector)
+        return [
+            shape.sub_shape_id(face)
+            for face in shape.sub_shapes(shape_type)
+            if face.normal is not None
+            and abs(abs(np.dot(face.normal, n)) - 1) < 1e-9
+            and abs(np.dot(face.centre - point.point, n)) < 1e-7
+        ]
+
+    @_recorded
+    def SubShapeAllSortedCentres(self, shape, shape_type) -> List[Shape]:
+        return _sorted_by_centre(shape.sub_shapes(shape_type))
+
+    @_recorded
+    def SubShapeAllSortedCentresIDs(self, shape, shape_type) -> List[int]:
+        return [
+            shape.sub_shape_id(sub)
+            for sub in _sorted_by_centre(shape.sub_shapes(shape_type))
+        ]
+
+    @_recorded
+    def KindOfShape(self, shape) -> List:
+        return list(shape.description)
+
+    @_recorded
+    def MakeCDG(self, shape) -> Shape:
+        return Shape("VERTEX", point=shape.centre)
+
+    @_recorded
+    def MakeVertexOnCurve(self, edge, parameter) -> Shape:
+        lengths = np.linalg.norm(np.diff(edge.points, axis=0), axis=1)
+        positions = np.concatenate([[0.0], np.cumsum(lengths)]) / lengths.sum()
+        return Shape(
+            "VERTEX",
+            point=[
+                np.interp(parameter, positions, edge.points[:, i]) for i in range(3)
+            ],
+        )
+
+    @_recorded
+    def PointCoordinates(self, point):
+        return tuple(float(value) for value in point.point)
+
+    @_recorded
+    def BasicProperties(self, shape):
+        if shape.kind != "EDGE":
+            return (0.0, 0.0, 0.0)
+        length = np.linalg.norm(np.diff(shape.points, axis=0), axis=1).sum()
+        return (float(length), 0.0, 0.0)
+
+    @_recorded
+    def CreateGroup(self, shape, shape_type) -> Shape:
+        group = Shape("GROUP")
+        group.parent = shape
+        return group
+
+    @_recorded
+    def UnionIDs(self, group, ids) -> None:
+        group.ids.extend(ids)
+
+    @_recorded
+    def UnionList(self, group, shapes) -> None:
+        group.ids.extend(group.parent.sub_shape_id(shape) for shape in shapes)
+
+    @_recorded
+    def GetObjectIDs(self, group) -> List[int]:
+        return list(group.ids)
+
+    @_recorded
+    def ExportSTL(self, shape, filename) -> None:
+        # A triangle fan from the center of each face to the samples of its edges
+        with open(filename, "w") as f:
+            f.write("solid standin\n")
+            for face in shape.faces:
+                for edge in face.edges:
+                    for a, b in zip(edge.points[:-1], edge.points[1:]):
+                        f.write("facet normal 0 0 0\nouter loop\n")
+                        for p in (face.centre, a, b):
+                            f.write(f"vertex {p[0]:e} {p[1]:e} {p[2]:e}\n")
+                        f.write("endloop\nendfacet\n")
+            f.write("endsolid standin\n")
+
+    @_recorded
+    def ExportBREP(self, shape, filename) -> None:
+        with open(filename, "wb") as f:
+            pickle.dump(shape, f)
+
+    @_recorded
+    def ImportBREP(self, filename) -> Shape:
+        with open(filename, "rb") as f:
+            return pickle.load(f)
+
+
+class _SegmentAlgo:
+    def __init__(self, mesh: "StandInMesh", geom):
+        self._mesh = mesh
+        self._geom = geom
+        self._backend = mesh._backend
+
+    @_recorded
+    def NumberOfSegments(self, nb_segments) -> None:
+        self._mesh._segments.append((self._geom, nb_segments))
+
+    @_recorded
+    def GeometricProgression(self, start, ratio) -> None:
+        pass
+
+    @_recorded
+    def Propagation(self) -> None:
+        pass
+
+
+class _Group:
+    def __init__(self, mesh: "StandInMesh", name: str):
+        self._mesh = mesh
+        self._name = name
+        self._backend = mesh._backend
+
+    @_recorded
+    def GetName(self) -> str:
+        return self._name
+
+    @_recorded
+    def GetIDs(self) -> List[int]:
+        ids = self._mesh._groups.get(self._name)
+        return [] if ids is None else [int(i) for i in ids]
+
+
+def _disk_grid(nb_cells: int, quarter: bool = False) -> np.ndarray:
+    # Square grid mapped onto the unit disk, so that the quality of its cells varies
+    # like around the curved blocks of a real base. The quarter x >= 0, y >= 0 of
+    # the mapping gives the same nodes as the quadrant of the disk
+    u = np.linspace(0.0 if quarter else -1.0, 1.0, nb_cells + 1)
+    u, v = np.meshgrid(u, u, indexing="ij")
+    return np.stack([u * np.sqrt(1 - v**2 / 2), v * np.sqrt(1 - u**2 / 2)], axis=2)
+
+
+def _quarter_disk(shape):
+    # Centre and radius of a face bounded by two radii and a quarter of circle, like
+    # the quadrant of a base, None for other shapes
+    for face in shape.faces:
+        arcs = [edge for edge in face.edges if edge.description[0] == _KIND.ARC_CIRCLE]
+        if len(face.edges) != 3 or len(arcs) != 1:
+            continue
+
+        centre, radius = np.array(arcs[0].description[1:4]), arcs[0].description[7]
+        points = np.concatenate([edge.points for edge in face.edges])
+        if np.allclose(points.min(axis=0)[:2], centre[:2], atol=1e-9 * radius):
+            return centre, radius
+
+    return None
+
+
+def _cells(shape) -> np.ndarray:
+    # Node indices of the quadrangles of a structured grid of nodes of given shape
+    index = np.arange(np.prod(shape)).reshape(shape)
+    return np.stack(
+        [index[:-1, :-1], index[1:, :-1], index[1:, 1:], index[:-1, 1:]], axis=-1
+    ).reshape(-1, 4)
+
+
+class StandInMesh:
+    """
+    Stand-in of `smeshBuilder.Mesh`. `Compute` generates a structured mesh of the
+    bounding cylinder of the shape, refined like the hypotheses of its edges
+    """
+
+    def __init__(self, backend: "StandInBackend", shape=None, arrays=None, groups=None):
+        self._backend = backend
+        self._shape = shape
+        self._segments = []
+        self._volumes = False
+        self._arrays = arrays
+        self._groups = {} if groups is None else groups
+        self._aspect_ratios = None
+
+    @_recorded
+    def Segment(self, geom=None) -> _SegmentAlgo:
+        return _SegmentAlgo(self, geom)
+
+    @_recorded
+    def Quadrangle(self, geom=None) -> None:
+        pass
+
+    @_recorded
+    def Hexahedron(self, geom=None) -> None:
+        self._volumes = True
+
+    @_recorded
+    def GroupOnGeom(self, group, name, element_type) -> _Group:
+        self._groups[name] = None
+        return _Group(self, name)
+
+    @_recorded
+    def GetGroups(self) -> List[_Group]:
+        return [_Group(self, name) for name in self._groups]
+
+    def _mesh_size(self, points: np.ndarray) -> float:
+        sizes = []
+        for geom, nb_segments in self._segments:
+            if geom is not None and geom.points is not None:
+                length = np.linalg.norm(np.diff(geom.points, axis=0), axis=1).sum()
+                sizes.append(length / nb_segments)
+
+        if sizes:
+            return min(sizes)
+        return float(np.ptp(points[:, :2], axis=0).max()) / 10
+
+    @_recorded
+    def Compute(self) -> bool:
+        points = np.concatenate([edge.points for edge in self._shape.edges])
+        size = self._mesh_size(points)
+
+        low, high = points.min(axis=0), points.max(axis=0)
+        centre = (low + high) / 2
+        radius = (high[:2] - low[:2]).max() / 2
+
+        quarter = None if self._volumes else _quarter_disk(self._shape)
+        if quarter is not None:
+            centre, radius = quarter
+            nb_cells = int(min(max(ceil(radius / size), 1), _MAX_CELLS // 2))
+            plane = centre[:2] + radius * _disk_grid(nb_cells, quarter=True)
+        else:
+            nb_cells = int(min(max(ceil(2 * radius / size), 2), _MAX_CELLS))
+            plane = centre[:2] + radius * _disk_grid(nb_cells)
+        plane = plane.reshape(-1, 2)
+        quads = _cells((nb_cells + 1, nb_cells + 1))
+
+        if not self._volumes or high[2] - low[2] < 1e-9:
+            nodes = np.column_stack([plane, np.full(len(plane), low[2])])
+            self._set_arrays(nodes, {QUADRANGLE: quads})
+            return True
+
+        nb_layers = int(min(max(ceil((high[2] - low[2]) / size), 1), _MAX_CELLS))
+        heights = np.linspace(low[2], high[2], nb_layers + 1)
+        nodes = np.concatenate(
+            [np.column_stack([plane, np.full(len(plane), z)]) for z in heights]
+        )
+
+        # The cells of the grid turn counterclockwise, the hexahedra are turned to
+        # the SMDS order of the exports of SMESH
+        layer = len(plane)
+        hexas = np.concatenate(
+            [
+                np.concatenate([quads, quads + layer], axis=1) + k * layer
+                for k in range(nb_layers)
+            ]
+        )[:, REVERSED_HEXAHEDRON]
+
+        # Quadrangles of the boundary : bottom, top and the 4 sides of the grid
+        ring = np.concatenate(
+            [
+                np.arange(nb_cells + 1) * (nb_cells + 1),
+                nb_cells * (nb_cells + 1) + np.arange(1, nb_cells + 1),
+                np.arange(nb_cells - 1, -1, -1) * (nb_cells + 1) + nb_cells,
+                np.arange(nb_cells - 1, 0, -1),
+            ]
+        )
+        ring = np.append(ring, ring[0])
+        sides = np.concatenate(
+            [
+                np.column_stack(
+                    [
+                        ring[:-1] + k * layer,
+                        ring[1:] + k * layer,
+                        ring[1:] + (k + 1) * layer,
+                        ring[:-1] + (k + 1) * layer,
+                    ]
+                )
+                for k in range(nb_layers)
+            ]
+        )
+        bottom, top = quads, quads + nb_layers * layer
+
+        self._set_arrays(
+            nodes,
+            {QUADRANGLE: np.concatenate([bottom, top, sides]), HEXAHEDRON: hexas},
+        )
+
+        nb_faces = len(bottom) + len(top) + len(sides)
+        face_ids = np.arange(1, nb_faces + 1)
+        named = {
+            "Inlet": face_ids[: len(bottom)],
+            "Outlet": face_ids[len(bottom) : len(bottom) + len(top)],
+            "Wall": face_ids[len(bottom) + len(top) :],
+        }
+        for name in self._groups:
+            self._groups[name] = named.get(name, np.empty(0, dtype=np.int64))
+
+        return True
+
+    def _set_arrays(self, nodes: np.ndarray, connectivities: Dict) -> None:
+        elements = {}
+        first = 1
+        for code, conn in connectivities.items():
+            elements[code] = (np.arange(first, first + len(conn)), conn)
+            first += len(conn)
+
+        self._arrays = MeshArrays(np.arange(1, len(nodes) + 1), nodes, elements)
+        self._aspect_ratios = None
+
+    def _ratios(self, code: int) -> Dict[int, float]:
+        if self._aspect_ratios is None:
+            # Only quadrangles and hexahedra are generated
+            self._aspect_ratios = {
+                code: dict(
+                    zip(
+                        self._arrays.element_ids(code).tolist(),
+                        aspect_ratios(self._arrays, (code,)).tolist(),
+                    )
+                )
+                for code in (QUADRANGLE, HEXAHEDRON)
+            }
+        return self._aspect_ratios[code]
+
+    @_recorded
+    def NbNodes(self) -> int:
+        return len(self._arrays.nodes)
+
+    @_recorded
+    def NbElements(self) -> int:
+        return sum(len(self._arrays.element_ids(code)) for code in self._arrays.codes)
+
+    @_recorded
+    def NbFaces(self) -> int:
+        return len(self._arrays.element_ids(QUADRANGLE))
+
+    @_recorded
+    def NbVolumes(self) -> int:
+        return len(self._arrays.element_ids(HEXAHEDRON))
+
+    @_recorded
+    def GetMinMax(self, functor):
+        code = HEXAHEDRON if functor == _SMESH.FT_AspectRatio3D else QUADRANGLE
+        values = list(self._ratios(code).values())
+        return (min(values), max(values))
+
+    @_recorded
+    def GetElementsByType(self, element_type) -> List[int]:
+        code = QUADRANGLE if element_type == _SMESH.FACE else HEXAHEDRON
+        return self._arrays.element_ids(code).tolist()
+
+    @_recorded
+    def GetAspectRatio(self, element_id) -> float:
+        faces = self._ratios(QUADRANGLE)
+        if element_id in faces:
+            return faces[element_id]
+        return self._ratios(HEXAHEDRON)[element_id]
+
+    @_recorded
+    def ExportDAT(self, filename, renumber=True) -> None:
+        arrays = self._arrays
+        nb_elements = sum(len(arrays.element_ids(code)) for code in arrays.codes)
+
+        with open(filename, "w") as f:
+            f.write(f"{len(arrays.nodes)} {nb_elements}\n")
+            np.savetxt(
+                f,
+                np.column_stack([arrays.node_ids, arrays.nodes]),
+                fmt=["%d", "%.17g", "%.17g", "%.17g"],
+            )
+            for code in arrays.codes:
+                rows = np.column_stack(
+                    [
+                        arrays.element_ids(code),
+                        np.full(len(arrays.element_ids(code)), code),
+                        arrays.node_ids[arrays.connectivity(code)],
+                    ]
+                )
+                np.savetxt(f, rows, fmt="%d")
+
+    @_recorded
+    def ExportUNV(self, filename) -> None:
+        # Groups of elements written like SMESH does
+        arrays = self._arrays
+        groups = {name: ids for name, ids in self._groups.items() if ids is not None}
+        write_unv(
+            MeshArrays(
+                arrays.node_ids,
+                arrays.nodes,
+                {
+                    code: (arrays.element_ids(code), arrays.connectivity(code))
+                    for code in arrays.codes
+                },
+                groups,
+            ),
+            filename,
+        )
+
+    @_recorded
+    def ExportMED(self, filename) -> None:
+        with open(filename, "wb") as f:
+            pickle.dump((self._arrays, self._groups), f)
+
+
+class StandInSmesh:
+    def __init__(self, backend: "StandInBackend"):
+        self._backend = backend
+
+    @_recorded
+    def Mesh(self, shape) -> StandInMesh:
+        return StandInMesh(self._backend, shape)
+
+    @_recorded
+    def CreateMeshesFromMED(self, filename):
+        with open(filename, "rb") as f:
+            arrays, groups = pickle.load(f)
+        return [StandInMesh(self._backend, arrays=arrays, groups=groups)], 0
+
+
+class StandInBackend:
+    """
+    Backend without SALOME, counting the calls made to its builders. Geometries and
+    meshes are synthetic : the orchestration of the engine, the optimizer and the
+    number of calls can be measured, not the real quality of the meshes
+    """
+
+    name = "standin"
+    pipe_exports = True
+
+    def __init__(self):
+        self._calls = Counter()
+        self._geom = None
+        self._smesh = None
+
+    def __getstate__(self):
+        return {"_calls": Counter(), "_geom": None, "_smesh": None}
+
+    @property
+    def calls(self) -> Counter:
+        return self._calls
+
+    def record(self, name: str) -> None:
+        self._calls[name] += 1
+
+    def reset(self) -> None:
+        self._calls.clear()
+
+    def start(self) -> None:
+        pass
+
+    def geom_builder(self) -> StandInGeom:
+        if self._geom is None:
+            self._geom = StandInGeom(self)
+        return self._geom
+
+    def smesh_builder(self) -> StandInSmesh:
+        if self._smesh is None:
+            self._smesh = StandInSmesh(self)
+        return self._smesh
+
+    def geom_module(self):
+        return _GEOM
+
+    def smesh_module(self):
+        return _SMESH
@@ -0,0 +1,323 @@
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import norm, qmc
+
+# Finite difference step used by L-BFGS-B to estimate the gradient, above the
+# resolution of the evaluation cache keys
+GRADIENT_STEP = 1e-5
+
+# Objective of the strategies : values of a batch of points, raising
+# `BudgetExhausted` once the budget of the optimization is spent
+Objective = Callable[[List[List[float]]], List[float]]
+Bounds = Sequence[Tuple[float, float]]
+
+
+class LBFGSBStrategy:
+    """
+    L-BFGS-B with a gradient estimated by forward finite differences, the point and
+    its stencil being evaluated as one batch
+    """
+
+    name = "lbfgsb"
+
+    def search(
+        self, evaluate: Objective, bounds: Bounds, x0: List[float], batch: int = 1
+    ) -> Tuple[bool, str]:
+        def residus(x):
+            points = [list(x)]
+            steps = []
+            for i, (_, upper) in enumerate(bounds):
+                step = (
+                    GRADIENT_STEP if x[i] + GRADIENT_STEP <= upper else -GRADIENT_STEP
+                )
+                point = list(x)
+                point[i] += step
+                points.append(point)
+                steps.append(step)
+
+            values = evaluate(points)
+
+            gradient = [
+                (value - values[0]) / step for value, step in zip(values[1:], steps)
+            ]
+
+            return values[0], gradient
+
+        result = minimize(
+            fun=residus,
+            x0=x0,
+            bounds=bounds,
+            method="L-BFGS-B",
+            jac=True,
+        )
+
+        return bool(result.success), str(result.message)
+
+
+class GridStrategy:
+    """
+    Coarse grid over the bounds, then finer grids centered on the best point, the
+    box being shrunk at every level. The objective is piecewise constant, a grid
+    jumps between its plateaus where a gradient sees none
+
+    Args:
+        coarse  (int):      Points per dimension of the first grid
+        fine    (int):      Points per dimension of the refining grids
+        levels  (int):      Number of refinements
+        shrink  (float):    Ratio between the sizes of two successive boxes
+
+    """
+
+    name = "grid"
+
+    def __init__(
+        self, coarse: int = 6, fine: int = 3, levels: int = 4, shrink: float = 0.4
+    ):
+        self._coarse = coarse
+        self._fine = fine
+        self._levels = levels
+        self._shrink = shrink
+
+    def search(
+        self, evaluate: Objective, bounds: Bounds, x0: List[float], batch: int = 1
+    ) -> Tuple[bool, str]:
+        lower = np.array([low for low, _ in bounds])
+        upper = np.array([high for _, high in bounds])
+
+        def grid(low, high, nb):
+            axes = [np.linspace(l, h, nb) for l, h in zip(low, high)]
+            points = np.stack(np.meshgrid(*axes), axis=-1).reshape(-1, len(axes))
+            return [list(map(float, point)) for point in points]
+
+        points = grid(lower, upper, self._coarse)
+        values = evaluate(points)
+        best = points[int(np.argmin(values))]
+
+        half = (upper - lower) / (self._coarse - 1)
+        for _ in range(self._levels):
+            center = np.array(best)
+            low = np.maximum(center - half, lower)
+            high = np.minimum(center + half, upper)
+
+            points = grid(low, high, self._fine) + [best]
+            values = evaluate(points)
+            best = points[int(np.argmin(values))]
+
+            half = half * self._shrink
+
+        return True, "Grid refined"
+
+
+class NelderMeadStrategy:
+    """
+    Nelder-Mead simplex within the bounds, started from a simplex spanning a fifth of
+    the bounds so that it doesn't sit on a single plateau
+
+    Args:
+        size    (float):    Size of the initial simplex, fraction of the bounds
+        xatol   (float):    Size of the simplex at convergence
+        fatol   (float):    Spread of the objective over the simplex at convergence
+
+    """
+
+    name = "nelder-mead"
+
+    def __init__(self, size: float = 0.2, xatol: float = 1e-3, fatol: float = 1e-4):
+        self._size = size
+        self._xatol = xatol
+        self._fatol = fatol
+
+    def search(
+        self, evaluate: Objective, bounds: Bounds, x0: List[float], batch: int = 1
+    ) -> Tuple[bool, str]:
+        x0 = np.array(x0, dtype=float)
+        simplex = [x0]
+        for i, (low, high) in enumerate(bounds):
+            vertex = x0.copy()
+            step = self._size * (high - low)
+            vertex[i] = (
+                vertex[i] - step if vertex[i] + step > high else vertex[i] + step
+            )
+            simplex.append(vertex)
+
+        result = minimize(
+            fun=lambda x: evaluate([list(map(float, x))])[0],
+            x0=x0,
+            bounds=bounds,
+            method="Nelder-Mead",
+            options={
+                "initial_simplex": np.array(simplex),
+                "xatol": self._xatol,
+                "fatol": self._fatol,
+            },
+        )
+
+        return bool(result.success), str(result.message)
+
+
+class BayesianStrategy:
+    """
+    Bayesian optimization : a Gaussian process with a squared exponential kernel
+    models the objective, the points maximizing the expected improvement are
+    evaluated in batches of the number of workers
+
+    Args:
+        initial     (int):      Points of the initial Latin hypercube
+        iterations  (int):      Maximum number of batches after the initial one
+        candidates  (int):      Random points on which the expected improvement is
+                                maximized
+        tolerance   (float):    Convergence once the expected improvement is below
+        seed        (int):      Seed of the sampling, the search is reproducible
+
+    """
+
+    name = "bayesian"
+
+    def __init__(
+        self,
+        initial: int = 8,
+        iterations: int = 30,
+        candidates: int = 2048,
+        tolerance: float = 1e-4,
+        seed: int = 0,
+    ):
+        self._initial = initial
+        self._iterations = iterations
+        self._candidates = candidates
+        self._tolerance = tolerance
+        self._seed = seed
+
+    @staticmethod
+    def _kernel(a: np.ndarray, b: np.ndarray, length: float) -> np.ndarray:
+        distances = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * distances / length**2)
+
+    def _fit(self, x: np.ndarray, y: np.ndarray):
+        # Length scale and noise maximizing the marginal likelihood, the objective
+        # being normalized
+        def likelihood(log_params):
+            length, noise = np.exp(log_params)
+            K = self._kernel(x, x, length) + (noise + 1e-10) * np.eye(len(x))
+            try:
+                L = np.linalg.cholesky(K)
+            except np.linalg.LinAlgError:
+                return 1e10
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+            return 0.5 * y @ alpha + np.log(np.diag(L)).sum()
+
+        result = minimize(
+            likelihood,
+            x0=np.log([0.2, 1e-3]),
+            bounds=[(np.log(1e-2), np.log(2.0)), (np.log(1e-8), np.log(1.0))],
+            method="L-BFGS-B",
+        )
+        length, noise = np.exp(result.x)
+
+        K = self._kernel(x, x, length) + (noise + 1e-10) * np.eye(len(x))
+        L = np.linalg.cholesky(K)
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+
+        def predict(points):
+            k = self._kernel(points, x, length)
+            mean = k @ alpha
+            v = np.linalg.solve(L, k.T)
+            variance = np.maximum(1 - (v**2).sum(axis=0), 1e-12)
+            return mean, np.sqrt(variance)
+
+        return predict
+
+    def search(
+        self, evaluate: Objective, bounds: Bounds, x0: List[float], batch: int = 1
+    ) -> Tuple[bool, str]:
+        lower = np.array([low for low, _ in bounds])
+        upper = np.array([high for _, high in bounds])
+        rng = np.random.default_rng(self._seed)
+
+        # Unit cube coordinates
+        def to_points(unit):
+            return [list(map(float, lower + u * (upper - lower))) for u in unit]
+
+        unit = qmc.LatinHypercube(d=len(bounds), seed=self._seed).random(self._initial)
+        unit = np.vstack([(np.array(x0) - lower) / (upper - lower), unit])
+        values = np.array(evaluate(to_points(unit)), dtype=float)
+
+        for _ in range(self._iterations):
+            # Invalid bases are clipped so that they don't flatten the model
+            y = np.minimum(values, np.median(values) + 10 * (values.std() + 1e-12))
+            mean, scale = y.mean(), y.std() + 1e-12
+            predict = self._fit(unit, (y - mean) / scale)
+
+            candidates = rng.random((self._candidates, len(bounds)))
+            mu, sigma = predict(candidates)
+            best = (y.min() - mean) / scale
+            z = (best - mu) / sigma
+            improvement = (best - mu) * norm.cdf(z) + sigma * norm.pdf(z)
+
+            order = np.argsort(improvement)[::-1]
+            if improvement[order[0]] * scale < self._tolerance:
+                return True, "Expected improvement below the tolerance"
+
+            chosen = []
+            for index in order:
+                point = candidates[index]
+                if all(np.abs(point - other).max() > 1e-3 for other in chosen):
+                    chosen.append(point)
+                if len(chosen) == batch:
+                    break
+
+            chosen = np.array(chosen)
+            unit = np.vstack([unit, chosen])
+            values = np.concatenate(
+                [values, np.array(evaluate(to_points(chosen)), dtype=float)]
+            )
+
+        return True, "Maximum number of iterations reached"
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (LBFGSBStrategy, GridStrategy, NelderMeadStrategy, BayesianStrategy)
+}
+
+
+def make_strategy(name: str):
+    """
+    Strategy registered under a name, see `STRATEGIES`
+    """
+    if name not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy {name}, expected one of {', '.join(STRATEGIES)}"
+        )
+    return STRATEGIES[name]()
+
+
+def fidelity_levels(
+    chimney_width: float, mesh_size: float, factors: Sequence[float]
+) -> List[Tuple[float, float]]:
+    """
+    Coarse to fine schedule of the optimization : the mesh size of each level is the
+    target one multiplied by a factor, rounded so that the chimney keeps a whole
+    number of segments. The target size always ends the schedule
+
+    Args:
+        chimney_width   (float):            Width of the chimney
+        mesh_size       (float):            Target mesh size
+        factors         (Sequence[float]):  Coarsening factors, at least 1
+
+    Returns:
+        List[Tuple[float, float]]: (factor, mesh size) of each level, coarsest first
+
+    """
+    nb_seg = round(chimney_width / mesh_size)
+
+    levels = []
+    for factor in sorted(set(factors) | {1}, reverse=True):
+        size = chimney_width / max(1, round(nb_seg / factor))
+        # Factors too close to give another mesh size only keep the finest one
+        if levels and abs(levels[-1][1] - size) <= 1e-12 * size:
+            levels.pop()
+        levels.append((factor, size))
+
+    return levels
@@ -0,0 +1,276 @@
+from math import pi, ceil, sqrt, asin, atan2
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+
+from .quality import quadrangle_aspect_ratio
+
+# Value of the objective when the parameters don't give a valid base
+_INVALID = 1e6
+
+
+def geometric_progression(R, square_width, mesh_size) -> Tuple[float, float]:
+    """
+    Start length and ratio of the progression meshing the spokes of the base
+
+    Args:
+        R               (float):    Radius of the reactor
+        square_width    (float):    Width of the center square
+        mesh_size       (float):    Characteristic mesh size
+
+    Returns:
+        Tuple[float, float]: (start length, ratio)
+
+    """
+    N_theta = ceil(square_width / mesh_size)
+    r0 = (mesh_size * 4 * N_theta) / (2 * pi)
+    q = 1 + (2 * pi) / (4 * N_theta)
+
+    def r_i(i):
+        return r0 * q**i
+
+    dr_min = r_i(1) - r_i(0)
+
+    return dr_min, q
+
+
+def _nb_segments(length: float, mesh_size: float) -> int:
+    return max(1, ceil(length / mesh_size - 1e-9))
+
+
+def _uniform(nb_seg: int) -> np.ndarray:
+    return np.linspace(0.0, 1.0, nb_seg + 1)
+
+
+def _progression(length: float, start: float, ratio: float) -> np.ndarray:
+    # Same distribution as the GeometricProgression hypothesis of SMESH : the elements
+    # grow from the start of the edge, a last element too small is merged
+    positions = [0.0]
+    size = start
+    while positions[-1] + size < length:
+        positions.append(positions[-1] + size)
+        size *= ratio
+
+    if len(positions) > 2 and length - positions[-1] < 0.2 * (
+        positions[-1] - positions[-2]
+    ):
+        positions.pop()
+
+    positions.append(length)
+    return np.array(positions) / length
+
+
+def _transfinite(bottom, top, left, right) -> np.ndarray:
+    # Transfinite interpolation of a block from its four discretized sides, with
+    # bottom[0] = left[0], bottom[-1] = right[0], top[0] = left[-1], top[-1] = right[-1]
+    def parameters(side):
+        lengths = np.linalg.norm(np.diff(side, axis=0), axis=1)
+        return np.concatenate([[0.0], np.cumsum(lengths)]) / lengths.sum()
+
+    u_bottom, u_top = parameters(bottom), parameters(top)
+    v_left, v_right = parameters(left), parameters(right)
+
+    u = (1 - v_left[None, :]) * u_bottom[:, None] + v_left[None, :] * u_top[:, None]
+    v = (1 - u_bottom[:, None]) * v_left[None, :] + u_bottom[:, None] * v_right[None, :]
+    u, v = u[..., None], v[..., None]
+
+    return (
+        (1 - v) * bottom[:, None]
+        + v * top[:, None]
+        + (1 - u) * left[None, :]
+        + u * right[None, :]
+        - (1 - u) * (1 - v) * bottom[0]
+        - u * (1 - v) * bottom[-1]
+        - (1 - u) * v * top[0]
+        - u * v * top[-1]
+    )
+
+
+def _quads(grid: np.ndarray) -> np.ndarray:
+    quads = np.stack(
+        [grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]], axis=2
+    ).reshape(-1, 4, 2)
+    return np.concatenate([quads, np.zeros(quads.shape[:2] + (1,))], axis=2)
+
+
+def _line(start, end, parameters) -> np.ndarray:
+    start, end = np.asarray(start), np.asarray(end)
+    return start + parameters[:, None] * (end - start)
+
+
+class BaseSurrogate:
+    """
+    Analytic model of the quadrangle meshing of the base built by `_create_base`,
+    predicting the worst aspect ratio without SALOME
+
+    The base is symmetric under a rotation of pi / 2, so only the blocks of one
+    quadrant are interpolated : the center square, the side and the corner blocks
+    of the curved square, and the outer block between two spokes
+
+    Args:
+        radius          (float):    Radius of the reactor
+        chimney_width   (float):    Width of the chimney
+        mesh_size       (float):    Characteristic mesh size
+        optimize        (bool):     Spokes meshed with a geometric progression
+
+    """
+
+    def __init__(
+        self,
+        radius: float,
+        chimney_width: float,
+        mesh_size: float,
+        optimize: bool = True,
+    ):
+        self._radius = radius
+        self._chimney_width = chimney_width
+        self._mesh_size = mesh_size
+        self._optimize = optimize
+
+    def quads(self, square_width: float, per_curvature: float) -> np.ndarray:
+        """
+        Predict the quadrangles of one quadrant of the base
+
+        Args:
+            square_width    (float):    Width of the center square
+            per_curvature   (float):    Curvature of the edges of the square
+
+        Returns:
+            np.ndarray: Coordinates of the nodes of the quadrangles, shape (E, 4, 3)
+
+        """
+        R, h = self._radius, self._mesh_size
+        c, s = self._chimney_width, square_width
+
+        if not (c < s < sqrt(2) * R) or per_curvature <= 0:
+            raise ValueError("Invalid base parameters")
+
+        # Arc of the right side of the curved square, circle of center (xc, 0)
+        sag = per_curvature * (sqrt(2) * s / 2 - s / 2)
+        d = ((s / 2) ** 2 - sag**2) / (2 * sag)
+        xc, rho = s / 2 - d, d + sag
+        theta0 = atan2(s / 2, d)
+        theta1 = asin((c / 2) / rho)
+
+        def right_arc(thetas):
+            return np.stack([xc + rho * np.cos(thetas), rho * np.sin(thetas)], axis=1)
+
+        def top_arc(thetas):
+            points = right_arc(thetas)
+            return np.stack([-points[:, 1], points[:, 0]], axis=1)
+
+        x1 = xc + rho * np.cos(theta1)
+
+        n_c = _nb_segments(c, h)
+        n_e = _nb_segments(x1 - c / 2, h)
+
+        blocks = []
+
+        # Center square
+        center = np.linspace(-c / 2, c / 2, n_c + 1)
+        blocks.append(np.stack(np.meshgrid(center, center, indexing="ij"), axis=2))
+
+        # Side block between the chimney and the right arc
+        params_e, params_c = _uniform(n_e), _uniform(n_c)
+        blocks.append(
+            _transfinite(
+                _line((c / 2, -c / 2), (x1, -c / 2), params_e),
+                _line((c / 2, c / 2), (x1, c / 2), params_e),
+                _line((c / 2, -c / 2), (c / 2, c / 2), params_c),
+                right_arc(-theta1 + 2 * theta1 * params_c),
+            )
+        )
+
+        # Corner block
+        blocks.append(
+            _transfinite(
+                _line((c / 2, c / 2), (x1, c / 2), params_e),
+                top_arc(-theta1 - (theta0 - theta1) * params_e),
+                _line((c / 2, c / 2), (c / 2, x1), params_e),
+                right_arc(theta1 + (theta0 - theta1) * params_e),
+            )
+        )
+
+        # Outer block between the two right spokes
+        thetas = np.concatenate(
+            [
+                -theta0 + (theta0 - theta1) * params_e[:-1],
+                -theta1 + 2 * theta1 * params_c[:-1],
+                theta1 + (theta0 - theta1) * params_e,
+            ]
+        )
+        n_tot = len(thetas) - 1
+        phis = -pi / 4 + (pi / 2) * _uniform(n_tot)
+
+        spoke_length = R - s / sqrt(2)
+        if self._optimize:
+            start, ratio = geometric_progression(R, s, h)
+            params_s = _progression(spoke_length, start, ratio)
+        else:
+            params_s = _uniform(_nb_segments(spoke_length, h))
+
+        blocks.append(
+            _transfinite(
+                right_arc(thetas),
+                R * np.stack([np.cos(phis), np.sin(phis)], axis=1),
+                _line((s / 2, -s / 2), (R / sqrt(2), -R / sqrt(2)), params_s),
+                _line((s / 2, s / 2), (R / sqrt(2), R / sqrt(2)), params_s),
+            )
+        )
+
+        return np.concatenate([_quads(block) for block in blocks])
+
+    def max_aspect_ratio(self, square_width: float, per_curvature: float) -> float:
+        return float(
+            quadrangle_aspect_ratio(self.quads(square_width, per_curvature)).max()
+        )
+
+    def __call__(self, x: Sequence[float]) -> float:
+        """
+        Surrogate of the optimizer objective : max aspect ratio - 1
+        """
+        per_square, per_curvature = x
+        try:
+            return self.max_aspect_ratio(per_square * self._radius, per_curvature) - 1
+        except (ValueError, ZeroDivisionError, FloatingPointError):
+            return _INVALID
+
+    def search(
+        self, bounds, nb_candidates: int = 4, resolution: int = 30
+    ) -> List[List[float]]:
+        """
+        Best candidates of the surrogate, found by a grid search refined by Nelder-Mead
+
+        Args:
+            bounds          (List):     Bounds of (per_square, per_curvature)
+            nb_candidates   (int):      Number of candidates returned
+            resolution      (int):      Number of grid points along each parameter
+
+        Returns:
+            List[List[float]]: The candidates, best first
+
+        """
+        axes = [np.linspace(low, high, resolution) for low, high in bounds]
+        grid = [[x0, x1] for x0 in axes[0] for x1 in axes[1]]
+        values = [self(x) for x in grid]
+
+        candidates = []
+        for index in np.argsort(values)[: 2 * nb_candidates]:
+            result = minimize(
+                self,
+                grid[index],
+                method="Nelder-Mead",
+                bounds=bounds,
+                options={"xatol": 1e-4, "fatol": 1e-6},
+            )
+            candidates.append((float(result.fun), [float(v) for v in result.x]))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        distinct = []
+        for value, x in candidates:
+            if all(np.linalg.norm(np.subtract(x, y)) > 1e-3 for y in distinct):
+                distinct.append(x)
+
+        return distinct[:nb_candidates]
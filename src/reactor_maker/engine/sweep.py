@@ -0,0 +1,174 @@
+from typing import Tuple
+
+import numpy as np
+
+from .arrays import MeshArrays, QUADRANGLE, HEXAHEDRON, REVERSED_HEXAHEDRON
+
+
+def _counterclockwise(nodes: np.ndarray, quads: np.ndarray) -> np.ndarray:
+    # Quadrangles turning counterclockwise seen from +Z, so that the hexahedra
+    # built on them all have the same orientation
+    p = nodes[quads][:, :, :2]
+    d1, d2 = p[:, 2] - p[:, 0], p[:, 3] - p[:, 1]
+    area = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+    return np.where((area < 0)[:, None], quads[:, ::-1], quads)
+
+
+def _boundary_edges(quads: np.ndarray) -> np.ndarray:
+    # Edges used by a single quadrangle, in the direction of the quadrangle so that
+    # the region lies on their left
+    edges = np.stack([quads, np.roll(quads, -1, axis=1)], axis=2).reshape(-1, 2)
+    _, inverse, counts = np.unique(
+        np.sort(edges, axis=1), axis=0, return_inverse=True, return_counts=True
+    )
+    return edges[counts[inverse.ravel()] == 1]
+
+
+def _extrude(
+    quads: np.ndarray,
+    edges: np.ndarray,
+    bottom: np.ndarray,
+    first: np.ndarray,
+    step: int,
+    nb_layers: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Hexahedra of the layers and quadrangles of their sides. `bottom` maps the
+    # nodes of the base to the nodes of the first level, `first` to the second one,
+    # the next levels being offset by `step`
+    offsets = np.arange(nb_layers) * step
+
+    upper = first[quads][None] + offsets[:, None, None]
+    lower = np.concatenate([bottom[quads][None], upper[:-1]])
+    hexas = np.concatenate([lower, upper], axis=2).reshape(-1, 8)
+
+    upper = first[edges][None] + offsets[:, None, None]
+    lower = np.concatenate([bottom[edges][None], upper[:-1]])
+    sides = np.stack(
+        [lower[..., 0], lower[..., 1], upper[..., 1], upper[..., 0]], axis=-1
+    ).reshape(-1, 4)
+
+    return hexas, sides
+
+
+def sweep(
+    base: MeshArrays,
+    center: Tuple[float, float],
+    chimney_width: float,
+    height: float,
+    chimney_height: float,
+    nb_layers: int,
+    nb_chimney_layers: int,
+) -> MeshArrays:
+    """
+    Hexahedral mesh of the reactor built by sweeping the quadrangles of its base
+    along +Z : `nb_layers` layers for the body, then the quadrangles under the
+    chimney are swept again for the chimney. The Inlet, Outlet and Wall groups are
+    made of the quadrangles of the boundary, known from the construction. Only the
+    boundary is meshed in 2D, the faces inside the volume are not
+
+    The hexahedra follow the SMDS order of `MeshArrays`, their bottom face turning
+    clockwise seen from +Z. The quadrangles of the boundary turn counterclockwise
+    seen from outside
+
+    Args:
+        base                (MeshArrays):   Quadrangles of the base, in a plane
+                                            normal to Z
+        center              (Tuple):        (x, y) of the axis of the reactor
+        chimney_width       (float):        Width of the square section of the
+                                            chimney
+        height              (float):        Height of the body
+        chimney_height      (float):        Height of the chimney
+        nb_layers           (int):          Layers of hexahedra of the body
+        nb_chimney_layers   (int):          Layers of hexahedra of the chimney
+
+    Returns:
+        MeshArrays: The hexahedra, the quadrangles of the boundary and the groups
+
+    """
+    if nb_layers < 1 or nb_chimney_layers < 1:
+        raise ValueError("The body and the chimney need at least one layer")
+
+    quads = base.connectivity(QUADRANGLE)
+    if len(quads) == 0:
+        raise ValueError("The base has no quadrangle")
+
+    # Nodes of the quadrangles only, numbered from 0
+    used, quads = np.unique(quads, return_inverse=True)
+    quads = _counterclockwise(base.nodes[used], quads.reshape(-1, 4))
+    plane = base.nodes[used]
+    nb_plane = len(plane)
+
+    centres = plane[quads].mean(axis=1)
+    under_chimney = np.all(
+        np.abs(centres[:, :2] - np.asarray(center)) <= chimney_width / 2, axis=1
+    )
+    if not under_chimney.any():
+        raise ValueError("No quadrangle of the base lies under the chimney")
+    chimney_quads = quads[under_chimney]
+
+    footprint = np.unique(chimney_quads)
+    local = np.full(nb_plane, -1, dtype=np.int64)
+    local[footprint] = np.arange(len(footprint))
+
+    # Nodes : levels of the body, then levels of the chimney above its top
+    nb_body = (nb_layers + 1) * nb_plane
+    body_z = np.arange(nb_layers + 1) * (height / nb_layers)
+    chimney_z = height + np.arange(1, nb_chimney_layers + 1) * (
+        chimney_height / nb_chimney_layers
+    )
+    nodes = np.concatenate(
+        [
+            np.repeat(plane[None], nb_layers + 1, axis=0).reshape(-1, 3),
+            np.repeat(plane[footprint][None], nb_chimney_layers, axis=0).reshape(-1, 3),
+        ]
+    )
+    nodes[:, 2] += np.concatenate(
+        [
+            np.repeat(body_z, nb_plane),
+            np.repeat(chimney_z, len(footprint)),
+        ]
+    )
+
+    identity = np.arange(nb_plane)
+    body_hexas, body_sides = _extrude(
+        quads,
+        _boundary_edges(quads),
+        identity,
+        identity + nb_plane,
+        nb_plane,
+        nb_layers,
+    )
+    chimney_hexas, chimney_sides = _extrude(
+        chimney_quads,
+        _boundary_edges(chimney_quads),
+        identity + nb_layers * nb_plane,
+        local + nb_body,
+        len(footprint),
+        nb_chimney_layers,
+    )
+
+    inlet = quads[:, ::-1]
+    outlet = local[chimney_quads] + nb_body + (nb_chimney_layers - 1) * len(footprint)
+    roof = quads[~under_chimney] + nb_layers * nb_plane
+    wall = np.concatenate([body_sides, roof, chimney_sides])
+
+    faces = np.concatenate([inlet, outlet, wall])
+    # Built on quadrangles turning counterclockwise seen from +Z, the hexahedra are
+    # turned to the SMDS order
+    hexas = np.concatenate([body_hexas, chimney_hexas])[:, REVERSED_HEXAHEDRON]
+
+    face_ids = np.arange(1, len(faces) + 1)
+    hexa_ids = np.arange(len(faces) + 1, len(faces) + len(hexas) + 1)
+
+    groups = {
+        "Inlet": face_ids[: len(inlet)],
+        "Outlet": face_ids[len(inlet) : len(inlet) + len(outlet)],
+        "Wall": face_ids[len(inlet) + len(outlet) :],
+    }
+
+    return MeshArrays(
+        np.arange(1, len(nodes) + 1),
+        nodes,
+        {QUADRANGLE: (face_ids, faces), HEXAHEDRON: (hexa_ids, hexas)},
+        groups,
+    )
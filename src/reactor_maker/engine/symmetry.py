@@ -0,0 +1,84 @@
+from typing import Tuple
+
+import numpy as np
+
+from .arrays import MeshArrays, QUADRANGLE
+
+
+def _ray_nodes(relative: np.ndarray, axis: int, tolerance: float) -> np.ndarray:
+    # Nodes on the ray of the positive `axis` starting at the centre, sorted by
+    # distance to the centre
+    other = 1 - axis
+    on_ray = np.flatnonzero(
+        (np.abs(relative[:, other]) <= tolerance) & (relative[:, axis] >= -tolerance)
+    )
+    return on_ray[np.argsort(relative[on_ray, axis], kind="stable")]
+
+
+def replicate_quadrant(
+    quadrant: MeshArrays, center: Tuple[float, float], tolerance: float
+) -> MeshArrays:
+    """
+    Mesh of the whole base from the mesh of its quadrant x >= 0, y >= 0, rotated
+    three times by a quarter turn around the axis. The nodes shared by two quadrants
+    are merged by their rank along the rays bounding the quadrant, without any
+    search by coordinates
+
+    Args:
+        quadrant    (MeshArrays):   Quadrangles of the quadrant
+        center      (Tuple):        (x, y) of the axis of the reactor
+        tolerance   (float):        Largest distance of a node to a ray it lies on
+
+    Returns:
+        MeshArrays: The quadrangles of the base, without groups
+
+    """
+    quads = quadrant.connectivity(QUADRANGLE)
+    if len(quads) == 0:
+        raise ValueError("The quadrant has no quadrangle")
+
+    # Nodes of the quadrangles only, numbered from 0
+    used, quads = np.unique(quads, return_inverse=True)
+    quads = quads.reshape(-1, 4)
+    plane = quadrant.nodes[used]
+    relative = plane[:, :2] - np.asarray(center)
+
+    on_x = _ray_nodes(relative, 0, tolerance)
+    on_y = _ray_nodes(relative, 1, tolerance)
+    if (
+        len(on_x) == 0
+        or len(on_x) != len(on_y)
+        or np.abs(relative[on_x, 0] - relative[on_y, 1]).max() > tolerance
+    ):
+        raise ValueError("The nodes of the two sides of the quadrant don't match")
+
+    # The ray +x of a quarter is the ray +y of the previous one, the ray +y of the
+    # last quarter is the ray +x of the first one
+    maps, created = [], []
+    nb_nodes = 0
+    for k in range(4):
+        index = np.full(len(plane), -1, dtype=np.int64)
+        if k > 0:
+            index[on_x] = maps[k - 1][on_y]
+        if k == 3:
+            index[on_y] = maps[0][on_x]
+
+        new = np.flatnonzero(index < 0)
+        index[new] = nb_nodes + np.arange(len(new))
+        nb_nodes += len(new)
+        maps.append(index)
+        created.append(new)
+
+    # Only the nodes created by a quarter are placed by it, the shared ones keep the
+    # coordinates of the first quarter holding them
+    nodes = np.empty((nb_nodes, 3), dtype=np.float64)
+    rotated = relative
+    for index, new in zip(maps, created):
+        nodes[index[new], :2] = rotated[new] + np.asarray(center)
+        nodes[index[new], 2] = plane[new, 2]
+        rotated = np.column_stack([-rotated[:, 1], rotated[:, 0]])
+
+    faces = np.concatenate([index[quads] for index in maps])
+    ids = np.arange(1, len(faces) + 1)
+
+    return MeshArrays(np.arange(1, nb_nodes + 1), nodes, {QUADRANGLE: (ids, faces)})
@@ -0,0 +1,143 @@
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from .report import RunReport
+
+# Calls returning objects whose own methods are traced, with the prefix of their
+# methods : meshes created by smesh and the algorithms created by a mesh
+_FACTORIES = {
+    "Mesh": "Mesh.",
+    "Segment": "Algo.",
+    "Quadrangle": "Algo.",
+    "Hexahedron": "Algo.",
+}
+
+
+class CallStats:
+    """
+    Number of calls and cumulated latency of every method of the builders, by stage
+    of the engine
+    """
+
+    def __init__(self):
+        self._calls = defaultdict(lambda: [0, 0.0])
+
+    def record(self, method: str, stage: str, elapsed: float) -> None:
+        entry = self._calls[(method, stage)]
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def clear(self) -> None:
+        self._calls.clear()
+
+    @property
+    def nb_calls(self) -> int:
+        return sum(count for count, _ in self._calls.values())
+
+    def _grouped(self, position: int) -> Dict[str, Tuple[int, float]]:
+        grouped = defaultdict(lambda: [0, 0.0])
+        for key, (count, elapsed) in self._calls.items():
+            grouped[key[position]][0] += count
+            grouped[key[position]][1] += elapsed
+        return {key: tuple(value) for key, value in grouped.items()}
+
+    def by_method(self) -> Dict[str, Tuple[int, float]]:
+        return self._grouped(0)
+
+    def by_stage(self) -> Dict[str, Tuple[int, float]]:
+        return self._grouped(1)
+
+    def by_method_and_stage(self) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        return {key: tuple(value) for key, value in self._calls.items()}
+
+    def summary(self, top: int = 20) -> str:
+        """
+        Tables of the methods and of the (method, stage) pairs taking the most time
+        """
+        lines = [f"Calls to the builders : {self.nb_calls}", ""]
+
+        def table(title: str, rows: List[Tuple[str, int, float]]) -> None:
+            header = f"{title:<48} {'calls':>8} {'total (s)':>10} {'mean (ms)':>10}"
+            lines.extend([header, "-" * len(header)])
+            for name, count, elapsed in rows[:top]:
+                lines.append(
+                    f"{name:<48} {count:>8} {elapsed:>10.3f} "
+                    f"{elapsed / count * 1e3:>10.3f}"
+                )
+            lines.append("")
+
+        def ordered(items):
+            return sorted(items, key=lambda row: row[2], reverse=True)
+
+        table(
+            "method",
+            ordered((key, *value) for key, value in self.by_method().items()),
+        )
+        table(
+            "method @ stage",
+            ordered(
+                (f"{method} @ {stage}", *value)
+                for (method, stage), value in self.by_method_and_stage().items()
+            ),
+        )
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+class TracingProxy:
+    """
+    Forward every attribute to a builder, counting the calls and their latency in
+    `stats`, under the name of the current span of `report`
+
+    Args:
+        target  (object):       The builder, or a mesh/algorithm created by smesh
+        stats   (CallStats):    Statistics filled by the calls
+        report  (RunReport):    Report giving the current stage of the engine
+        prefix  (str):          Prefix of the recorded method names
+
+    """
+
+    def __init__(self, target, stats: CallStats, report: RunReport, prefix: str = ""):
+        self._target = target
+        self._stats = stats
+        self._report = report
+        self._prefix = prefix
+
+    @property
+    def target(self):
+        return self._target
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            finally:
+                current = self._report.current
+                self._stats.record(
+                    self._prefix + name,
+                    current.name if current is not None else "-",
+                    time.perf_counter() - start,
+                )
+
+            if name in _FACTORIES:
+                return TracingProxy(result, self._stats, self._report, _FACTORIES[name])
+
+            if name == "CreateMeshesFromMED":
+                meshes, status = result
+                return [
+                    TracingProxy(mesh, self._stats, self._report, "Mesh.")
+                    for mesh in meshes
+                ], status
+
+            return result
+
+        return traced
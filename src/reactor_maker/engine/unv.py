@@ -0,0 +1,200 @@
+import re
+
+import numpy as np
+
+from .arrays import (
+    MeshArrays,
+    EDGE,
+    TRIANGLE,
+    QUADRANGLE,
+    HEXAHEDRON,
+    REVERSED_HEXAHEDRON,
+)
+from .compression import open_stream
+
+_SEPARATOR = "    -1\n"
+# Line starting or ending a dataset
+_DELIMITER = re.compile(r"^ *-1 *\r?\n", re.MULTILINE)
+
+# FE descriptors of the I-DEAS universal format
+_DESCRIPTORS = {EDGE: 11, TRIANGLE: 41, QUADRANGLE: 44, HEXAHEDRON: 115}
+_CODES = {descriptor: code for code, descriptor in _DESCRIPTORS.items()}
+# Nodes of the I-DEAS elements whose order differs from the SMDS one of the arrays,
+# the bricks turning the other way as in the UNV driver of SMESH. Each permutation
+# is its own inverse, it is applied both when writing and reading
+_NODE_ORDERS = {HEXAHEDRON: REVERSED_HEXAHEDRON}
+# Entity type of the finite elements in the groups
+_ELEMENT_ENTITY = 8
+
+
+def write_unv(arrays: MeshArrays, filename: str) -> None:
+    """
+    Write a mesh to the I-DEAS universal format read by SALOME and most solvers :
+    nodes (2411), elements (2412) and groups of elements (2467). Each dataset is
+    formatted in a single pass over its array instead of line by line. A file name
+    ending with .gz or .xz is compressed while it is written
+
+    Args:
+        arrays      (MeshArrays):   The mesh
+        filename    (str):          Path of the .unv file
+
+    """
+    with open_stream(filename, "w") as f:
+        _write_nodes(f, arrays)
+        _write_elements(f, arrays)
+        if arrays.groups:
+            _write_groups(f, arrays)
+
+
+def _write_nodes(f, arrays: MeshArrays) -> None:
+    f.write(_SEPARATOR + "  2411\n")
+    nb_nodes = len(arrays.nodes)
+    if nb_nodes:
+        np.savetxt(
+            f,
+            np.column_stack(
+                [
+                    arrays.node_ids,
+                    np.ones(nb_nodes),
+                    np.ones(nb_nodes),
+                    np.full(nb_nodes, 11),
+                    arrays.nodes,
+                ]
+            ),
+            fmt="%10d%10d%10d%10d\n%25.16E%25.16E%25.16E",
+        )
+    f.write(_SEPARATOR)
+
+
+def _write_elements(f, arrays: MeshArrays) -> None:
+    f.write(_SEPARATOR + "  2412\n")
+    for code in arrays.codes:
+        ids = arrays.element_ids(code)
+        if code not in _DESCRIPTORS or len(ids) == 0:
+            continue
+
+        nb_nodes = code % 100
+        columns = [
+            ids,
+            np.full(len(ids), _DESCRIPTORS[code]),
+            np.full(len(ids), 2),
+            np.full(len(ids), 1),
+            np.full(len(ids), 7),
+            np.full(len(ids), nb_nodes),
+        ]
+        fmt = "%10d" * 6 + "\n"
+        if code == EDGE:
+            # Beams have an extra record of orientation
+            columns.append(np.zeros((len(ids), 3), dtype=np.int64))
+            fmt += "%10d" * 3 + "\n"
+        conn = arrays.connectivity(code)
+        if code in _NODE_ORDERS:
+            conn = conn[:, _NODE_ORDERS[code]]
+        columns.append(arrays.node_ids[conn])
+        fmt += "%10d" * nb_nodes
+
+        np.savetxt(f, np.column_stack(columns), fmt=fmt)
+    f.write(_SEPARATOR)
+
+
+def _write_groups(f, arrays: MeshArrays) -> None:
+    f.write(_SEPARATOR + "  2467\n")
+    for number, (name, ids) in enumerate(arrays.groups.items(), start=1):
+        f.write(f"{number:10d}{0:10d}{0:10d}{0:10d}{0:10d}{0:10d}{0:10d}")
+        f.write(f"{len(ids):10d}\n{name}\n")
+
+        # Two entities per line : type, tag, node leaf id, component id
+        entities = np.zeros((len(ids), 4), dtype=np.int64)
+        entities[:, 0] = _ELEMENT_ENTITY
+        entities[:, 1] = ids
+
+        nb_pairs = len(ids) // 2
+        if nb_pairs:
+            np.savetxt(
+                f, entities[: 2 * nb_pairs].reshape(-1, 8), fmt="%10d", delimiter=""
+            )
+        if len(ids) % 2:
+            np.savetxt(f, entities[-1:], fmt="%10d", delimiter="")
+    f.write(_SEPARATOR)
+
+
+def read_unv(filename: str) -> MeshArrays:
+    """
+    Read the nodes (2411), the edges, triangles, quadrangles and hexahedra (2412) and
+    the groups of elements (2467) of a universal file, compressed or not depending
+    on its suffix. The other datasets and element types are ignored
+
+    Args:
+        filename    (str):  Path of the .unv, .unv.gz or .unv.xz file
+
+    Returns:
+        MeshArrays: The mesh
+
+    """
+    with open_stream(filename, "r") as f:
+        text = f.read()
+
+    datasets = {}
+    for block in _DELIMITER.split(text):
+        header, _, content = block.lstrip("\r\n").partition("\n")
+        if header.strip():
+            datasets[header.strip()] = content
+
+    tokens = datasets.get("2411", "").replace("D", "E").split()
+    node_block = np.array(tokens, dtype=np.float64).reshape(-1, 7)
+    node_ids = node_block[:, 0].astype(np.int64)
+    nodes = np.ascontiguousarray(node_block[:, 4:])
+
+    lookup = np.full(node_ids.max() + 1 if len(node_ids) else 1, -1, dtype=np.int64)
+    lookup[node_ids] = np.arange(len(node_ids))
+
+    elements = {}
+    tokens = np.array(datasets.get("2412", "").split(), dtype=np.int64)
+    for descriptor, block in _split_runs(tokens):
+        if descriptor not in _CODES:
+            continue
+        code = _CODES[descriptor]
+        ids, conn = block[:, 0], lookup[block[:, -(code % 100) :]]
+        if code in _NODE_ORDERS:
+            conn = conn[:, _NODE_ORDERS[code]]
+        if code in elements:
+            ids = np.concatenate([elements[code][0], ids])
+            conn = np.concatenate([elements[code][1], conn])
+        elements[code] = (ids, conn)
+
+    groups = {}
+    lines = datasets.get("2467", "").splitlines()
+    position = 0
+    while position + 1 < len(lines):
+        nb_entities = int(lines[position].split()[7])
+        name = lines[position + 1].strip()
+        nb_lines = (nb_entities + 1) // 2
+        entities = " ".join(lines[position + 2 : position + 2 + nb_lines]).split()
+        entities = np.array(entities, dtype=np.int64).reshape(-1, 4)
+        groups[name] = entities[entities[:, 0] == _ELEMENT_ENTITY, 1]
+        position += 2 + nb_lines
+
+    return MeshArrays(node_ids, nodes, elements, groups)
+
+
+def _split_runs(tokens: np.ndarray):
+    # Like the DAT reader, runs of elements of a same descriptor are reshaped at once.
+    # A record holds 6 integers, 3 more for the beams, then the nodes
+    position = 0
+    while position < len(tokens):
+        descriptor = int(tokens[position + 1])
+        width = 6 + (3 if descriptor == _DESCRIPTORS[EDGE] else 0)
+        width += int(tokens[position + 5])
+
+        nb_rows = (len(tokens) - position) // width
+        rows = tokens[position : position + nb_rows * width].reshape(nb_rows, width)
+
+        mismatch = np.flatnonzero(
+            (rows[:, 1] != descriptor) | (rows[:, 5] != rows[0, 5])
+        )
+        nb_run = mismatch[0] if len(mismatch) else nb_rows
+        if nb_run == 0:
+            raise ValueError("Malformed UNV file")
+
+        yield descriptor, rows[:nb_run]
+        position += nb_run * width
@@ -0,0 +1,214 @@
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from math import ceil, sqrt
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import quantize
+
+# Resolution of the ratios of an exact match
+_RATIO_RESOLUTION = 1e-9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    id INTEGER PRIMARY KEY,
+    chimney_ratio REAL NOT NULL,
+    mesh_ratio REAL NOT NULL,
+    chimney_key INTEGER NOT NULL,
+    mesh_key INTEGER NOT NULL,
+    chimney_segments INTEGER NOT NULL,
+    radius_segments INTEGER NOT NULL,
+    per_square REAL NOT NULL,
+    per_curvature REAL NOT NULL,
+    max_aspect_ratio REAL NOT NULL,
+    evaluations INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outcomes_exact ON outcomes (
+    chimney_key, mesh_key, chimney_segments, radius_segments
+);
+"""
+
+
+class ShapeFeatures(NamedTuple):
+    """
+    Dimensionless description of the base of a reactor : its meshing, and so the
+    optimal ratios, don't change when the radius, the chimney width and the mesh
+    size are scaled together
+    """
+
+    chimney_ratio: float
+    mesh_ratio: float
+    chimney_segments: int
+    radius_segments: int
+
+    @classmethod
+    def of(cls, radius: float, chimney_width: float, mesh_size: float):
+        return cls(
+            chimney_width / radius,
+            mesh_size / radius,
+            round(chimney_width / mesh_size),
+            ceil(radius / mesh_size - 1e-9),
+        )
+
+    def distance(self, other: "ShapeFeatures") -> float:
+        # The ratios are compared relatively, the mesh ratio spanning decades
+        return sqrt(
+            (self.chimney_ratio - other.chimney_ratio) ** 2
+            + ((self.mesh_ratio - other.mesh_ratio) / self.mesh_ratio) ** 2
+        )
+
+
+class Outcome(NamedTuple):
+    features: ShapeFeatures
+    parameters: Tuple[float, float]
+    max_aspect_ratio: float
+    evaluations: int
+    strategy: str
+    reason: str
+
+
+class WarmStartStore:
+    """
+    Outcomes of the past optimizations in an SQLite database, looked up by the
+    features of the shape to skip or seed the next ones
+
+    Args:
+        path    (str):  File of the database, created if missing
+
+    """
+
+    def __init__(self, path):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation : the store is shared by the processes of a
+        # batch, SQLite serializes their writes. The connection only commits or
+        # rolls back the transaction on exit, it is closed separately
+        with closing(sqlite3.connect(self._path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    def record(
+        self,
+        features: ShapeFeatures,
+        parameters: Sequence[float],
+        max_aspect_ratio: float,
+        evaluations: int,
+        strategy: str,
+        reason: str,
+    ) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO outcomes (chimney_ratio, mesh_ratio, chimney_key, "
+                "mesh_key, chimney_segments, radius_segments, per_square, "
+                "per_curvature, max_aspect_ratio, evaluations, strategy, reason, "
+                "created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    features.chimney_ratio,
+                    features.mesh_ratio,
+                    quantize(features.chimney_ratio, _RATIO_RESOLUTION),
+                    quantize(features.mesh_ratio, _RATIO_RESOLUTION),
+                    features.chimney_segments,
+                    features.radius_segments,
+                    float(parameters[0]),
+                    float(parameters[1]),
+                    max_aspect_ratio,
+                    evaluations,
+                    strategy,
+                    reason,
+                    time.time(),
+                ),
+            )
+
+    def _outcomes(self, query: str, arguments: Tuple = ()) -> List[Outcome]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT chimney_ratio, mesh_ratio, chimney_segments, "
+                "radius_segments, per_square, per_curvature, max_aspect_ratio, "
+                "evaluations, strategy, reason FROM outcomes " + query,
+                arguments,
+            ).fetchall()
+
+        return [
+            Outcome(ShapeFeatures(*row[:4]), (row[4], row[5]), *row[6:]) for row in rows
+        ]
+
+    def exact(
+        self,
+        features: ShapeFeatures,
+        reasons: Sequence[str] = (),
+        max_aspect_ratio: Optional[float] = None,
+    ) -> Optional[Outcome]:
+        """
+        Best outcome of a shape with the same features, among the optimizations
+        stopped for one of `reasons` and reaching `max_aspect_ratio` if given
+        """
+        query = (
+            "WHERE chimney_key = ? AND mesh_key = ? AND chimney_segments = ? "
+            "AND radius_segments = ?"
+        )
+        arguments = (
+            quantize(features.chimney_ratio, _RATIO_RESOLUTION),
+            quantize(features.mesh_ratio, _RATIO_RESOLUTION),
+            features.chimney_segments,
+            features.radius_segments,
+        )
+        if reasons:
+            query += f" AND reason IN ({', '.join('?' * len(reasons))})"
+            arguments += tuple(reasons)
+        if max_aspect_ratio is not None:
+            query += " AND max_aspect_ratio <= ?"
+            arguments += (max_aspect_ratio,)
+
+        outcomes = self._outcomes(
+            query + " ORDER BY max_aspect_ratio LIMIT 1", arguments
+        )
+        return outcomes[0] if outcomes else None
+
+    def nearest(
+        self, features: ShapeFeatures, max_distance: float = 0.25
+    ) -> Optional[Tuple[Outcome, float]]:
+        """
+        Closest outcome of the same number of chimney segments, within `max_distance`
+
+        Returns:
+            Optional[Tuple[Outcome, float]]: The outcome and its distance
+
+        """
+        outcomes = self._outcomes(
+            "WHERE chimney_segments = ?", (features.chimney_segments,)
+        )
+
+        best = None
+        for outcome in outcomes:
+            distance = features.distance(outcome.features)
+            if distance > max_distance:
+                continue
+            if (
+                best is None
+                or distance < best[1]
+                or (
+                    distance == best[1]
+                    and outcome.max_aspect_ratio < best[0].max_aspect_ratio
+                )
+            ):
+                best = (outcome, distance)
+
+        return best
+
+    def __len__(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
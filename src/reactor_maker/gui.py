@@ -1,8 +1,9 @@
+import threading
 import tkinter as tk
 from tkinter.filedialog import askopenfilename, asksaveasfilename
 from tkinter.messagebox import showinfo, showwarning
 
-import yaml, tomllib
+import yaml
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
@@ -13,8 +14,10 @@ except Exception as e:
 
 from typing import Dict, Optional, List
 
-from .engine import ReactorMaker
-from .vector import vector2, vector3
+from .engine.events import STAGE, PROGRESS
+from .log_view import LogView
+from .worker import GenerationWorker, EVENT, DONE, ERROR, EXPORTED
+from .config import load_config
 
 
 class Application:
@@ -59,12 +62,27 @@ class Application:
             command=self._on_generate,
         )
 
+        self._cancel_button = ttk.Button(
+            button_frame,
+            text="Cancel",
+            bootstyle="danger",
+            command=self._on_cancel,
+            state=DISABLED,
+        )
+
         self._generate_button.pack(side=RIGHT, padx=5)
+        self._cancel_button.pack(side=RIGHT, padx=5)
         self._reset_button.pack(side=RIGHT, padx=5)
 
         self._generate_output_widget()
 
-        self._mesh = None
+        # Process generating the reactor, kept alive after the generation to export
+        # the mesh it holds
+        self._worker = None
+        self._generating = False
+        self._poll_job = None
+
+        self._window.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _generate_menu(self):
         self._menu = ttk.Menu(self._window)
@@ -82,7 +100,7 @@ class Application:
         self._file_menu.add_cascade(label="Save As", menu=self._save_menu)
 
         self._file_menu.add_separator()
-        self._file_menu.add_command(label="Exit", command=self._window.quit)
+        self._file_menu.add_command(label="Exit", command=self._on_close)
         self._menu.add_cascade(label="File", menu=self._file_menu)
 
         self._mesh_menu = ttk.Menu(self._menu)
@@ -93,7 +111,7 @@ class Application:
         self._menu.add_cascade(label="Mesh", menu=self._mesh_menu)
 
         self._geometry_menu = ttk.Menu(self._menu)
-        self._geometry_menu.add_command(label="Export")
+        self._geometry_menu.add_command(label="Export", command=self._on_export_stl)
         self._menu.add_cascade(label="Geometry", menu=self._geometry_menu)
 
         self._help_menu = ttk.Menu(self._menu)
@@ -114,14 +132,9 @@ class Application:
             filetypes=(("yaml files", "*.yaml"), ("toml file", "*.toml")),
         )
 
-        datas = None
-        if filename.endswith(".yaml"):
-            with open(filename, "r") as f:
-                datas = yaml.safe_load(f)
-        elif filename.endswith(".toml"):
-            with open(filename, "rb") as f:
-                datas = tomllib.load(f)
-        else:
+        try:
+            datas = load_config(filename)
+        except ValueError:
             showinfo(title="Info", message="Extension file no supported")
             return
 
@@ -323,11 +336,23 @@ class Application:
             child=ttk.Label(self._tabs, text="Showing mesh computed"), text="Mesh 1"
         )
 
+        status_frame = ttk.Frame(self._rframe)
+        status_frame.pack(fill=X, pady=5)
+
+        self._status_var = tk.StringVar(value="")
+        ttk.Label(status_frame, textvariable=self._status_var).pack(side=LEFT)
+
+        self._progress = ttk.Progressbar(status_frame, mode="indeterminate", length=150)
+        self._progress.pack(side=RIGHT)
+
         ttk.Label(self._rframe, text="Outputs :").pack(anchor=W, pady=5)
 
         self._outputs = ttk.ScrolledText(self._rframe, height=2)
         self._outputs.pack(fill=BOTH, expand=YES)
 
+        self._log = LogView(self._outputs)
+        self._log.start()
+
     def _on_reset(self):
         for entry in self._center_entry:
             entry.delete(0, END)
@@ -398,6 +423,10 @@ class Application:
         return data
 
     def _on_generate(self):
+        if self._worker is not None and self._generating:
+            showinfo(title="Info", message="A generation is already running")
+            return
+
         datas = self._get_datas()
         if datas is None:
             return
@@ -406,63 +435,132 @@ class Application:
         chimney = datas["chimney"]
         meshing = datas["meshing"]
 
-        self._outputs.insert(END, f"\n----------- Generation started ----------\n\n")
-        self._outputs.insert(END, f"Center: {reactor["center"]}\n")
-        self._outputs.insert(END, f"Reactor radius: {reactor["radius"]}\n")
-        self._outputs.insert(END, f"Reactor height: {reactor["height"]}\n")
-        self._outputs.insert(
-            END, f"Reactor per_squarre: {meshing["square_ratio"]:0.2f}\n"
-        )
-        self._outputs.insert(
-            END, f"Curvature ratio: {meshing["curvature_ratio"]:0.2f}\n\n"
-        )
-        self._outputs.insert(END, f"Chimney width: {chimney["width"]}\n")
-        self._outputs.insert(END, f"Chimney height: {chimney["height"]}\n")
-        self._outputs.insert(END, f"Mesh size: {meshing["size"]}\n\n")
-
-        self._outputs.see(END)
-
-        maker = ReactorMaker()
-
-        maker.set_output_widget(self._outputs)
-
-        optimize = meshing["optimize"] != 0
-
-        geometry = maker.create_geometry(
-            center=vector3(
-                float(reactor["center"][0]),
-                float(reactor["center"][1]),
-                float(reactor["center"][2]),
-            ),
-            reactor_dim=vector2(float(reactor["radius"]), float(reactor["height"])),
-            chimney_dim=vector2(float(chimney["width"]), float(chimney["height"])),
-            per_square=float(meshing["square_ratio"]),
-            mesh_size=float(meshing["size"]),
-            per_curvature=meshing["curvature_ratio"],
-            optimize=optimize,
-        ).unwrap()
-
-        self._mesh = maker.mesh(geometry, optimize).unwrap()
+        self._log.write(f"\n----------- Generation started ----------\n")
+        self._log.write(f"Center: {reactor['center']}")
+        self._log.write(f"Reactor radius: {reactor['radius']}")
+        self._log.write(f"Reactor height: {reactor['height']}")
+        self._log.write(f"Reactor per_squarre: {meshing['square_ratio']:0.2f}")
+        self._log.write(f"Curvature ratio: {meshing['curvature_ratio']:0.2f}\n")
+        self._log.write(f"Chimney width: {chimney['width']}")
+        self._log.write(f"Chimney height: {chimney['height']}")
+        self._log.write(f"Mesh size: {meshing['size']}\n")
+
+        # The previous reactor is released with its process
+        self._stop_worker(close=True)
+
+        self._worker = GenerationWorker(datas)
+        self._worker.start()
+        self._generating = True
+
+        self._generate_button.configure(state=DISABLED)
+        self._cancel_button.configure(state=NORMAL)
+        self._status_var.set("Starting SALOME...")
+        self._progress.start()
+
+        self._poll_job = self._window.after(100, self._poll_worker)
+
+    def _poll_worker(self):
+        self._poll_job = None
+
+        # Checked first, the messages sent before the process ended are all read
+        alive = self._worker.running
+        messages = self._worker.poll(limit=500)
+
+        for kind, value in messages:
+            if kind == EVENT:
+                self._log.listener(value)
+                if value.kind == STAGE:
+                    self._status_var.set(f"{value.data['stage'].capitalize()}...")
+                elif value.kind == PROGRESS and "best" in value.data:
+                    self._status_var.set(
+                        f"Optimizing : {value.data['evaluations']} evaluations, "
+                        f"best {value.data['best']:0.4f}"
+                    )
+
+            elif kind == DONE:
+                self._log.flush()
+                self._log.write(str(value))
+                self._log.write(f"\nMesh succesfully computed !")
+                self._end_generation("Mesh computed")
+                showinfo(title="Info", message="Mesh computed !")
+
+            elif kind == EXPORTED:
+                target, filename = value
+                self._log.write(
+                    f"\n{target.capitalize()} succesfully saved to {filename} !"
+                )
+                showinfo(title="Info", message=f"{target.capitalize()} exported !")
+
+            elif kind == ERROR:
+                self._log.flush()
+                self._log.write(f"\nError : {value}")
+                if self._generating:
+                    self._end_generation("Generation failed")
+                showwarning(title="Warning", message=value)
+
+        if self._generating and not alive and len(messages) < 500:
+            self._log.write("\nThe generation stopped unexpectedly")
+            self._end_generation("Generation failed")
+            self._stop_worker()
+            return
 
-        maker.reset_output()
+        if alive or messages:
+            self._poll_job = self._window.after(100, self._poll_worker)
+
+    def _stop_worker(self, close: bool = False):
+        if self._poll_job is not None:
+            self._window.after_cancel(self._poll_job)
+            self._poll_job = None
+
+        if self._worker is not None:
+            # Joined in another thread, so that the window stays responsive while
+            # the process finishes its exports or is terminated
+            worker = self._worker
+            threading.Thread(
+                target=worker.close if close else worker.cancel, daemon=True
+            ).start()
+            self._worker = None
+
+    def _end_generation(self, status: str):
+        self._generating = False
+        self._progress.stop()
+        self._status_var.set(status)
+        self._generate_button.configure(state=NORMAL)
+        self._cancel_button.configure(state=DISABLED)
+
+    def _on_cancel(self):
+        if self._worker is None or not self._generating:
+            return
 
-        self._outputs.insert(END, f"\nMesh succesfully computed !\n")
+        self._stop_worker()
 
-        showinfo(title="Info", message="Mesh computed !")
+        self._log.flush()
+        self._log.write("\nGeneration cancelled")
+        self._end_generation("Cancelled")
 
-    def _on_export_unv(self):
-        if self._mesh is None:
-            showinfo(title="Info", message="No mesh generated")
+    def _export(self, target: str, extension: str):
+        if self._worker is None or self._generating or not self._worker.running:
+            showinfo(title="Info", message=f"No {target} generated")
             return
 
         filename = asksaveasfilename(
             title="Export As",
-            defaultextension=".unv",
+            defaultextension=extension,
         )
+        if not filename:
+            return
+
+        self._worker.export(target, filename)
+
+    def _on_export_unv(self):
+        self._export("mesh", ".unv")
+
+    def _on_export_stl(self):
+        self._export("geometry", ".stl")
 
-        if self._mesh.export_to(filename):
-            self._outputs.insert(END, f"\nMesh succesfully saved !\n")
-            showinfo(title="Info", message="File exported to unv format !")
+    def _on_close(self):
+        self._stop_worker()
+        self._window.destroy()
 
     def _on_about(self):
         showinfo(title="About", message="Reactor Maker\nv1.0.0")
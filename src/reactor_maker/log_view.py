@@ -0,0 +1,95 @@
+from collections import deque
+
+from ttkbootstrap.constants import END
+
+from .engine.events import EventQueue, STAGE
+
+
+class LogView:
+    """
+    Show the events of the engine in a text widget, drained from a queue in batches
+    on a timer of the Tk loop, keeping only the last `capacity` lines
+
+    Args:
+        widget      (ScrolledText): Widget showing the lines
+        capacity    (int):          Maximum number of lines kept
+        interval    (int):          Time between two drains, in milliseconds
+        batch       (int):          Maximum number of events drained at once
+
+    """
+
+    def __init__(
+        self, widget, capacity: int = 2000, interval: int = 100, batch: int = 500
+    ):
+        self._widget = widget
+        self._queue = EventQueue()
+        self._lines = deque(maxlen=capacity)
+        self._capacity = capacity
+        self._interval = interval
+        self._batch = batch
+        self._stage = None
+        self._job = None
+
+    @property
+    def listener(self) -> EventQueue:
+        # To subscribe to the event stream of the engine, callable from any thread
+        return self._queue
+
+    @property
+    def stage(self):
+        return self._stage
+
+    @property
+    def lines(self) -> deque:
+        return self._lines
+
+    def start(self) -> None:
+        if self._job is None:
+            self._job = self._widget.after(self._interval, self._drain)
+
+    def stop(self) -> None:
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+        self.flush()
+
+    def write(self, text: str) -> None:
+        # Lines written by the interface itself, shown in order with the events
+        self._append(text.split("\n"))
+
+    def flush(self) -> None:
+        events = self._queue.drain()
+        while events:
+            self._show(events)
+            events = self._queue.drain()
+
+    def _drain(self) -> None:
+        events = self._queue.drain(self._batch)
+        if events:
+            self._show(events)
+        self._job = self._widget.after(self._interval, self._drain)
+
+    def _show(self, events) -> None:
+        lines = []
+        for event in events:
+            if event.kind == STAGE:
+                self._stage = event.data["stage"]
+                continue
+            lines.extend(event.message.split("\n"))
+        self._append(lines)
+
+    def _append(self, lines) -> None:
+        if not lines:
+            return
+
+        # Only the lines still kept once the batch is added reach the widget
+        shown = lines[-self._capacity :]
+        self._lines.extend(shown)
+
+        self._widget.insert(END, "\n".join(shown) + "\n")
+
+        excess = int(self._widget.index("end-1c").split(".")[0]) - 1 - self._capacity
+        if excess > 0:
+            self._widget.delete("1.0", f"{excess + 1}.0")
+
+        self._widget.see(END)
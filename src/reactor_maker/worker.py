@@ -0,0 +1,133 @@
+import multiprocessing
+import queue
+from typing import Dict, List, Optional, Tuple
+
+from .config import to_parameters
+
+# Messages sent by the worker process : (kind, value)
+EVENT = "event"
+DONE = "done"
+ERROR = "error"
+EXPORTED = "exported"
+
+
+def _serve(datas: Dict, backend, messages, commands) -> None:
+    # Body of the worker process : generate the reactor, then export it on demand
+    # until the parent closes the worker, the SALOME objects never leave the process
+    from .engine import ReactorMaker
+    from .engine.events import EventStream
+
+    try:
+        backend.start()
+
+        maker = ReactorMaker(
+            backend=backend,
+            events=EventStream([lambda event: messages.put((EVENT, event))]),
+        )
+        parameters = to_parameters(datas)
+
+        geometry = maker.create_geometry(**parameters).unwrap()
+        mesh = maker.mesh(geometry, parameters["optimize"]).unwrap()
+
+        messages.put((DONE, mesh.quality))
+    except Exception as e:
+        messages.put((ERROR, str(e)))
+        return
+
+    exports = {"mesh": mesh.export_to, "geometry": geometry.export_to}
+
+    while True:
+        command = commands.get()
+        if command is None:
+            return
+
+        target, filename = command
+        try:
+            exports[target](filename)
+            messages.put((EXPORTED, (target, filename)))
+        except Exception as e:
+            messages.put((ERROR, f"Export of the {target} failed : {e}"))
+
+
+class GenerationWorker:
+    """
+    Generation of a reactor in a separate process holding its own SALOME session, so
+    that the caller stays responsive and can interrupt the run at any time
+
+    Args:
+        datas   (Dict):     Configuration of the reactor, see `load_config`
+        backend (Backend):  Backend started by the process, SALOME by default
+
+    """
+
+    def __init__(self, datas: Dict, backend=None):
+        from .engine.backend import SalomeBackend
+
+        self._datas = datas
+        self._backend = backend if backend is not None else SalomeBackend()
+
+        # SALOME doesn't survive a fork
+        context = multiprocessing.get_context("spawn")
+        self._messages = context.Queue()
+        self._commands = context.Queue()
+        self._process = context.Process(
+            target=_serve,
+            args=(self._datas, self._backend, self._messages, self._commands),
+            daemon=True,
+        )
+
+    @property
+    def datas(self) -> Dict:
+        return self._datas
+
+    @property
+    def running(self) -> bool:
+        return self._process.is_alive()
+
+    def start(self) -> None:
+        self._process.start()
+
+    def poll(self, limit: Optional[int] = None) -> List[Tuple[str, object]]:
+        """
+        Messages sent by the process since the last poll, without blocking
+
+        Returns:
+            List[Tuple[str, object]]: (EVENT, Event), (DONE, MeshQuality),
+                                      (ERROR, str) or (EXPORTED, (target, filename))
+
+        """
+        messages = []
+        while limit is None or len(messages) < limit:
+            try:
+                messages.append(self._messages.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    def export(self, target: str, filename: str) -> None:
+        """
+        Ask the process to export the "mesh" or the "geometry", an EXPORTED message
+        is sent once the file is written
+        """
+        if not self.running:
+            raise RuntimeError("The worker has been stopped")
+        self._commands.put((target, filename))
+
+    def cancel(self) -> None:
+        """
+        Stop the process immediately, interrupting the computation in progress
+        """
+        if self._process.pid is None:
+            return
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+
+    def close(self, timeout: float = 5) -> None:
+        """
+        Let the process finish the pending exports and exit
+        """
+        if self._process.is_alive():
+            self._commands.put(None)
+            self._process.join(timeout)
+        self.cancel()
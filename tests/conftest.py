@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from reactor_maker.config import load_config, to_parameters
+from reactor_maker.engine.backend import get_backend
+from reactor_maker.engine.events import EventStream
+
+EXAMPLE = Path(__file__).parent.parent.joinpath("datas", "example.yaml")
+
+
+@pytest.fixture(scope="session")
+def backend():
+    backend = get_backend("standin")
+    backend.start()
+    return backend
+
+
+@pytest.fixture
+def datas():
+    return load_config(str(EXAMPLE))
+
+
+@pytest.fixture
+def parameters(datas):
+    return to_parameters(datas)
+
+
+@pytest.fixture
+def make_maker(backend):
+    from reactor_maker.engine import ReactorMaker
+
+    def make_maker(**kwargs):
+        kwargs.setdefault("warm_start", False)
+        return ReactorMaker(backend=backend, events=EventStream([]), **kwargs)
+
+    return make_maker
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import EDGE, HEXAHEDRON, QUADRANGLE, MeshArrays
+
+# Nodes numbered with gaps, and quadrangles split in two runs by an edge
+DAT = """\
+6 4
+10 0 0 0
+20 1 0 0
+30 1 1 0
+40 0 1 0
+50 2 0 0
+60 2 1 0
+1 204 10 20 30 40
+2 102 20 30
+3 204 20 50 60 30
+4 204 30 60 50 20
+"""
+
+
+def _write(tmp_path, content):
+    filename = str(tmp_path.joinpath("mesh.dat"))
+    with open(filename, "w") as f:
+        f.write(content)
+    return filename
+
+
+def test_dat_nodes_keep_their_ids(tmp_path):
+    arrays = MeshArrays.from_dat(_write(tmp_path, DAT))
+
+    assert list(arrays.node_ids) == [10, 20, 30, 40, 50, 60]
+    assert arrays.nodes[4] == pytest.approx([2, 0, 0])
+    assert arrays.nodes.flags["C_CONTIGUOUS"]
+
+
+def test_dat_elements_are_rows_of_the_nodes(tmp_path):
+    arrays = MeshArrays.from_dat(_write(tmp_path, DAT))
+
+    assert arrays.codes == [EDGE, QUADRANGLE]
+    assert list(arrays.element_ids(QUADRANGLE)) == [1, 3, 4]
+    assert arrays.connectivity(QUADRANGLE).tolist() == [
+        [0, 1, 2, 3],
+        [1, 4, 5, 2],
+        [2, 5, 4, 1],
+    ]
+    assert arrays.connectivity(EDGE).tolist() == [[1, 2]]
+    assert arrays.connectivity(HEXAHEDRON).shape == (0, 8)
+
+
+def test_empty_dat_has_no_elements(tmp_path):
+    arrays = MeshArrays.from_dat(_write(tmp_path, "0 0\n"))
+
+    assert arrays.nodes.shape == (0, 3)
+    assert arrays.codes == []
+
+
+def test_truncated_dat_is_rejected(tmp_path):
+    # Quadrangle missing its last node
+    nodes = "".join(DAT.splitlines(keepends=True)[:7])
+
+    with pytest.raises(ValueError, match="Malformed"):
+        MeshArrays.from_dat(_write(tmp_path, nodes + "1 204 10 20 30\n"))
+
+
+def test_mesh_arrays_match_the_mesh(make_maker, parameters):
+    maker = make_maker()
+    mesh = maker.mesh(maker.create_geometry(**parameters).unwrap(), False).unwrap()
+    standin = mesh.mesh
+
+    arrays = MeshArrays.from_mesh(standin)
+
+    # The stand-in holds the arrays it exports
+    expected = standin._arrays
+    assert np.array_equal(arrays.node_ids, expected.node_ids)
+    assert np.allclose(arrays.nodes, expected.nodes)
+    assert arrays.codes == expected.codes
+    for code in arrays.codes:
+        assert np.array_equal(arrays.element_ids(code), expected.element_ids(code))
+        assert np.array_equal(arrays.connectivity(code), expected.connectivity(code))
+    assert {name: list(ids) for name, ids in arrays.groups.items()} == {
+        group.GetName(): list(group.GetIDs()) for group in standin.GetGroups()
+    }
+    assert len(arrays.element_ids(QUADRANGLE)) == standin.NbFaces()
+    assert len(arrays.element_ids(HEXAHEDRON)) == standin.NbVolumes()
+
+
+@pytest.mark.parametrize("compressed", [True, False])
+def test_saved_arrays_are_loaded_back(tmp_path, compressed):
+    arrays = MeshArrays.from_dat(_write(tmp_path, DAT))
+    arrays.groups["Inlet"] = np.array([1, 3])
+    filename = str(tmp_path.joinpath("mesh.npz"))
+
+    arrays.save(filename, compressed)
+    loaded = MeshArrays.load(filename)
+
+    assert np.array_equal(loaded.nodes, arrays.nodes)
+    assert loaded.codes == arrays.codes
+    assert np.array_equal(
+        loaded.group_connectivity("Inlet"), arrays.connectivity(QUADRANGLE)[:2]
+    )
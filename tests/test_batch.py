@@ -0,0 +1,31 @@
+import copy
+import json
+
+import pytest
+
+from reactor_maker.batch import run_batch
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE
+from reactor_maker.engine.unv import read_unv
+
+
+@pytest.mark.parametrize("queue_size", [None, 1])
+def test_batch_exports_every_job(backend, datas, tmp_path, queue_size):
+    taller = copy.deepcopy(datas)
+    taller["reactor"]["height"] = 120
+
+    rows = run_batch([datas, taller], tmp_path, backend=backend, queue_size=queue_size)
+
+    assert [row["status"] for row in rows] == ["ok", "ok"]
+    for row in rows:
+        job_dir = tmp_path.joinpath(f"job_{row['job']:04d}")
+        assert job_dir.joinpath("geometry.stl").stat().st_size > 0
+        arrays = read_unv(str(job_dir.joinpath("mesh.unv")))
+        assert row["elements"] == len(arrays.element_ids(QUADRANGLE)) + len(
+            arrays.element_ids(HEXAHEDRON)
+        )
+        assert row["max_ar"] >= row["min_ar"] >= 1
+
+    if queue_size is not None:
+        stages = json.loads(tmp_path.joinpath("pipeline.json").read_text())["stages"]
+        items = {stage["name"]: stage["items"] for stage in stages}
+        assert items == {"geometry": 2, "mesh": 2, "export_stl": 2, "export_unv": 2}
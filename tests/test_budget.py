@@ -0,0 +1,131 @@
+from math import ceil
+
+import pytest
+
+from reactor_maker.engine.budget import (
+    MAX_EVALUATIONS,
+    OptimizationBudget,
+    STALLED,
+    TARGET_REACHED,
+    TIME_LIMIT,
+)
+from reactor_maker.engine.warmstart import ShapeFeatures
+
+
+def test_budget_stops_on_the_number_of_evaluations():
+    budget = OptimizationBudget(max_evaluations=3)
+
+    assert budget.update(2, 1.5) is None
+    assert budget.update(1, 1.4) == MAX_EVALUATIONS
+    assert budget.evaluations == 3
+
+
+def test_budget_stops_once_the_target_is_reached():
+    budget = OptimizationBudget(max_evaluations=1, target_aspect_ratio=1.2)
+
+    assert budget.update(1, 1.1) == TARGET_REACHED
+
+
+def test_budget_stops_without_improvement():
+    budget = OptimizationBudget(stall=3, stall_tolerance=0.01)
+
+    assert budget.update(1, 1.5) is None
+    assert budget.update(2, 1.495) is None
+    assert budget.update(1, 1.5) == STALLED
+
+
+def test_budget_stops_on_the_time_limit():
+    budget = OptimizationBudget(time_limit=1e-9)
+
+    assert budget.update(1, 1.5) == TIME_LIMIT
+
+
+def test_coarse_evaluations_dont_reach_the_target():
+    budget = OptimizationBudget(max_evaluations=2, target_aspect_ratio=1.2)
+
+    assert budget.spend(1) is None
+    assert budget.spend(1) == MAX_EVALUATIONS
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"max_evaluations": 0},
+        {"time_limit": 0},
+        {"target_aspect_ratio": 0.5},
+        {"stall": 0},
+    ],
+)
+def test_budget_rejects_invalid_limits(arguments):
+    with pytest.raises(ValueError):
+        OptimizationBudget(**arguments)
+
+
+def _dimensions(parameters):
+    chimney_dim = parameters["chimney_dim"]
+    mesh_size = chimney_dim.x / ceil(chimney_dim.x / parameters["mesh_size"])
+    return parameters["center"], parameters["reactor_dim"], chimney_dim, mesh_size
+
+
+def test_engine_stops_on_the_budget(make_maker, parameters):
+    maker = make_maker()
+
+    _, reason = maker._optimize_geom_mesh(
+        *_dimensions(parameters), budget=OptimizationBudget(max_evaluations=2)
+    )
+
+    assert reason == MAX_EVALUATIONS
+
+
+def test_engine_records_the_target_size_after_a_coarse_stop(
+    make_maker, parameters, tmp_path
+):
+    center, reactor_dim, chimney_dim, mesh_size = _dimensions(parameters)
+    maker = make_maker(cache_dir=str(tmp_path), warm_start=True)
+
+    found, reason = maker._optimize_geom_mesh(
+        center,
+        reactor_dim,
+        chimney_dim,
+        mesh_size,
+        budget=OptimizationBudget(max_evaluations=2),
+        fidelities=(3, 1),
+    )
+
+    assert reason == MAX_EVALUATIONS
+    outcome = maker.warm_start_store.exact(
+        ShapeFeatures.of(reactor_dim.x, chimney_dim.x, mesh_size)
+    )
+    assert outcome.parameters == pytest.approx(found)
+    assert outcome.max_aspect_ratio == pytest.approx(
+        maker._evaluate_base(center, reactor_dim, chimney_dim, mesh_size, found) + 1
+    )
+
+
+def test_engine_stops_once_the_target_is_reached(make_maker, parameters):
+    maker = make_maker()
+    budget = OptimizationBudget(target_aspect_ratio=1000)
+
+    found, reason = maker._optimize_geom_mesh(*_dimensions(parameters), budget=budget)
+
+    # The first batch is the starting point and its stencil
+    assert reason == TARGET_REACHED
+    assert budget.evaluations == 3
+    assert maker._evaluate_base(*_dimensions(parameters), found) + 1 <= 1000
+
+
+@pytest.mark.parametrize(
+    "budget, expected",
+    [
+        (OptimizationBudget(stall=1), STALLED),
+        (OptimizationBudget(time_limit=1e-9), TIME_LIMIT),
+    ],
+)
+def test_engine_stops_on_the_other_limits(make_maker, parameters, budget, expected):
+    maker = make_maker()
+
+    _, reason = maker._optimize_geom_mesh(*_dimensions(parameters), budget=budget)
+    # The budget is started again by every optimization
+    _, again = maker._optimize_geom_mesh(*_dimensions(parameters), budget=budget)
+
+    assert reason == again == expected
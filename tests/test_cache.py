@@ -0,0 +1,193 @@
+import json
+import multiprocessing
+import os
+import time
+from math import ceil
+
+import pytest
+
+from reactor_maker.engine.cache import ArtifactCache, LRUCache
+from reactor_maker.engine.strategies import GRADIENT_STEP
+
+
+def _writer(content: bytes, metadata=None):
+    def writer(entry):
+        entry.joinpath("data.bin").write_bytes(content)
+        return {} if metadata is None else metadata
+
+    return writer
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def _dimensions(parameters):
+    chimney_dim = parameters["chimney_dim"]
+    mesh_size = chimney_dim.x / ceil(chimney_dim.x / parameters["mesh_size"])
+    return parameters["center"], parameters["reactor_dim"], chimney_dim, mesh_size
+
+
+def test_evaluation_key_merges_the_points_of_a_line_search(make_maker, parameters):
+    maker = make_maker()
+    dimensions = _dimensions(parameters)
+
+    def key(x):
+        return maker._evaluation_key(*dimensions, x)
+
+    assert key([0.81, 0.2]) == key([0.81 + 1e-9, 0.2 - 1e-9])
+    assert key([0.81, 0.2]) != key([0.81 + GRADIENT_STEP, 0.2])
+    assert key([0.81, 0.2]) != key([0.81, 0.2 + GRADIENT_STEP])
+
+
+def test_repeated_optimization_is_served_by_the_cache(make_maker, parameters):
+    maker = make_maker()
+    evaluations = maker._evaluations
+
+    found, _ = maker._optimize_geom_mesh(*_dimensions(parameters))
+    hits, misses = evaluations.hits, evaluations.misses
+    again, _ = maker._optimize_geom_mesh(*_dimensions(parameters))
+
+    assert misses > 0
+    assert evaluations.misses == misses
+    assert evaluations.hits - hits == hits + misses
+    assert again == found
+
+
+def test_key_depends_on_kind_and_normalized_parameters(tmp_path):
+    cache = ArtifactCache(tmp_path)
+
+    assert cache.key("geometry", {"r": 1}) == cache.key("geometry", {"r": 1.0})
+    assert cache.key("geometry", {"r": 1}) != cache.key("mesh", {"r": 1})
+    assert cache.key("geometry", {"r": 1}) != cache.key("geometry", {"r": 2})
+
+
+def test_miss_then_hit(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    key = cache.key("geometry", {"r": 1})
+
+    assert cache.load(key) is None
+
+    cache.store(key, _writer(b"abc", {"groups": [1, 2]}))
+    entry, metadata = cache.load(key)
+
+    assert metadata == {"groups": [1, 2]}
+    assert entry.joinpath("data.bin").read_bytes() == b"abc"
+    assert cache.read(
+        key, lambda entry, _: entry.joinpath("data.bin").read_bytes()
+    ) == (b"abc")
+
+
+def test_store_keeps_the_existing_entry(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    cache.store("key", _writer(b"first"))
+    cache.store("key", _writer(b"second"))
+
+    entry, _ = cache.load("key")
+    assert entry.joinpath("data.bin").read_bytes() == b"first"
+    assert [
+        path.name for path in tmp_path.iterdir() if path.name.startswith(".tmp")
+    ] == []
+
+
+def test_failed_writer_leaves_no_entry(tmp_path):
+    cache = ArtifactCache(tmp_path)
+
+    def writer(entry):
+        raise RuntimeError("export failed")
+
+    with pytest.raises(RuntimeError):
+        cache.store("key", writer)
+
+    assert cache.load("key") is None
+    assert [path for path in tmp_path.iterdir() if path.is_dir()] == []
+
+
+def test_vanished_entry_is_a_miss(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    cache.store("key", _writer(b"abc"))
+    os.remove(tmp_path.joinpath("key", "meta.json"))
+
+    assert cache.load("key") is None
+    assert cache.read("key", lambda entry, metadata: metadata) is None
+
+
+def test_eviction_removes_the_least_recently_used_entries(tmp_path):
+    cache = ArtifactCache(tmp_path, max_size=2500)
+
+    for key in ("a", "b"):
+        cache.store(key, _writer(b"x" * 1000))
+        time.sleep(0.01)
+
+    # Reading an entry makes it the most recently used one
+    cache.load("a")
+    time.sleep(0.01)
+    cache.store("c", _writer(b"x" * 1000))
+
+    assert cache.load("b") is None
+    assert cache.load("a") is not None
+    assert cache.load("c") is not None
+    assert cache.size() <= 2500
+
+
+def _store_many(directory, key, index, queue):
+    try:
+        cache = ArtifactCache(directory, max_size=4000)
+        for i in range(20):
+            cache.store(f"{key}-{i % 5}", _writer(bytes([index]) * 1000))
+            cache.load(f"{key}-{(i + 1) % 5}")
+        queue.put(None)
+    except Exception as e:
+        queue.put(repr(e))
+
+
+def test_concurrent_processes_share_the_cache(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=_store_many, args=(tmp_path, "key", i, queue))
+        for i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    errors = [queue.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert errors == [None] * len(processes)
+    for entry in tmp_path.iterdir():
+        if entry.is_dir():
+            with open(entry.joinpath("meta.json")) as f:
+                assert json.load(f) == {}
+
+
+def _spans(report):
+    names = []
+    stack = list(report.to_dict()["spans"])
+    while stack:
+        span = stack.pop()
+        names.append(span["name"])
+        stack.extend(span["children"])
+    return names
+
+
+def test_engine_reloads_the_mesh_from_the_cache(make_maker, parameters, tmp_path):
+    first = make_maker(cache_dir=str(tmp_path))
+    mesh = first.mesh(first.create_geometry(**parameters).unwrap(), False).unwrap()
+
+    second = make_maker(cache_dir=str(tmp_path))
+    geometry = second.create_geometry(**parameters).unwrap()
+    cached = second.mesh(geometry, False).unwrap()
+
+    assert "load_cache" in _spans(second.report)
+    assert "compute" not in _spans(second.report)
+    assert cached.quality.nb_elements == mesh.quality.nb_elements
+    assert cached.quality.max == pytest.approx(mesh.quality.max)
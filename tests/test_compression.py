@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON
+from reactor_maker.engine.compression import (
+    open_stream,
+    stream_export,
+    with_compression,
+)
+from reactor_maker.engine.unv import read_unv
+
+CONTENT = "".join(f"{i:10d}{i * 0.5:25.16E}\n" for i in range(20000))
+
+
+def _writer(path):
+    with open(path, "w") as f:
+        f.write(CONTENT)
+
+
+def _read(filename):
+    with open_stream(filename, "r") as f:
+        return f.read()
+
+
+def test_with_compression_adds_the_suffix():
+    assert with_compression("mesh.unv", None) == "mesh.unv"
+    assert with_compression("mesh.unv", "xz") == "mesh.unv.xz"
+    with pytest.raises(ValueError):
+        with_compression("mesh.unv", "zip")
+
+
+@pytest.mark.parametrize("pipe", [True, False])
+@pytest.mark.parametrize("suffix", [".unv", ".unv.gz", ".unv.xz"])
+def test_export_is_compressed(tmp_path, suffix, pipe):
+    filename = str(tmp_path.joinpath("mesh" + suffix))
+
+    stream_export(_writer, filename, pipe=pipe)
+
+    assert _read(filename) == CONTENT
+    assert os.listdir(tmp_path) == ["mesh" + suffix]
+
+
+def test_export_replacing_its_file_is_compressed(tmp_path):
+    def writer(path):
+        _writer(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    filename = str(tmp_path.joinpath("mesh.unv.gz"))
+    stream_export(writer, filename, timeout=5)
+
+    assert _read(filename) == CONTENT
+
+
+def test_failing_export_leaves_no_file(tmp_path):
+    def writer(path):
+        with open(path, "w") as f:
+            f.write(CONTENT[:1000])
+        raise RuntimeError("export failed")
+
+    filename = str(tmp_path.joinpath("mesh.unv.gz"))
+    with pytest.raises(RuntimeError, match="export failed"):
+        stream_export(writer, filename, timeout=5)
+
+    assert not os.path.exists(filename)
+
+
+def test_seeking_export_fails(tmp_path):
+    def writer(path):
+        with open(path, "w") as f:
+            f.write(CONTENT[:1000])
+            f.seek(0)
+
+    filename = str(tmp_path.joinpath("mesh.unv.gz"))
+    with pytest.raises(OSError):
+        stream_export(writer, filename, timeout=5)
+
+    assert not os.path.exists(filename)
+
+
+def test_failing_compression_doesnt_block_the_export(tmp_path):
+    filename = str(tmp_path.joinpath("missing", "mesh.unv.gz"))
+
+    with pytest.raises(FileNotFoundError):
+        stream_export(_writer, filename, timeout=5)
+
+
+def test_export_holding_the_pipe_times_out(tmp_path):
+    leaked = []
+
+    def writer(path):
+        leaked.append(open(path, "w"))
+        leaked[0].write(CONTENT[:1000])
+
+    filename = str(tmp_path.joinpath("mesh.unv.gz"))
+    try:
+        with pytest.raises(TimeoutError):
+            stream_export(writer, filename, timeout=0.2)
+    finally:
+        leaked[0].close()
+
+    assert not os.path.exists(filename)
+
+
+def test_mesh_round_trip_through_a_compressed_file(make_maker, parameters, tmp_path):
+    maker = make_maker()
+    mesh = maker.mesh(maker.create_geometry(**parameters).unwrap(), False).unwrap()
+    filename = str(tmp_path.joinpath("mesh.unv.xz"))
+
+    mesh.export_to(filename)
+
+    arrays, read = mesh.to_arrays(), read_unv(filename)
+    assert np.allclose(read.nodes, arrays.nodes)
+    assert np.array_equal(
+        read.connectivity(HEXAHEDRON), arrays.connectivity(HEXAHEDRON)
+    )
+    assert read.groups.keys() == arrays.groups.keys()
+
+
+def test_compressed_mesh_is_imported_into_the_cache(make_maker, parameters, tmp_path):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+    filename = str(tmp_path.joinpath("mesh.unv.gz"))
+    maker.mesh(geometry, False).unwrap().export_to(filename)
+
+    cached_maker = make_maker(cache_dir=str(tmp_path.joinpath("cache")))
+    geometry = cached_maker.create_geometry(**parameters).unwrap()
+    imported = cached_maker.import_mesh(geometry, filename, False).unwrap()
+    loaded = cached_maker.mesh(geometry, False).unwrap()
+
+    last = loaded.report.to_dict()["spans"][-1]
+    assert last["name"] == "mesh"
+    assert [span["name"] for span in last["children"]] == ["load_cache"]
+    assert loaded.mesh is None
+    assert np.array_equal(loaded.to_arrays().nodes, imported.to_arrays().nodes)
+    assert loaded.quality.nb_elements == imported.quality.nb_elements
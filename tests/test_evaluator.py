@@ -0,0 +1,46 @@
+from math import ceil
+
+import pytest
+
+from reactor_maker.engine.evaluator import (
+    ParallelEvaluator,
+    SerialEvaluator,
+    make_evaluator,
+)
+
+POINTS = [[0.8, 0.2], [0.6, 0.4], [0.9, 0.1], [0.7, 0.3]]
+
+
+def _problem(parameters):
+    chimney_dim = parameters["chimney_dim"]
+    mesh_size = chimney_dim.x / ceil(chimney_dim.x / parameters["mesh_size"])
+    return parameters["center"], parameters["reactor_dim"], chimney_dim, mesh_size
+
+
+def test_make_evaluator_uses_processes_for_several_workers(make_maker, parameters):
+    maker = make_maker()
+
+    with make_evaluator(maker, 1, _problem(parameters)) as evaluator:
+        assert isinstance(evaluator, SerialEvaluator)
+    with make_evaluator(maker, 2, _problem(parameters)) as evaluator:
+        assert isinstance(evaluator, ParallelEvaluator)
+
+
+def test_workers_evaluate_like_the_session(make_maker, parameters, backend):
+    problem = _problem(parameters)
+    serial = SerialEvaluator(make_maker(), problem)
+
+    with ParallelEvaluator(2, problem, backend) as parallel:
+        values = parallel.map(POINTS)
+        coarse = parallel.map(POINTS[:2], 2 * problem[3])
+
+    assert values == pytest.approx(serial.map(POINTS))
+    assert coarse == pytest.approx(serial.map(POINTS[:2], 2 * problem[3]))
+    assert coarse != pytest.approx(values[:2])
+
+
+def test_parallel_optimization_finds_the_serial_result(make_maker, parameters):
+    found, _ = make_maker()._optimize_geom_mesh(*_problem(parameters))
+    parallel, _ = make_maker()._optimize_geom_mesh(*_problem(parameters), workers=2)
+
+    assert parallel == pytest.approx(found)
@@ -0,0 +1,90 @@
+import pickle
+import threading
+
+from reactor_maker.engine.events import (
+    LOG,
+    PROGRESS,
+    STAGE,
+    EventQueue,
+    EventStream,
+    print_event,
+)
+
+
+def test_events_reach_every_listener():
+    first, second = [], []
+    events = EventStream([first.append])
+    events.subscribe(second.append)
+
+    events.stage("mesh")
+    events.log("Meshing...")
+    events.progress("0.5", best=0.5, evaluations=3)
+    events.unsubscribe(second.append)
+    events.log("Done")
+
+    assert [(event.kind, event.message) for event in first] == [
+        (STAGE, ""),
+        (LOG, "Meshing..."),
+        (PROGRESS, "0.5"),
+        (LOG, "Done"),
+    ]
+    assert first[0].data == {"stage": "mesh"}
+    assert first[2].data == {"best": 0.5, "evaluations": 3}
+    assert len(second) == 3
+
+
+def test_stream_prints_without_listener(capsys):
+    events = EventStream()
+
+    events.stage("mesh")
+    events.log("Meshing...")
+
+    assert capsys.readouterr().out == "Meshing...\n"
+    assert events.listeners == [print_event]
+
+
+def test_stream_sent_to_a_worker_prints():
+    events = EventStream([[].append])
+
+    assert pickle.loads(pickle.dumps(events)).listeners == [print_event]
+
+
+def test_queue_drops_the_oldest_events():
+    pending = EventQueue(maxsize=3)
+    events = EventStream([pending])
+
+    for i in range(5):
+        events.log(str(i))
+
+    assert pending.dropped == 2
+    assert [event.message for event in pending.drain(limit=2)] == ["2", "3"]
+    assert [event.message for event in pending.drain()] == ["4"]
+    assert pending.drain() == []
+
+
+def test_queue_collects_the_events_of_several_threads():
+    pending = EventQueue()
+    events = EventStream([pending])
+
+    threads = [
+        threading.Thread(target=lambda: [events.log("x") for _ in range(100)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pending.drain()) == 400 and pending.dropped == 0
+
+
+def test_engine_streams_its_stages(make_maker, parameters):
+    received = []
+    maker = make_maker()
+    maker.events.subscribe(received.append)
+
+    maker.mesh(maker.create_geometry(**parameters).unwrap(), False)
+
+    stages = [event.data["stage"] for event in received if event.kind == STAGE]
+    assert stages == ["geometry", "mesh", "compute"]
+    assert all(event.kind in (LOG, STAGE) for event in received)
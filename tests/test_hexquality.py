@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE, MeshArrays
+from reactor_maker.engine.hexquality import HexQuality
+
+# Unit cube, the bottom face turning counterclockwise seen from +Z
+CUBE = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 1, 1],
+    ],
+    dtype=np.float64,
+)
+SMDS = [0, 3, 2, 1, 4, 7, 6, 5]
+
+
+def _mesh(nodes, hexas, groups=None) -> MeshArrays:
+    hexas = np.asarray(hexas)
+    elements = {HEXAHEDRON: (np.arange(1, len(hexas) + 1), hexas)}
+    if groups:
+        faces = np.concatenate(list(groups.values()))
+        elements[QUADRANGLE] = (np.arange(101, 101 + len(faces)), faces)
+        ids = np.cumsum([0] + [len(faces) for faces in groups.values()]) + 101
+        groups = {
+            name: np.arange(start, stop)
+            for name, start, stop in zip(groups, ids[:-1], ids[1:])
+        }
+    return MeshArrays(np.arange(1, len(nodes) + 1), nodes, elements, groups)
+
+
+def test_unit_cube_is_perfect():
+    quality = HexQuality.from_arrays(_mesh(CUBE, [SMDS]))
+
+    assert quality.nb_elements == 1
+    assert (quality.negative_jacobians, quality.degenerate) == (0, 0)
+    assert quality.values("scaled_jacobian") == pytest.approx([1.0])
+    assert quality.values("skewness") == pytest.approx([0.0], abs=1e-12)
+    assert quality.values("warpage") == pytest.approx([0.0], abs=1e-6)
+    assert quality.values("volume_ratio") == pytest.approx([1.0])
+
+
+def test_inverted_cube_has_a_negative_jacobian():
+    # The direct order is the inverted one for the SMDS order of the arrays
+    quality = HexQuality.from_arrays(_mesh(CUBE, [list(range(8))]))
+
+    assert (quality.negative_jacobians, quality.degenerate) == (1, 0)
+    assert quality.values("scaled_jacobian") == pytest.approx([-1.0])
+
+
+def test_flat_cube_is_degenerate():
+    flat = CUBE.copy()
+    flat[4:, 2] = 0
+
+    quality = HexQuality.from_arrays(_mesh(flat, [SMDS]))
+
+    assert (quality.negative_jacobians, quality.degenerate) == (0, 1)
+    assert "Degenerate hexahedra: 1" in quality.report()
+
+
+def test_neighbours_compare_their_volumes_and_faces():
+    # A cube under a box twice as tall
+    nodes = np.concatenate([CUBE, CUBE[4:] + [0, 0, 2]])
+    hexas = [SMDS, [4, 7, 6, 5, 8, 11, 10, 9]]
+
+    quality = HexQuality.from_arrays(
+        _mesh(nodes, hexas, {"Inlet": np.array([[0, 3, 2, 1]])})
+    )
+
+    assert quality.negative_jacobians == 0
+    assert quality.values("volume_ratio") == pytest.approx([2.0, 2.0])
+    assert quality.values("non_orthogonality") == pytest.approx([0.0, 0.0], abs=1e-6)
+    assert list(quality.groups["Inlet"]) == [0]
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget of `import reactor_maker.cli`, measured around 70 ms with the standard
+# library only : SALOME, NumPy or SciPy would each take several times more
+IMPORT_BUDGET = 0.25
+
+SRC = Path(__file__).parent.parent.joinpath("src")
+
+HEAVY = ("numpy", "scipy", "salome", "salome_notebook", "GEOM", "SMESH")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(SRC)] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative(stderr: str, module: str) -> float:
+    # Lines of -X importtime : "import time: self [us] | cumulative | package"
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    raise AssertionError(f"{module} not found in the import times")
+
+
+def test_cli_import_is_within_budget():
+    # Best of a few runs, the first one paying for cold caches
+    times = [
+        _cumulative(_run("import reactor_maker.cli").stderr, "reactor_maker.cli")
+        for _ in range(3)
+    ]
+    assert min(times) < IMPORT_BUDGET
+
+
+def test_cli_import_loads_no_heavy_module():
+    result = _run(
+        "import sys, reactor_maker.cli, reactor_maker.vector\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY!r}))"
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.index import SubShapeIndex
+from reactor_maker.engine.standin import Shape, _circle_points, _distance, _segment
+from reactor_maker.vector import vector3
+
+
+def _points(parameters, nb_points=50):
+    # Points around the reactor and its chimney, inside and outside
+    rng = np.random.default_rng(0)
+    radius, height = parameters["reactor_dim"].x, parameters["reactor_dim"].y
+    top = height + parameters["chimney_dim"].y
+    return rng.uniform([-radius, -radius, 0], [radius, radius, top], (nb_points, 3))
+
+
+def test_nearest_edge_is_the_one_of_geom(make_maker, parameters):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+    geompy, shape, index = maker._geompy, geometry.geometry, geometry.index
+
+    for point in _points(parameters):
+        # The stand-in sets the edges of the partitions on top of each other, the
+        # same edge can be found under two objects
+        edge = geompy.GetEdgeNearPoint(shape, geompy.MakeVertex(*point))
+        found, distance = index.nearest_edge(vector3(*point))
+
+        assert distance == pytest.approx(_distance(edge.points, point))
+        assert _distance(index.edges[found].points, point) == pytest.approx(distance)
+
+
+def test_nearest_face_is_the_one_of_geom(make_maker, parameters):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+    geompy, shape, index = maker._geompy, geometry.geometry, geometry.index
+
+    for point in _points(parameters):
+        face = geompy.GetFaceNearPoint(shape, geompy.MakeVertex(*point))
+        assert np.allclose(index.face_near_point(vector3(*point)).centre, face.centre)
+
+
+def test_edge_lengths_are_the_ones_of_geom(make_maker, parameters):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+
+    assert geometry.index.edge_lengths == pytest.approx(
+        [maker._geompy.BasicProperties(edge)[0] for edge in geometry.index.edges]
+    )
+
+
+@pytest.mark.parametrize("reversed_arc", [False, True])
+def test_arc_keeps_its_length_whatever_its_orientation(backend, reversed_arc):
+    # Quarter of the unit circle from (1, 0) to (0, 1), described like GEOM does by
+    # the normal of its curve, the edge going the other way when reversed
+    center, normal = np.zeros(3), np.array([0.0, 0.0, 1.0])
+    start, end = np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])
+    if reversed_arc:
+        start, end = end, start
+    points = _circle_points(
+        center, normal * (-1 if reversed_arc else 1), start, np.pi / 2
+    )
+    arc = Shape(
+        "EDGE",
+        points=points,
+        description=[2, *center, *normal, 1.0, *start, *end],
+    )
+    far = _segment([5.0, -5.0, 0.0], [5.0, 5.0, 0.0])
+
+    index = SubShapeIndex(backend.geom_builder(), Shape("COMPOUND", edges=[arc, far]))
+
+    assert index.edge_lengths[list(map(id, index.edges)).index(id(arc))] == (
+        pytest.approx(np.pi / 2, rel=1e-3)
+    )
+    # A point on the other side of the circle is at sqrt(2) - 1 of the arc going
+    # the wrong way round, at sqrt(5) of its ends otherwise
+    nearest, distance = index.nearest_edge(vector3(-1.0, -1.0, 0.0))
+    assert index.edges[nearest] is arc
+    assert distance == pytest.approx(np.sqrt(5), rel=1e-3)
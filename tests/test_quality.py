@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE, MeshArrays
+from reactor_maker.engine.quality import (
+    MeshQuality,
+    hexahedron_aspect_ratio,
+    quadrangle_aspect_ratio,
+    tetrahedron_aspect_ratio,
+    triangle_aspect_ratio,
+)
+
+SQUARE = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float64)
+CUBE = np.concatenate([SQUARE, SQUARE + [0, 0, 1]])
+SMDS = [0, 3, 2, 1, 4, 7, 6, 5]
+
+
+def test_equilateral_triangle_is_one():
+    triangle = np.array([[0, 0, 0], [1, 0, 0], [0.5, np.sqrt(3) / 2, 0]])
+
+    assert triangle_aspect_ratio(triangle[None]) == pytest.approx([1.0])
+
+
+def test_right_triangle():
+    # sqrt(3) / 6 * sqrt(2) * (2 + sqrt(2)) / 2 / (1 / 2)
+    expected = np.sqrt(3) / 6 * np.sqrt(2) * (2 + np.sqrt(2))
+
+    assert triangle_aspect_ratio(SQUARE[None, :3]) == pytest.approx([expected])
+
+
+def test_unit_square_is_one():
+    assert quadrangle_aspect_ratio(SQUARE[None]) == pytest.approx([1.0])
+
+
+def test_stretched_quadrangle():
+    # sqrt(1 / 32) * sqrt(5) * sqrt(10) / 1
+    rectangle = SQUARE * [2, 1, 0]
+
+    assert quadrangle_aspect_ratio(rectangle[None]) == pytest.approx([1.25])
+
+
+def test_degenerate_quadrangle_is_infinite():
+    flat = SQUARE * [1, 0, 0]
+
+    assert quadrangle_aspect_ratio(flat[None])[0] >= 1e100
+
+
+def test_regular_tetrahedron_is_one():
+    tetrahedron = np.array(
+        [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]], dtype=np.float64
+    )
+
+    assert tetrahedron_aspect_ratio(tetrahedron[None]) == pytest.approx([1.0])
+
+
+def test_cube_is_one_in_both_orientations():
+    cubes = np.stack([CUBE[SMDS], CUBE])
+
+    assert hexahedron_aspect_ratio(cubes) == pytest.approx([1.0, 1.0])
+
+
+def test_stretched_hexahedron():
+    ratios = hexahedron_aspect_ratio(np.stack([CUBE * [1, 1, 2], CUBE * [1, 1, 4]]))
+
+    assert 1 < ratios[0] < ratios[1]
+
+
+def test_report_counts_faces_and_volumes():
+    arrays = MeshArrays(
+        np.arange(1, 9),
+        CUBE,
+        {
+            HEXAHEDRON: (np.array([1]), np.array([SMDS])),
+            QUADRANGLE: (np.array([2]), np.array([[0, 3, 2, 1]])),
+        },
+    )
+
+    quality = MeshQuality.from_arrays(arrays)
+
+    assert quality.nb_elements == 2
+    assert (quality.faces.nb_elements, quality.volumes.nb_elements) == (1, 1)
+    assert (quality.min, quality.max) == pytest.approx((1.0, 1.0))
+    assert "Volumes: 1 elements" in quality.report()
+
+
+def test_sampled_quality_of_the_mesh(make_maker, parameters, backend):
+    maker = make_maker()
+    mesh = maker.mesh(maker.create_geometry(**parameters).unwrap(), False).unwrap()
+
+    full = MeshQuality.from_arrays(mesh.to_arrays())
+    sampled = MeshQuality.from_mesh(mesh.mesh, sample=50, backend=backend)
+
+    assert sampled.nb_elements == full.nb_elements
+    assert sampled.volumes.nb_elements == len(mesh.to_arrays().connectivity(HEXAHEDRON))
+    assert (sampled.min, sampled.max) == pytest.approx((full.min, full.max))
+    assert sampled.sampled and 0 < len(sampled.volumes._values) <= 50
+    # The same elements are picked on every call
+    again = MeshQuality.from_mesh(mesh.mesh, sample=50, backend=backend)
+    assert again.mean == sampled.mean
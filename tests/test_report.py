@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from reactor_maker.engine.report import RunReport, traced
+
+
+def _tree(spans):
+    return [(span.name, _tree(span.children)) for span in spans]
+
+
+def test_spans_nest_and_close_on_errors():
+    report = RunReport()
+
+    with report.span("mesh"):
+        with report.span("compute"):
+            pass
+        with pytest.raises(RuntimeError):
+            with report.span("quality"):
+                raise RuntimeError
+        assert report.current.name == "mesh"
+    assert report.current is None
+
+    assert _tree(report.spans) == [("mesh", [("compute", []), ("quality", [])])]
+    mesh = report.spans[0]
+    assert mesh.wall >= sum(child.wall for child in mesh.children)
+
+
+def test_each_thread_nests_its_own_spans():
+    report = RunReport()
+    # Both threads hold a span open while the other one opens its child
+    opened, nested = threading.Barrier(2), threading.Barrier(2)
+
+    def export():
+        with report.span("export"):
+            opened.wait()
+            with report.span("compress"):
+                nested.wait()
+
+    thread = threading.Thread(target=export)
+    with report.span("mesh"):
+        thread.start()
+        opened.wait()
+        with report.span("compute"):
+            nested.wait()
+    thread.join()
+
+    assert sorted(_tree(report.spans)) == [
+        ("export", [("compress", [])]),
+        ("mesh", [("compute", [])]),
+    ]
+
+
+def test_traced_methods_are_spans_of_their_report():
+    class Engine:
+        def __init__(self):
+            self.report = RunReport()
+
+        @traced("outer")
+        def outer(self):
+            return self.inner()
+
+        @traced("inner")
+        def inner(self):
+            return 42
+
+    engine = Engine()
+
+    assert engine.outer() == 42
+    assert _tree(engine.report.spans) == [("outer", [("inner", [])])]
+
+
+def test_exports_list_every_span():
+    report = RunReport()
+    with report.span("mesh"):
+        with report.span("compute"):
+            pass
+
+    events = report.to_chrome_trace()["traceEvents"]
+    assert [event["name"] for event in events] == ["mesh", "compute"]
+    assert report.to_dict()["spans"][0]["children"][0]["name"] == "compute"
+    assert "\n  compute" in report.summary()
+
+    report.clear()
+    assert report.spans == [] and report.current is None
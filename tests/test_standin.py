@@ -0,0 +1,116 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE
+from reactor_maker.engine.backend import get_backend
+from reactor_maker.engine.hexquality import HexQuality
+from reactor_maker.engine.standin import StandInBackend
+
+
+@pytest.fixture
+def standin():
+    backend = get_backend("standin")
+    backend.start()
+    return backend
+
+
+def _cylinder(geompy, radius=10.0, height=5.0):
+    origin = geompy.MakeVertex(0, 0, 0)
+    axis = geompy.MakeVectorDXDYDZ(0, 0, 1)
+    disk = geompy.MakeDiskPntVecR(origin, axis, radius)
+    return geompy.MakePrismVecH(disk, axis, height)
+
+
+def _mesh(backend, shape, nb_segments):
+    geompy, smesh = backend.geom_builder(), backend.smesh_builder()
+    circle = geompy.SubShapeAllSortedCentres(shape, geompy.ShapeType["EDGE"])[0]
+
+    mesh = smesh.Mesh(shape)
+    mesh.Segment(circle).NumberOfSegments(nb_segments)
+    mesh.Quadrangle()
+    mesh.Hexahedron()
+    face = backend.smesh_module().FACE
+    for name in ("Inlet", "Outlet", "Wall"):
+        mesh.GroupOnGeom(None, name, face)
+    assert mesh.Compute()
+    return mesh
+
+
+def test_backends_are_found_by_name(standin):
+    assert isinstance(standin, StandInBackend)
+    with pytest.raises(ValueError, match="Unknown backend"):
+        get_backend("gmsh")
+
+
+def test_calls_are_counted_and_reset(standin):
+    geompy = standin.geom_builder()
+    _cylinder(geompy)
+
+    assert standin.calls["MakePrismVecH"] == 1
+    assert standin.calls["MakeVertex"] == 1
+    standin.reset()
+    assert not standin.calls
+
+
+def test_pickled_backend_starts_afresh(standin):
+    _cylinder(standin.geom_builder())
+
+    copy = pickle.loads(pickle.dumps(standin))
+
+    assert not copy.calls
+    assert copy.geom_builder() is not standin.geom_builder()
+
+
+def test_mesh_follows_the_segments_of_the_hypotheses(standin):
+    shape = _cylinder(standin.geom_builder())
+
+    coarse = _mesh(standin, shape, 16)
+    fine = _mesh(standin, shape, 32)
+
+    assert 0 < coarse.NbVolumes() < fine.NbVolumes()
+    assert fine.NbElements() == fine.NbFaces() + fine.NbVolumes()
+
+
+def test_mesh_has_direct_hexahedra_and_boundary_groups(standin):
+    mesh = _mesh(standin, _cylinder(standin.geom_builder()), 16)
+    arrays = mesh._arrays
+
+    assert HexQuality.from_arrays(arrays).negative_jacobians == 0
+    groups = {group.GetName(): group.GetIDs() for group in mesh.GetGroups()}
+    assert len(groups["Inlet"]) == len(groups["Outlet"]) > 0
+    assert sum(map(len, groups.values())) == len(arrays.element_ids(QUADRANGLE))
+    # The inlet is the bottom of the cylinder
+    inlet = arrays.nodes[arrays.connectivity(QUADRANGLE)[np.array(groups["Inlet"]) - 1]]
+    assert np.allclose(inlet[..., 2], 0)
+
+
+def test_med_round_trip(standin, tmp_path):
+    mesh = _mesh(standin, _cylinder(standin.geom_builder()), 16)
+    filename = str(tmp_path.joinpath("mesh.med"))
+
+    mesh.ExportMED(filename)
+    (loaded,), _ = standin.smesh_builder().CreateMeshesFromMED(filename)
+
+    assert loaded.NbNodes() == mesh.NbNodes()
+    assert np.array_equal(
+        loaded._arrays.connectivity(HEXAHEDRON), mesh._arrays.connectivity(HEXAHEDRON)
+    )
+    assert [group.GetIDs() for group in loaded.GetGroups()] == [
+        group.GetIDs() for group in mesh.GetGroups()
+    ]
+
+
+def test_brep_round_trip(standin, tmp_path):
+    geompy = standin.geom_builder()
+    shape = _cylinder(geompy)
+    filename = str(tmp_path.joinpath("shape.brep"))
+
+    geompy.ExportBREP(shape, filename)
+    loaded = geompy.ImportBREP(filename)
+
+    edge = geompy.ShapeType["EDGE"]
+    assert [
+        geompy.KindOfShape(e) for e in geompy.SubShapeAllSortedCentres(loaded, edge)
+    ] == [geompy.KindOfShape(e) for e in geompy.SubShapeAllSortedCentres(shape, edge)]
@@ -0,0 +1,106 @@
+from math import ceil
+
+import numpy as np
+import pytest
+
+from reactor_maker.engine.evaluator import SerialEvaluator
+from reactor_maker.engine.strategies import (
+    STRATEGIES,
+    GridStrategy,
+    fidelity_levels,
+    make_strategy,
+)
+
+BOUNDS = [(0.05, 0.99), (0.05, 0.8)]
+X0 = [0.8, 0.2]
+MINIMUM = np.array([0.4, 0.6])
+
+
+class _Recorder:
+    """
+    Objective recording its batches and its best point
+    """
+
+    def __init__(self, function):
+        self._function = function
+        self.batches = []
+        self.best = (float("inf"), None)
+
+    def __call__(self, points):
+        self.batches.append(len(points))
+        values = [self._function(np.array(point)) for point in points]
+        for value, point in zip(values, points):
+            self.best = min(self.best, (value, point))
+        return values
+
+
+def _quadratic(x):
+    return float(((x - MINIMUM) ** 2).sum())
+
+
+def _plateaus(x):
+    # Piecewise constant, flat around the starting point
+    return float(np.floor(10 * np.abs(x - MINIMUM)).sum())
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_strategies_converge_on_a_quadratic(name):
+    objective = _Recorder(_quadratic)
+
+    converged, _ = make_strategy(name).search(objective, BOUNDS, X0, batch=2)
+
+    assert converged
+    assert objective.best[1] == pytest.approx(MINIMUM, abs=0.05)
+
+
+@pytest.mark.parametrize("name", ["grid", "nelder-mead", "bayesian"])
+def test_derivative_free_strategies_leave_the_plateau_of_the_start(name):
+    objective = _Recorder(_plateaus)
+
+    make_strategy(name).search(objective, BOUNDS, X0)
+
+    assert objective.best[0] < _plateaus(np.array(X0))
+
+
+def test_gradient_sees_no_slope_on_a_plateau():
+    objective = _Recorder(_plateaus)
+
+    make_strategy("lbfgsb").search(objective, BOUNDS, X0)
+
+    assert objective.best[0] == _plateaus(np.array(X0))
+
+
+def test_grid_evaluates_each_level_as_one_batch():
+    objective = _Recorder(_quadratic)
+
+    GridStrategy(coarse=4, fine=3, levels=2).search(objective, BOUNDS, X0)
+
+    # The refining grids also evaluate the best point of the previous level
+    assert objective.batches == [16, 10, 10]
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="expected one of"):
+        make_strategy("simplex")
+
+
+def test_fidelity_levels_keep_whole_chimney_segments():
+    assert fidelity_levels(6.0, 0.5, (4, 2)) == [(4, 2.0), (2, 1.0), (1, 0.5)]
+    # Factors giving the same mesh size only keep the finest one
+    assert fidelity_levels(6.0, 2.0, (1.1, 3)) == [(3, 6.0), (1, 2.0)]
+
+
+def _problem(parameters):
+    chimney_dim = parameters["chimney_dim"]
+    mesh_size = chimney_dim.x / ceil(chimney_dim.x / parameters["mesh_size"])
+    return parameters["center"], parameters["reactor_dim"], chimney_dim, mesh_size
+
+
+@pytest.mark.parametrize("strategy", ["grid", "nelder-mead"])
+def test_engine_strategies_improve_the_start(make_maker, parameters, strategy):
+    maker = make_maker()
+    evaluator = SerialEvaluator(maker, _problem(parameters))
+
+    found, _ = maker._optimize_geom_mesh(*_problem(parameters), strategy=strategy)
+
+    assert evaluator.map([found])[0] <= evaluator.map([X0])[0]
@@ -0,0 +1,66 @@
+from math import ceil
+
+import numpy as np
+import pytest
+
+from reactor_maker.engine.quality import quadrangle_aspect_ratio
+from reactor_maker.engine.surrogate import BaseSurrogate
+
+BOUNDS = [(0.05, 0.99), (0.05, 0.8)]
+
+
+@pytest.fixture
+def surrogate(parameters):
+    chimney_width = parameters["chimney_dim"].x
+    mesh_size = chimney_width / ceil(chimney_width / parameters["mesh_size"])
+    return BaseSurrogate(parameters["reactor_dim"].x, chimney_width, mesh_size)
+
+
+def test_invalid_bases_are_ranked_last(surrogate):
+    # A square narrower than the chimney, then wider than the disk
+    assert surrogate([0.1, 0.3]) >= 1e6
+    assert surrogate([1.5, 0.3]) >= 1e6
+    assert surrogate([0.8, 0.3]) < 1e6
+
+
+def test_quadrant_quads_are_valid(surrogate):
+    quads = surrogate.quads(16.0, 0.3)
+
+    assert quads.shape[1:] == (4, 3)
+    # No degenerate quadrangle, the worst one is the prediction of the surrogate
+    ratios = quadrangle_aspect_ratio(quads)
+    assert 1 <= ratios.min() and ratios.max() < 1e6
+    assert surrogate.max_aspect_ratio(16.0, 0.3) == ratios.max()
+
+
+def test_candidates_are_distinct_and_best_first(surrogate):
+    candidates = surrogate.search(BOUNDS, nb_candidates=4, resolution=10)
+    values = [surrogate(x) for x in candidates]
+
+    assert 0 < len(candidates) <= 4
+    assert values == sorted(values)
+    for i, x in enumerate(candidates):
+        assert all(low <= value <= high for value, (low, high) in zip(x, BOUNDS))
+        for y in candidates[:i]:
+            assert np.linalg.norm(np.subtract(x, y)) > 1e-3
+
+    # Refined from the best points of the grid, the first one is at least as good
+    axes = [np.linspace(low, high, 10) for low, high in BOUNDS]
+    grid = min(surrogate([x0, x1]) for x0 in axes[0] for x1 in axes[1])
+    assert values[0] <= grid + 1e-9
+
+
+def test_engine_only_meshes_the_candidates(make_maker, parameters):
+    maker = make_maker()
+    chimney_dim = parameters["chimney_dim"]
+    mesh_size = chimney_dim.x / ceil(chimney_dim.x / parameters["mesh_size"])
+
+    maker._optimize_geom_mesh(
+        parameters["center"],
+        parameters["reactor_dim"],
+        chimney_dim,
+        mesh_size,
+        surrogate=True,
+    )
+
+    assert 0 < maker._evaluations.misses <= 4
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE, MeshArrays
+from reactor_maker.engine.sweep import sweep
+
+
+def smds_volumes(arrays: MeshArrays) -> np.ndarray:
+    # Volume of the corner 0 of each hexahedron, positive in the SMDS order whose
+    # bottom face turns clockwise seen from the top face
+    p = arrays.nodes[arrays.connectivity(HEXAHEDRON)]
+    edges = p[:, [1, 3, 4]] - p[:, [0]]
+    return np.einsum("ij,ij->i", edges[:, 2], np.cross(edges[:, 1], edges[:, 0]))
+
+
+def _grid(nb_cells: int, width: float) -> MeshArrays:
+    u = np.linspace(-width / 2, width / 2, nb_cells + 1)
+    x, y = np.meshgrid(u, u, indexing="ij")
+    nodes = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+
+    i, j = np.meshgrid(np.arange(nb_cells), np.arange(nb_cells), indexing="ij")
+    corner = (i * (nb_cells + 1) + j).ravel()
+    # Every other quadrangle turns clockwise
+    quads = np.column_stack(
+        [corner, corner + nb_cells + 1, corner + nb_cells + 2, corner + 1]
+    )
+    quads[::2] = quads[::2, ::-1]
+
+    return MeshArrays(
+        np.arange(1, len(nodes) + 1),
+        nodes,
+        {QUADRANGLE: (np.arange(1, len(quads) + 1), quads)},
+    )
+
+
+def test_sweep_builds_hexahedra_in_the_smds_order():
+    swept = sweep(_grid(4, 4.0), (0.0, 0.0), 2.0, 3.0, 1.0, 3, 2)
+
+    assert len(swept.connectivity(HEXAHEDRON)) == 16 * 3 + 4 * 2
+    assert (smds_volumes(swept) > 0).all()
+
+
+def test_sweep_groups_cover_the_boundary():
+    swept = sweep(_grid(4, 4.0), (0.0, 0.0), 2.0, 3.0, 1.0, 3, 2)
+    groups = {name: len(ids) for name, ids in swept.groups.items()}
+
+    # Body sides, roof around the chimney and chimney sides
+    assert groups == {"Inlet": 16, "Outlet": 4, "Wall": 16 * 3 + 12 + 8 * 2}
+
+
+@pytest.mark.parametrize("sweep_mesh", [False, True])
+def test_meshes_share_the_smds_order(make_maker, parameters, sweep_mesh):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+
+    arrays = maker.mesh(geometry, False, sweep=sweep_mesh).unwrap().to_arrays()
+
+    assert (smds_volumes(arrays) > 0).all()
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE, MeshArrays
+from reactor_maker.engine.symmetry import replicate_quadrant
+
+
+def _grid(low: float, high: float, nb_cells: int) -> MeshArrays:
+    u = np.linspace(low, high, nb_cells + 1)
+    x, y = np.meshgrid(u, u, indexing="ij")
+    nodes = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+
+    i, j = np.meshgrid(np.arange(nb_cells), np.arange(nb_cells), indexing="ij")
+    corner = (i * (nb_cells + 1) + j).ravel()
+    quads = np.column_stack(
+        [corner, corner + nb_cells + 1, corner + nb_cells + 2, corner + 1]
+    )
+    return MeshArrays(
+        np.arange(1, len(nodes) + 1),
+        nodes,
+        {QUADRANGLE: (np.arange(1, len(quads) + 1), quads)},
+    )
+
+
+def _sorted(points: np.ndarray) -> np.ndarray:
+    points = np.round(points, 9)
+    return points[np.lexsort(points.T[::-1])]
+
+
+def test_replicated_quadrant_is_the_full_grid():
+    full = _grid(-3.0, 3.0, 6)
+
+    replicated = replicate_quadrant(_grid(0.0, 3.0, 3), (0.0, 0.0), 1e-9)
+
+    assert len(replicated.nodes) == len(full.nodes)
+    assert len(replicated.connectivity(QUADRANGLE)) == len(
+        full.connectivity(QUADRANGLE)
+    )
+    assert np.array_equal(_sorted(replicated.nodes), _sorted(full.nodes))
+    assert np.array_equal(
+        _sorted(replicated.nodes[replicated.connectivity(QUADRANGLE)].mean(axis=1)),
+        _sorted(full.nodes[full.connectivity(QUADRANGLE)].mean(axis=1)),
+    )
+
+
+def test_quadrant_with_unmatched_rays_is_rejected():
+    quadrant = _grid(0.0, 3.0, 3)
+    nodes = quadrant.nodes.copy()
+    # Node of the ray +y moved off the positions of the ray +x
+    nodes[1, 1] = 1.5
+
+    with pytest.raises(ValueError):
+        replicate_quadrant(
+            MeshArrays(
+                quadrant.node_ids,
+                nodes,
+                {
+                    QUADRANGLE: (
+                        quadrant.element_ids(QUADRANGLE),
+                        quadrant.connectivity(QUADRANGLE),
+                    )
+                },
+            ),
+            (0.0, 0.0),
+            1e-9,
+        )
+
+
+def _rotated(points: np.ndarray) -> np.ndarray:
+    return np.column_stack([-points[:, 1], points[:, 0], points[:, 2]])
+
+
+def test_symmetric_mesh_is_unchanged_by_a_quarter_turn(make_maker, parameters):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+
+    arrays = maker.mesh(geometry, False, symmetric=True).unwrap().to_arrays()
+
+    for name in ("Inlet", "Outlet"):
+        faces = arrays.group_connectivity(name)
+        assert len(faces) % 4 == 0
+        centres = arrays.nodes[faces].mean(axis=1)
+        assert np.allclose(_sorted(_rotated(centres)), _sorted(centres))
+
+    hexas = arrays.connectivity(HEXAHEDRON)
+    centres = arrays.nodes[hexas].mean(axis=1)
+    assert np.allclose(_sorted(_rotated(centres)), _sorted(centres))
+
+
+def _area(nodes: np.ndarray, quads: np.ndarray) -> float:
+    corners = nodes[quads]
+    diagonals = np.cross(corners[:, 2] - corners[:, 0], corners[:, 3] - corners[:, 1])
+    return float(np.linalg.norm(diagonals, axis=1).sum() / 2)
+
+
+def test_symmetric_inlet_covers_the_disk_of_the_reactor(make_maker, parameters):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+    radius = parameters["reactor_dim"].x
+
+    arrays = maker.mesh(geometry, False, symmetric=True).unwrap().to_arrays()
+
+    # Same base as the full mesh, with elements of its own
+    faces = arrays.group_connectivity("Inlet")
+    assert _area(arrays.nodes, faces) == pytest.approx(np.pi * radius**2, rel=1e-2)
+    assert np.linalg.norm(arrays.nodes[faces][..., :2], axis=-1).max() == (
+        pytest.approx(radius)
+    )
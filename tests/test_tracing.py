@@ -0,0 +1,84 @@
+import pytest
+
+from reactor_maker.engine.report import RunReport
+from reactor_maker.engine.tracing import CallStats, TracingProxy
+
+
+def _traced(backend):
+    stats, report = CallStats(), RunReport()
+    return TracingProxy(backend.smesh_builder(), stats, report), stats, report
+
+
+def test_factories_return_traced_meshes_and_algorithms(backend):
+    smesh, stats, report = _traced(backend)
+    geompy = backend.geom_builder()
+    shape = geompy.MakeDiskPntVecR(
+        geompy.MakeVertex(0, 0, 0), geompy.MakeVectorDXDYDZ(0, 0, 1), 10
+    )
+
+    with report.span("mesh"):
+        mesh = smesh.Mesh(shape)
+        algorithm = mesh.Segment()
+        algorithm.NumberOfSegments(8)
+        mesh.Quadrangle()
+    with report.span("compute"):
+        mesh.Compute()
+
+    assert isinstance(mesh, TracingProxy) and isinstance(algorithm, TracingProxy)
+    assert stats.by_method_and_stage().keys() == {
+        ("Mesh", "mesh"),
+        ("Mesh.Segment", "mesh"),
+        ("Algo.NumberOfSegments", "mesh"),
+        ("Mesh.Quadrangle", "mesh"),
+        ("Mesh.Compute", "compute"),
+    }
+    assert stats.nb_calls == 5
+    assert stats.by_stage()["mesh"][0] == 4
+
+
+def test_meshes_read_from_med_are_traced(backend, tmp_path):
+    smesh, stats, _ = _traced(backend)
+    geompy = backend.geom_builder()
+    mesh = smesh.Mesh(
+        geompy.MakeDiskPntVecR(
+            geompy.MakeVertex(0, 0, 0), geompy.MakeVectorDXDYDZ(0, 0, 1), 10
+        )
+    )
+    mesh.Compute()
+    filename = str(tmp_path.joinpath("mesh.med"))
+    mesh.ExportMED(filename)
+
+    (loaded,), _ = smesh.CreateMeshesFromMED(filename)
+    loaded.NbNodes()
+
+    assert isinstance(loaded, TracingProxy)
+    assert stats.by_method()["Mesh.NbNodes"][0] == 1
+    assert ("Mesh.NbNodes", "-") in stats.by_method_and_stage()
+
+
+def test_failed_calls_are_counted():
+    class Builder:
+        def Fail(self):
+            raise RuntimeError("CORBA error")
+
+        name = "builder"
+
+    stats = CallStats()
+    builder = TracingProxy(Builder(), stats, RunReport())
+
+    with pytest.raises(RuntimeError):
+        builder.Fail()
+
+    assert builder.name == "builder"
+    assert stats.by_method() == {"Fail": (1, pytest.approx(0, abs=1))}
+    assert "Fail" in stats.summary()
+
+
+def test_engine_counts_the_calls_by_stage(make_maker, parameters):
+    maker = make_maker(trace_calls=True)
+    geometry = maker.create_geometry(**parameters).unwrap()
+    maker.mesh(geometry, False)
+
+    stages = maker.call_stats.by_stage()
+    assert stages["compute"][0] >= 1
+    assert sum(count for count, _ in stages.values()) == maker.call_stats.nb_calls
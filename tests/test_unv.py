@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from reactor_maker.engine.arrays import HEXAHEDRON, QUADRANGLE, MeshArrays
+from reactor_maker.engine.unv import read_unv, write_unv
+
+# Unit cube, the bottom face turning counterclockwise seen from +Z
+CUBE = np.array(
+    [
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 1, 1],
+    ],
+    dtype=np.float64,
+)
+# The cube in the SMDS order of the arrays, the bottom face turning clockwise
+SMDS_CUBE = np.array([[0, 3, 2, 1, 4, 7, 6, 5]])
+
+
+def _cube() -> MeshArrays:
+    return MeshArrays(
+        np.arange(11, 19),
+        CUBE,
+        {
+            QUADRANGLE: (np.array([1, 2]), np.array([[0, 3, 2, 1], [4, 5, 6, 7]])),
+            HEXAHEDRON: (np.array([3]), SMDS_CUBE),
+        },
+        {"Inlet": np.array([1]), "Outlet": np.array([2])},
+    )
+
+
+def _bricks(filename) -> np.ndarray:
+    # Nodes of the records of descriptor 115, as written in the file
+    lines = open(filename).read().split("    -1\n  2412\n")[1].split("    -1\n")[0]
+    lines = lines.splitlines()
+
+    bricks, position = [], 0
+    while position < len(lines):
+        descriptor = lines[position].split()[1]
+        # Beams have an extra line of orientation
+        position += 3 if descriptor == "11" else 2
+        if descriptor == "115":
+            bricks.append(lines[position - 1].split())
+    return np.array(bricks, dtype=np.int64)
+
+
+def _direct_volume(points: np.ndarray) -> float:
+    # Volume at the corner 0 of a brick whose bottom face turns counterclockwise
+    # seen from the top face, as the I-DEAS bricks
+    e1, e3, e4 = points[1] - points[0], points[3] - points[0], points[4] - points[0]
+    return float(np.dot(np.cross(e1, e3), e4))
+
+
+def test_bricks_are_written_in_the_ideas_order(tmp_path):
+    filename = tmp_path.joinpath("cube.unv")
+    write_unv(_cube(), str(filename))
+
+    bricks = _bricks(filename)
+
+    assert bricks.shape == (1, 8)
+    assert _direct_volume(CUBE[bricks[0] - 11]) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("suffix", [".unv", ".unv.gz", ".unv.xz"])
+def test_round_trip_keeps_the_smds_order(tmp_path, suffix):
+    filename = str(tmp_path.joinpath("cube" + suffix))
+    write_unv(_cube(), filename)
+
+    arrays = read_unv(filename)
+
+    assert np.array_equal(arrays.node_ids, np.arange(11, 19))
+    assert np.allclose(arrays.nodes, CUBE)
+    assert np.array_equal(arrays.element_ids(HEXAHEDRON), [3])
+    assert np.array_equal(arrays.connectivity(HEXAHEDRON), SMDS_CUBE)
+    assert np.array_equal(
+        arrays.connectivity(QUADRANGLE), _cube().connectivity(QUADRANGLE)
+    )
+    assert {name: list(ids) for name, ids in arrays.groups.items()} == {
+        "Inlet": [1],
+        "Outlet": [2],
+    }
+
+
+def test_exported_mesh_has_only_direct_bricks(make_maker, parameters, tmp_path):
+    maker = make_maker()
+    geometry = maker.create_geometry(**parameters).unwrap()
+    mesh = maker.mesh(geometry, False).unwrap()
+
+    filename = tmp_path.joinpath("mesh.unv")
+    mesh.export_to(str(filename))
+
+    arrays = mesh.to_arrays()
+    lookup = dict(zip(arrays.node_ids, arrays.nodes))
+    bricks = _bricks(filename)
+    assert len(bricks) == len(arrays.element_ids(HEXAHEDRON))
+    assert all(
+        _direct_volume(np.array([lookup[node] for node in brick])) > 0
+        for brick in bricks[:: max(1, len(bricks) // 200)]
+    )
@@ -0,0 +1,145 @@
+import sqlite3
+from math import ceil
+
+import pytest
+
+from reactor_maker.engine.budget import (
+    MAX_EVALUATIONS,
+    OptimizationBudget,
+    STALLED,
+    TARGET_REACHED,
+    WARM_START,
+)
+from reactor_maker.engine.cache import ArtifactCache
+from reactor_maker.engine.warmstart import ShapeFeatures, WarmStartStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WarmStartStore(tmp_path.joinpath("warmstart.sqlite"))
+
+
+def test_features_dont_depend_on_the_scale():
+    assert ShapeFeatures.of(20, 6, 2) == pytest.approx(ShapeFeatures.of(40, 12, 4))
+    assert ShapeFeatures.of(20, 6, 2).chimney_segments == 3
+
+
+def test_exact_returns_the_best_outcome_of_the_shape(store):
+    features = ShapeFeatures.of(20, 6, 2)
+    store.record(features, (0.8, 0.2), 1.6, 10, "lbfgsb", STALLED)
+    store.record(features, (0.7, 0.3), 1.4, 12, "lbfgsb", TARGET_REACHED)
+    store.record(ShapeFeatures.of(20, 6, 1), (0.5, 0.5), 1.1, 8, "lbfgsb", STALLED)
+
+    outcome = store.exact(features)
+
+    assert outcome.parameters == (0.7, 0.3)
+    assert outcome.max_aspect_ratio == 1.4
+    assert len(store) == 3
+
+
+def test_exact_filters_on_the_reason_and_the_target(store):
+    features = ShapeFeatures.of(20, 6, 2)
+    store.record(features, (0.8, 0.2), 1.4, 3, "lbfgsb", MAX_EVALUATIONS)
+    store.record(features, (0.7, 0.3), 1.6, 10, "lbfgsb", TARGET_REACHED)
+
+    assert store.exact(features, (TARGET_REACHED,)).parameters == (0.7, 0.3)
+    assert store.exact(features, (TARGET_REACHED,), 1.6) is not None
+    assert store.exact(features, (TARGET_REACHED,), 1.5) is None
+
+
+def test_nearest_keeps_the_chimney_segments_and_the_distance(store):
+    store.record(ShapeFeatures.of(20, 6, 2), (0.8, 0.2), 1.5, 10, "lbfgsb", STALLED)
+    store.record(ShapeFeatures.of(20, 8, 2), (0.6, 0.4), 1.5, 10, "lbfgsb", STALLED)
+
+    outcome, distance = store.nearest(ShapeFeatures.of(21, 6, 2))
+
+    assert outcome.parameters == (0.8, 0.2)
+    assert 0 < distance < 0.25
+    assert store.nearest(ShapeFeatures.of(20, 10, 2)) is None
+    assert store.nearest(ShapeFeatures.of(60, 6, 2)) is None
+
+
+def test_store_closes_its_connections(store, monkeypatch):
+    opened, closed = [], []
+
+    class Connection(sqlite3.Connection):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    def connect(*args, **kwargs):
+        opened.append(sqlite3_connect(*args, factory=Connection, **kwargs))
+        return opened[-1]
+
+    sqlite3_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", connect)
+
+    features = ShapeFeatures.of(20, 6, 2)
+    store.record(features, (0.8, 0.2), 1.6, 10, "lbfgsb", STALLED)
+    store.exact(features)
+    store.nearest(features)
+
+    assert len(store) == 1
+    assert len(opened) == 4
+    assert closed == opened
+
+
+def test_store_is_neither_counted_nor_evicted_by_the_cache(store, tmp_path):
+    for i in range(100):
+        store.record(ShapeFeatures.of(20, 6, 2), (0.8, 0.2), 1.6, i, "lbfgsb", STALLED)
+    assert store.path.stat().st_size > 1000
+
+    def writer(entry):
+        entry.joinpath("data.bin").write_bytes(b"x" * 1000)
+        return {}
+
+    cache = ArtifactCache(tmp_path, max_size=1500)
+    cache.store("a", writer)
+
+    assert cache.load("a") is not None
+    assert cache.size() < 1500
+    cache.clear()
+    assert len(store) == 100
+
+
+def _optimize(maker, parameters, budget):
+    mesh_size = parameters["chimney_dim"].x / ceil(
+        parameters["chimney_dim"].x / parameters["mesh_size"]
+    )
+    return maker._optimize_geom_mesh(
+        parameters["center"],
+        parameters["reactor_dim"],
+        parameters["chimney_dim"],
+        mesh_size,
+        budget=budget,
+    )
+
+
+def test_engine_reuses_an_outcome_reaching_the_target(make_maker, parameters, tmp_path):
+    first = make_maker(cache_dir=str(tmp_path), warm_start=True)
+    found, reason = _optimize(
+        first, parameters, OptimizationBudget(target_aspect_ratio=50)
+    )
+    assert reason == TARGET_REACHED
+
+    second = make_maker(cache_dir=str(tmp_path), warm_start=True)
+    reused, reason = _optimize(
+        second, parameters, OptimizationBudget(target_aspect_ratio=50)
+    )
+    assert reason == WARM_START
+    assert reused == pytest.approx(found)
+
+
+def test_engine_searches_again_for_a_stricter_target(make_maker, parameters, tmp_path):
+    first = make_maker(cache_dir=str(tmp_path), warm_start=True)
+    _optimize(first, parameters, OptimizationBudget(target_aspect_ratio=50))
+
+    second = make_maker(cache_dir=str(tmp_path), warm_start=True)
+    _, reason = _optimize(
+        second,
+        parameters,
+        OptimizationBudget(max_evaluations=2, target_aspect_ratio=1),
+    )
+
+    assert reason == MAX_EVALUATIONS
+    assert len(second.warm_start_store) == 2